@@ -0,0 +1,75 @@
+"""Replay chat turns offline: ``python -m app.batch turns.jsonl > results.ndjson``.
+
+Each input line is a ``ChatRequest`` object (``message`` plus optional
+``history``). Results are written as NDJSON in completion order and carry
+the 1-based ``line`` they answer; invalid lines, and lines whose message is
+blank (as ``/api/chat/batch`` rejects them), produce an ``error`` record.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from typing import List, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+
+from app.config import load_settings
+from app.data.catalog import load_catalog
+from app.models.chat import ChatRequest
+from app.services.batch import BatchRunner, to_ndjson
+from app.services.conversation import ConversationEngine
+
+
+def _read_requests(source: TextIO, out: TextIO) -> Tuple[List[int], List[ChatRequest]]:
+    line_numbers: List[int] = []
+    requests: List[ChatRequest] = []
+    for number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            request = ChatRequest.model_validate_json(line)
+        except ValidationError as exc:
+            out.write(to_ndjson({"line": number, "error": str(exc)}))
+            continue
+        if not request.message.strip():
+            out.write(to_ndjson({"line": number, "error": "Message cannot be empty"}))
+            continue
+        line_numbers.append(number)
+        requests.append(request)
+    return line_numbers, requests
+
+
+async def _run(source: TextIO, out: TextIO, concurrency: Optional[int]) -> None:
+    settings = load_settings()
+    engine = ConversationEngine.from_settings(settings, catalog=load_catalog(settings.catalog_path))
+    runner = BatchRunner(engine, concurrency or settings.batch_concurrency)
+    line_numbers, requests = _read_requests(source, out)
+    try:
+        async for result in runner.run(requests):
+            out.write(to_ndjson({"line": line_numbers[result.pop("index")], **result}))
+    finally:
+        await engine.aclose()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.batch", description="Replay chat turns as NDJSON.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of chat requests ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON output file ('-' for stdout)")
+    parser.add_argument("-c", "--concurrency", type=int, default=None, help="LLM calls in flight (default BATCH_CONCURRENCY)")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        asyncio.run(_run(source, out, args.concurrency))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
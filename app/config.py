@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_set(name: str, default: set) -> FrozenSet[str]:
+    value = os.getenv(name)
+    if value is None:
+        return frozenset(default)
+    return frozenset(item.strip() for item in value.split(",") if item.strip())
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Runtime configuration read from the environment once at startup."""
+
+    openai_api_key: Optional[str] = None
+    openai_model: str = "gpt-4o-mini"
+    openai_base_url: Optional[str] = None
+    openai_timeout: float = 30.0
+    openai_connect_timeout: float = 5.0
+    openai_max_retries: int = 2
+    openai_max_connections: int = 100
+    openai_max_keepalive_connections: int = 20
+    openai_keepalive_expiry: float = 30.0
+    catalog_path: Optional[str] = None
+    session_backend: str = "memory"
+    session_db_path: str = "sessions.db"
+    session_ttl_seconds: float = 3600.0
+    session_max_entries: int = 10000
+    session_max_history: int = 20
+    completion_cache_size: int = 1024
+    completion_cache_ttl_seconds: float = 600.0
+    completion_cache_stages: FrozenSet[str] = frozenset({"initial_greeting"})
+    prompt_token_budget: int = 1500
+    context_max_messages: int = 10
+    context_summary_tokens: int = 200
+    batch_concurrency: int = 8
+    batch_max_requests: int = 1000
+    llm_max_in_flight: int = 32
+    llm_max_queue: int = 128
+    llm_queue_timeout: float = 5.0
+    llm_max_per_session: int = 2
+    llm_latency_budget: float = 1.5
+    llm_hedge_delay: float = 0.0
+    llm_breaker_threshold: int = 5
+    llm_breaker_cooldown: float = 30.0
+    metrics_enabled: bool = True
+    fallback_prerender: bool = False
+    assets_reload: bool = False
+    ws_messages_per_minute: int = 30
+    ws_idle_timeout: float = 300.0
+    similarity_min_score: float = 0.25
+    transcript_backend: str = "none"
+    transcript_path: Optional[str] = None
+    transcript_max_bytes: int = 50 * 1024 * 1024
+    transcript_backups: int = 5
+    transcript_queue_size: int = 10000
+    transcript_batch_size: int = 200
+    transcript_flush_interval: float = 1.0
+    transcript_overflow: str = "drop"
+
+
+def load_settings() -> Settings:
+    return Settings(
+        openai_api_key=os.getenv("OPENAI_API_KEY") or None,
+        openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+        openai_base_url=os.getenv("OPENAI_BASE_URL") or None,
+        openai_timeout=_env_float("OPENAI_TIMEOUT", 30.0),
+        openai_connect_timeout=_env_float("OPENAI_CONNECT_TIMEOUT", 5.0),
+        openai_max_retries=_env_int("OPENAI_MAX_RETRIES", 2),
+        openai_max_connections=_env_int("OPENAI_MAX_CONNECTIONS", 100),
+        openai_max_keepalive_connections=_env_int("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 20),
+        openai_keepalive_expiry=_env_float("OPENAI_KEEPALIVE_EXPIRY", 30.0),
+        catalog_path=os.getenv("LOAN_CATALOG_PATH") or None,
+        session_backend=os.getenv("SESSION_BACKEND", "memory").lower(),
+        session_db_path=os.getenv("SESSION_DB_PATH", "sessions.db"),
+        session_ttl_seconds=_env_float("SESSION_TTL_SECONDS", 3600.0),
+        session_max_entries=_env_int("SESSION_MAX_ENTRIES", 10000),
+        session_max_history=_env_int("SESSION_MAX_HISTORY", 20),
+        completion_cache_size=_env_int("COMPLETION_CACHE_SIZE", 1024),
+        completion_cache_ttl_seconds=_env_float("COMPLETION_CACHE_TTL_SECONDS", 600.0),
+        completion_cache_stages=_env_set("COMPLETION_CACHE_STAGES", {"initial_greeting"}),
+        prompt_token_budget=_env_int("PROMPT_TOKEN_BUDGET", 1500),
+        context_max_messages=_env_int("CONTEXT_MAX_MESSAGES", 10),
+        context_summary_tokens=_env_int("CONTEXT_SUMMARY_TOKENS", 200),
+        batch_concurrency=_env_int("BATCH_CONCURRENCY", 8),
+        batch_max_requests=_env_int("BATCH_MAX_REQUESTS", 1000),
+        llm_max_in_flight=_env_int("LLM_MAX_IN_FLIGHT", 32),
+        llm_max_queue=_env_int("LLM_MAX_QUEUE", 128),
+        llm_queue_timeout=_env_float("LLM_QUEUE_TIMEOUT", 5.0),
+        llm_max_per_session=_env_int("LLM_MAX_PER_SESSION", 2),
+        llm_latency_budget=_env_float("LLM_LATENCY_BUDGET", 1.5),
+        llm_hedge_delay=_env_float("LLM_HEDGE_DELAY", 0.0),
+        llm_breaker_threshold=_env_int("LLM_BREAKER_THRESHOLD", 5),
+        llm_breaker_cooldown=_env_float("LLM_BREAKER_COOLDOWN", 30.0),
+        metrics_enabled=_env_bool("METRICS_ENABLED", True),
+        fallback_prerender=_env_bool("FALLBACK_PRERENDER", False),
+        assets_reload=_env_bool("ASSETS_RELOAD", False),
+        ws_messages_per_minute=_env_int("WS_MESSAGES_PER_MINUTE", 30),
+        ws_idle_timeout=_env_float("WS_IDLE_TIMEOUT", 300.0),
+        similarity_min_score=_env_float("SIMILARITY_MIN_SCORE", 0.25),
+        transcript_backend=os.getenv("TRANSCRIPT_BACKEND", "none").lower(),
+        transcript_path=os.getenv("TRANSCRIPT_PATH") or None,
+        transcript_max_bytes=_env_int("TRANSCRIPT_MAX_BYTES", 50 * 1024 * 1024),
+        transcript_backups=_env_int("TRANSCRIPT_BACKUPS", 5),
+        transcript_queue_size=_env_int("TRANSCRIPT_QUEUE_SIZE", 10000),
+        transcript_batch_size=_env_int("TRANSCRIPT_BATCH_SIZE", 200),
+        transcript_flush_interval=_env_float("TRANSCRIPT_FLUSH_INTERVAL", 1.0),
+        transcript_overflow=os.getenv("TRANSCRIPT_OVERFLOW", "drop").lower(),
+    )
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import csv
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from app.data.loan_products import LOAN_PRODUCTS, LoanProduct
+
+
+# Products checked by a query's first block; most limited queries stop there.
+_FIRST_BLOCK = 64
+
+
+class ProductCatalog:
+    """Read-only product catalog with a rate-ordered index and cached serialized forms.
+
+    Products are ranked by interest rate once at construction. Amount bounds
+    and offered terms are stored as NumPy arrays over those ranks, so a query
+    checks them for a whole block of products at once and visits products
+    cheapest first. Dicts and JSON for each product are built once as well.
+    """
+
+    def __init__(self, products: Iterable[LoanProduct]) -> None:
+        # Catalog order is kept for listing; rate order drives queries.
+        self._products: List[LoanProduct] = list(products)
+        self._by_id: Dict[str, LoanProduct] = {product.id: product for product in self._products}
+        self._by_rate: List[LoanProduct] = sorted(self._products, key=lambda p: p.interest_rate)
+
+        self._rates = [product.interest_rate for product in self._by_rate]
+        self._min_amounts = np.array([product.min_amount for product in self._by_rate], dtype=float)
+        self._max_amounts = np.array([product.max_amount for product in self._by_rate], dtype=float)
+        self._offers_term: Dict[int, np.ndarray] = {}
+        for rank, product in enumerate(self._by_rate):
+            for term in product.term_months:
+                offered = self._offers_term.get(term)
+                if offered is None:
+                    offered = self._offers_term[term] = np.zeros(len(self._by_rate), dtype=bool)
+                offered[rank] = True
+
+        self._dicts: Dict[str, Dict[str, object]] = {
+            product.id: product.to_dict() for product in self._products
+        }
+        self._json: Dict[str, bytes] = {
+            product_id: json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            for product_id, data in self._dicts.items()
+        }
+        self._all_dicts = [self._dicts[product.id] for product in self._products]
+        self._all_json = self.json_array(product.id for product in self._products)
+
+    @classmethod
+    def from_file(cls, path: str) -> "ProductCatalog":
+        """Load a JSON array of product objects or a CSV with one product per row.
+
+        CSV ``term_months`` and ``eligibility`` cells separate values with ``|``.
+        """
+        file_path = Path(path)
+        if file_path.suffix.lower() == ".csv":
+            with file_path.open(newline="", encoding="utf-8") as handle:
+                return cls(_product_from_row(row) for row in csv.DictReader(handle))
+        with file_path.open(encoding="utf-8") as handle:
+            return cls(LoanProduct(**item) for item in json.load(handle))
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def __iter__(self) -> Iterator[LoanProduct]:
+        return iter(self._products)
+
+    def __contains__(self, product_id: object) -> bool:
+        return product_id in self._by_id
+
+    def get(self, product_id: str) -> Optional[LoanProduct]:
+        return self._by_id.get(product_id)
+
+    def first(self, count: int) -> List[LoanProduct]:
+        return self._products[:count]
+
+    def as_dicts(self) -> List[Dict[str, object]]:
+        """Every product as a dict, built once. Callers must not mutate them."""
+        return self._all_dicts
+
+    def as_json(self) -> bytes:
+        return self._all_json
+
+    def product_dict(self, product_id: str) -> Dict[str, object]:
+        return self._dicts[product_id]
+
+    def product_json(self, product_id: str) -> bytes:
+        return self._json[product_id]
+
+    def json_array(self, product_ids: Iterable[str]) -> bytes:
+        """JSON array spliced from the cached per-product fragments."""
+        return b"[" + b",".join(self._json[product_id] for product_id in product_ids) + b"]"
+
+    def query(
+        self,
+        amount: Optional[float] = None,
+        term_months: Optional[int] = None,
+        max_rate: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[LoanProduct]:
+        """Products covering ``amount`` and offering ``term_months``, cheapest rate first.
+
+        ``max_rate`` is a bisect on the rate index. Amount and term are then
+        checked in NumPy over the rate ranks, a block at a time, with blocks
+        growing fourfold; the scan stops at the block that fills ``limit``.
+        This is not logarithmic: no single ordering serves all three range
+        conditions, so the cost is the cheapest-first prefix scanned until
+        ``limit`` products match, or every product under the rate cap.
+        """
+        end = len(self._rates) if max_rate is None else bisect_right(self._rates, max_rate)
+        offered = None
+        if term_months is not None:
+            offered = self._offers_term.get(term_months)
+            if offered is None:
+                return []
+        if amount is None and offered is None:
+            return self._by_rate[:end][:limit]
+
+        results: List[LoanProduct] = []
+        start, block = 0, _FIRST_BLOCK
+        while start < end and (limit is None or len(results) < limit):
+            stop = min(end, start + block)
+            if amount is not None:
+                matches = (self._min_amounts[start:stop] <= amount) & (amount <= self._max_amounts[start:stop])
+                if offered is not None:
+                    matches &= offered[start:stop]
+            else:
+                matches = offered[start:stop]
+            results.extend(self._by_rate[rank] for rank in (np.flatnonzero(matches) + start).tolist())
+            start, block = stop, block * 4
+        return results[:limit]
+
+
+def _product_from_row(row: Dict[str, str]) -> LoanProduct:
+    return LoanProduct(
+        id=row["id"],
+        name=row["name"],
+        description=row["description"],
+        min_amount=int(row["min_amount"]),
+        max_amount=int(row["max_amount"]),
+        interest_rate=float(row["interest_rate"]),
+        term_months=[int(term) for term in row["term_months"].split("|") if term],
+        eligibility=[rule for rule in row.get("eligibility", "").split("|") if rule],
+    )
+
+
+DEFAULT_CATALOG = ProductCatalog(LOAN_PRODUCTS.values())
+
+
+def load_catalog(path: Optional[str]) -> ProductCatalog:
+    return ProductCatalog.from_file(path) if path else DEFAULT_CATALOG
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+
+# Everyday words mapped onto terms the product texts actually use, so the
+# similarity index can place messages such as "renovate my kitchen" that share
+# no vocabulary with any product. Matching is per word, after the same
+# lowercasing and plural folding the index applies to product texts.
+QUERY_EXPANSIONS: Dict[str, List[str]] = {
+    # Home
+    "house": ["home"],
+    "renovate": ["home", "upgrader"],
+    "renovation": ["home", "upgrader"],
+    "remodel": ["home", "upgrader"],
+    "kitchen": ["home"],
+    "bathroom": ["home"],
+    "roof": ["home"],
+    "apartment": ["home", "buyer"],
+    "condo": ["home", "buyer"],
+    "property": ["home"],
+    "downsize": ["home", "upgrader"],
+    # Vehicles
+    "truck": ["vehicle", "car"],
+    "suv": ["vehicle", "car"],
+    "van": ["vehicle", "car"],
+    "motorcycle": ["vehicle"],
+    "dealership": ["vehicle", "car"],
+    # Business
+    "shop": ["business"],
+    "store": ["business"],
+    "startup": ["business", "expansion"],
+    "company": ["business"],
+    "restaurant": ["business"],
+    "inventory": ["business", "working", "capital"],
+    "payroll": ["business", "working", "capital"],
+    "equipment": ["business", "expansion"],
+    "expand": ["business", "expansion"],
+    # Debt
+    "card": ["debt", "consolidate"],
+    "bill": ["debt", "payment"],
+    "consolidating": ["consolidate"],
+    "payoff": ["debt", "consolidate"],
+    "paying": ["payment"],
+    "owe": ["debt"],
+    "collection": ["debt"],
+    # Education
+    "student": ["education"],
+    "tuition": ["education"],
+    "college": ["education", "undergraduate"],
+    "university": ["education", "undergraduate"],
+    "school": ["education"],
+    "degree": ["education", "program"],
+    "master": ["education", "postgraduate"],
+    "mba": ["education", "postgraduate"],
+    "phd": ["education", "postgraduate"],
+    "course": ["education", "program"],
+    "study": ["education"],
+}
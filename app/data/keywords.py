@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+
+# Keyword table driving intent, mood and product detection. Keywords match on
+# word boundaries and also accept a plural "s"/"es" suffix; other inflections
+# ("quickly", "interested") are listed explicitly, in every list they belong
+# to. Tags are grouped by prefix; within a prefix, table order is priority order.
+KEYWORD_TABLE: Dict[str, List[str]] = {
+    "product:home_plus": ["home", "house", "mortgage"],
+    "product:auto_express": ["car", "vehicle", "auto"],
+    "product:biz_growth": ["business", "company", "startup"],
+    "product:debt_relief": [
+        "debt",
+        "consolidate",
+        "consolidated",
+        "consolidating",
+        "consolidation",
+        "credit card",
+    ],
+    "product:edu_future": ["school", "college", "education", "study", "studies", "studying"],
+    "loan": [
+        "loan",
+        "borrow",
+        "borrowing",
+        "borrowed",
+        "finance",
+        "financing",
+        "financed",
+        "refinance",
+        "refinancing",
+        "mortgage",
+        "credit",
+        "debt",
+        "rate",
+        "interest",
+        "interested",
+        "home",
+        "car",
+        "business",
+        "education",
+    ],
+    "loan_terms": ["loan", "rate", "interest"],
+    "mood:stressed": [
+        "worried",
+        "worry",
+        "worries",
+        "worrying",
+        "stressed",
+        "stress",
+        "stressful",
+        "stressing",
+        "anxious",
+        "anxiety",
+        "overwhelmed",
+        "overwhelming",
+        "nervous",
+        "unsure",
+        "confused",
+        "confusing",
+    ],
+    "mood:excited": ["excited", "exciting", "thrilled", "can't wait", "pumped", "stoked"],
+    "mood:urgent": [
+        "urgent",
+        "urgently",
+        "asap",
+        "deadline",
+        "rush",
+        "rushed",
+        "rushing",
+        "quick",
+        "quickly",
+        "soon",
+        "sooner",
+    ],
+    "mood:celebratory": [
+        "celebrate",
+        "celebrating",
+        "celebration",
+        "milestone",
+        "wedding",
+        "baby",
+        "graduation",
+        "graduating",
+        "anniversary",
+    ],
+    "intent:goal": ["goal", "want", "wanted", "wanting", "need", "needed", "needing", "looking", "hoping"],
+    "intent:pricing": ["rate", "interest", "cost", "price", "how much"],
+    "intent:speed": ["urgent", "urgently", "quick", "quickly", "soon", "sooner", "asap", "fast", "faster"],
+    "topic:business": ["business", "company"],
+}
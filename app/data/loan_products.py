@@ -115,10 +115,6 @@ LOAN_PRODUCTS: Dict[str, LoanProduct] = {
 }
 
 
-def list_products() -> List[Dict[str, object]]:
-    return [product.to_dict() for product in LOAN_PRODUCTS.values()]
-
-
 def get_product(product_id: str) -> LoanProduct | None:
     return LOAN_PRODUCTS.get(product_id)
 
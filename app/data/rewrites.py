@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import List, Tuple
+
+
+# Formal phrases rewritten into their casual form. Phrases match whole words,
+# case-insensitively, and the replacement takes on the case of the match
+# ("It is" -> "It's", "DO NOT" -> "DON'T"). Where phrases overlap, the longest
+# one wins.
+REWRITE_RULES: List[Tuple[str, str]] = [
+    ("I understand that", "I get that"),
+    ("I would like to", "I'd like to"),
+    ("I am", "I'm"),
+    ("you are", "you're"),
+    ("it is", "it's"),
+    ("that is", "that's"),
+    ("do not", "don't"),
+    ("cannot", "can't"),
+    ("will not", "won't"),
+]
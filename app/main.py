@@ -1,17 +1,70 @@
 from __future__ import annotations
 
+import asyncio
 import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app.config import load_settings
+from app.data.catalog import load_catalog
 from app.routes.chat import router as chat_router
-
-
-app = FastAPI(title="AstraFin Loan Advisor", version="0.1.0")
+from app.routes.pages import router as pages_router
+from app.routes.products import router as products_router
+from app.routes.quotes import router as quotes_router
+from app.services.assets import PageRenderer, StaticAssets
+from app.services.conversation import ConversationEngine
+from app.services.eligibility import EligibilityScreen
+from app.services.metrics import METRICS, MetricsMiddleware
+from app.services.quotes import QuoteEngine
+from app.services.sessions import build_session_store
+from app.services.transcripts import build_transcript_log
+
+
+base_dir = os.path.dirname(os.path.dirname(__file__))
+templates_dir = os.path.join(base_dir, "templates")
+static_dir = os.path.join(base_dir, "static")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = load_settings()
+    app.state.settings = settings
+    METRICS.enabled = settings.metrics_enabled
+    app.state.catalog = load_catalog(settings.catalog_path)
+    app.state.quotes = QuoteEngine(app.state.catalog)
+    app.state.eligibility = EligibilityScreen(app.state.catalog)
+    app.state.transcripts = build_transcript_log(settings)
+    if app.state.transcripts is not None:
+        app.state.transcripts.start()
+    app.state.engine = ConversationEngine.from_settings(
+        settings,
+        catalog=app.state.catalog,
+        quotes=app.state.quotes,
+        eligibility=app.state.eligibility,
+        transcripts=app.state.transcripts,
+    )
+    app.state.session_store = build_session_store(settings)
+    app.state.assets = StaticAssets(static_dir, reload=settings.assets_reload)
+    app.state.pages = PageRenderer(templates_dir, app.state.assets, reload=settings.assets_reload)
+    app.state.pages.page("index.html")
+    # Warming runs beside the event loop so /health answers at once; /ready waits for it.
+    app.state.warm_up = asyncio.create_task(asyncio.to_thread(app.state.engine.warm_up))
+    try:
+        yield
+    finally:
+        await asyncio.gather(app.state.warm_up, return_exceptions=True)
+        await app.state.session_store.close()
+        await app.state.engine.aclose()
+        if app.state.transcripts is not None:
+            # Last, so turns answered during shutdown are written too.
+            await app.state.transcripts.close()
+
+
+app = FastAPI(title="AstraFin Loan Advisor", version="0.1.0", lifespan=lifespan)
 
 
 origins = os.getenv("CORS_ORIGINS", "*").split(",")
@@ -24,27 +77,34 @@ app.add_middleware(
 )
 
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
-
-templates_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
-
-jinja_env = Environment(
-    loader=FileSystemLoader(templates_dir),
-    autoescape=select_autoescape(["html", "xml"]),
-)
-
-
-@app.get("/", response_class=HTMLResponse)
-async def home(request: Request) -> HTMLResponse:
-    template = jinja_env.get_template("index.html")
-    html = template.render(request=request)
-    return HTMLResponse(html)
+app.add_middleware(MetricsMiddleware)
 
 
+app.include_router(pages_router)
 app.include_router(chat_router)
+app.include_router(products_router)
+app.include_router(quotes_router)
 
 
 @app.get("/health")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
 
+
+@app.get("/ready")
+async def ready(request: Request) -> JSONResponse:
+    """503 until the engine, catalog and prompt caches are warm, then what was warmed."""
+    warm_up = getattr(request.app.state, "warm_up", None)
+    if warm_up is None or not warm_up.done():
+        return JSONResponse({"status": "starting"}, status_code=503)
+    if warm_up.cancelled() or warm_up.exception() is not None:
+        error = "cancelled" if warm_up.cancelled() else repr(warm_up.exception())
+        return JSONResponse({"status": "failed", "error": error}, status_code=503)
+    return JSONResponse({"status": "ready", "checks": warm_up.result()})
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    if not METRICS.enabled:
+        return PlainTextResponse("metrics are disabled\n", status_code=404)
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, ModelWrapValidatorHandler, model_validator
+
+from app.services.metrics import VALIDATION_SECONDS
+
+
+class TimedModel(BaseModel):
+    """Request model whose validation time is recorded per model class."""
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _timed_validation(cls, data: Any, handler: ModelWrapValidatorHandler[Any]) -> Any:
+        with VALIDATION_SECONDS.time(cls.__name__):
+            return handler(data)
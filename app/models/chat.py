@@ -4,18 +4,35 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field, constr
 
+from app.models.base import TimedModel
+
 
 Role = constr(to_lower=True, pattern=r"^(user|assistant)$")
+SessionId = constr(pattern=r"^[A-Za-z0-9_-]{8,64}$")
+
+# Bounds what a client can upload to seed a session or answer a stateless turn.
+MAX_HISTORY_MESSAGES = 50
 
 
 class Message(BaseModel):
     role: Role
-    content: str = Field(min_length=1)
+    content: str = Field(min_length=1, max_length=4000)
 
 
-class ChatRequest(BaseModel):
+class ChatRequest(TimedModel):
     message: str = Field(min_length=1, max_length=500)
-    history: List[Message] = Field(default_factory=list)
+    # When the server knows the session, ``history`` is ignored and may be omitted.
+    session_id: Optional[SessionId] = None
+    history: List[Message] = Field(default_factory=list, max_length=MAX_HISTORY_MESSAGES)
+    # Seeds the rule-based reply's phrasing; defaults to the session id.
+    seed: Optional[int] = None
+
+
+class ChatFrame(TimedModel):
+    """One message sent over the chat WebSocket; the connection holds the history."""
+
+    message: str = Field(min_length=1, max_length=500)
+    seed: Optional[int] = None
 
 
 class Suggestion(BaseModel):
@@ -32,5 +49,15 @@ class Suggestion(BaseModel):
 class ChatResponse(BaseModel):
     reply: str
     suggestions: List[Suggestion]
+    # llm | hedge | cache | rule | deadline | circuit_open | busy
     source: Optional[str] = None
+    session_id: Optional[str] = None
+
+
+# Hard ceiling checked while parsing; ``BATCH_MAX_REQUESTS`` can only lower it.
+MAX_BATCH_REQUESTS = 10000
+
 
+class BatchChatRequest(TimedModel):
+    # Each turn is answered on its own history; ``session_id`` is ignored.
+    requests: List[ChatRequest] = Field(min_length=1, max_length=MAX_BATCH_REQUESTS)
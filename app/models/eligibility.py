@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import Field
+
+from app.models.base import TimedModel
+
+
+class EligibilityRequest(TimedModel):
+    """Applicant facts; leave out what is not known."""
+
+    credit_score: Optional[int] = Field(default=None, ge=300, le=850)
+    business_credit_score: Optional[int] = Field(default=None, ge=0, le=100)
+    dti: Optional[float] = Field(default=None, ge=0, le=100, description="Debt-to-income ratio in percent")
+    annual_revenue: Optional[float] = Field(default=None, ge=0)
+    years_operating: Optional[float] = Field(default=None, ge=0)
+    vehicle_age: Optional[float] = Field(default=None, ge=0)
+    years_since_bankruptcy: Optional[float] = Field(default=None, ge=0)
+    employed: Optional[bool] = None
+    insured: Optional[bool] = None
+    enrolled: Optional[bool] = None
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from pydantic import Field
+
+from app.models.base import TimedModel
+
+
+class QuoteRequest(TimedModel):
+    amount: float = Field(gt=0)
+    term_months: Optional[int] = Field(default=None, gt=0)
+    product_ids: Optional[List[str]] = None
+
+
+class AffordabilityRequest(TimedModel):
+    monthly_budget: float = Field(gt=0)
+    term_months: Optional[int] = Field(default=None, gt=0)
+    product_ids: Optional[List[str]] = None
@@ -1,27 +1,197 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+import uuid
+from contextlib import aclosing
+from typing import AsyncIterator, Optional
 
-from app.models.chat import ChatRequest, ChatResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.requests import HTTPConnection
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.models.chat import BatchChatRequest, ChatFrame, ChatRequest, ChatResponse
+from app.services.batch import BatchRunner
 from app.services.conversation import ConversationEngine
+from app.services.resilience import RateLimiter
+from app.services.serialization import SplicedJSONResponse
+from app.services.sessions import SessionState, SessionStore
 
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
 
-def get_engine() -> ConversationEngine:
-    return ConversationEngine()
+def get_engine(request: HTTPConnection) -> ConversationEngine:
+    """Return the process-wide engine created in the app lifespan.
+
+    Tests can swap it via ``app.dependency_overrides[get_engine]``.
+    """
+    return request.app.state.engine
+
+
+def get_session_store(request: HTTPConnection) -> SessionStore:
+    return request.app.state.session_store
+
+
+async def _open_session(
+    payload: ChatRequest, engine: ConversationEngine, store: SessionStore
+) -> SessionState:
+    """Load the caller's session, or start one seeded from the posted history.
+
+    New sessions always get a server-generated id; an unknown or expired
+    ``session_id`` is never adopted, so clients cannot choose ids.
+    """
+    if payload.session_id:
+        session = await store.get(payload.session_id)
+        if session is not None:
+            return session
+    return engine.new_session(uuid.uuid4().hex, [message.model_dump() for message in payload.history])
 
 
 @router.post("/respond", response_model=ChatResponse)
 async def chat_respond(
-    payload: ChatRequest, engine: ConversationEngine = Depends(get_engine)
-) -> ChatResponse:
+    payload: ChatRequest,
+    engine: ConversationEngine = Depends(get_engine),
+    store: SessionStore = Depends(get_session_store),
+) -> SplicedJSONResponse:
+    if not payload.message.strip():
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+
+    session = await _open_session(payload, engine, store)
+    result = await engine.respond(payload.message, session.history, session, payload.seed)
+    await store.save(session)
+
+    # Serialized without re-validating catalog products: ``response_model`` only documents the shape.
+    return SplicedJSONResponse(
+        {
+            "reply": result["reply"],
+            "suggestions": engine.suggestions_json(result["suggestions"]),
+            "source": result["source"],
+            "session_id": session.session_id,
+        }
+    )
+
+
+@router.post("/batch")
+async def chat_batch(
+    payload: BatchChatRequest,
+    request: Request,
+    engine: ConversationEngine = Depends(get_engine),
+) -> StreamingResponse:
+    """Answer many stateless turns, streaming one NDJSON line per turn as it completes."""
+    settings = request.app.state.settings
+    if len(payload.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.batch_max_requests} requests per batch"
+        )
+    blank = next((index for index, turn in enumerate(payload.requests) if not turn.message.strip()), None)
+    if blank is not None:
+        raise HTTPException(status_code=400, detail=f"Message cannot be empty (request {blank})")
+
+    runner = BatchRunner(engine, settings.batch_concurrency)
+    return StreamingResponse(runner.ndjson(payload.requests), media_type="application/x-ndjson")
+
+
+@router.post("/stream")
+async def chat_stream(
+    payload: ChatRequest,
+    engine: ConversationEngine = Depends(get_engine),
+    store: SessionStore = Depends(get_session_store),
+) -> StreamingResponse:
+    """Stream the reply as server-sent events: ``suggestions``, ``token``..., ``done``."""
     if not payload.message.strip():
         raise HTTPException(status_code=400, detail="Message cannot be empty")
 
-    conversation = [message.model_dump() for message in payload.history]
-    result = engine.respond(payload.message, conversation)
+    session = await _open_session(payload, engine, store)
+    return StreamingResponse(
+        _sse_events(engine, store, payload, session),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _sse_events(
+    engine: ConversationEngine, store: SessionStore, payload: ChatRequest, session: SessionState
+) -> AsyncIterator[str]:
+    async with aclosing(engine.stream(payload.message, session.history, session, payload.seed)) as events:
+        async for event in events:
+            if event["event"] == "done":
+                await store.save(session)
+                event["data"]["session_id"] = session.session_id
+            if event["event"] == "suggestions":
+                data = engine.suggestions_json(event["data"]).decode("utf-8")
+            else:
+                data = json.dumps(event["data"], ensure_ascii=False)
+            yield f"event: {event['event']}\ndata: {data}\n\n"
+
+
+# Room for a 500-character message as escaped JSON; larger frames are not parsed.
+_MAX_FRAME_CHARS = 4096
+
+
+@router.websocket("/ws")
+async def chat_socket(
+    websocket: WebSocket,
+    session_id: Optional[str] = Query(default=None, pattern=r"^[A-Za-z0-9_-]{8,64}$"),
+    engine: ConversationEngine = Depends(get_engine),
+    store: SessionStore = Depends(get_session_store),
+) -> None:
+    """Chat over one connection that holds the session between turns.
+
+    Clients send ``{"message": ..., "seed": ...}`` frames and get the same
+    events as :func:`chat_stream` back as JSON frames, after an initial
+    ``session`` event. Rejected frames, binary ones included, get an
+    ``error`` event; the connection is closed after ``ws_idle_timeout`` seconds without a frame.
+    """
+    settings = websocket.app.state.settings
+    await websocket.accept()
+    session = await store.get(session_id) if session_id else None
+    if session is None:
+        session = engine.new_session(uuid.uuid4().hex, [])
+    limiter = RateLimiter(settings.ws_messages_per_minute, 60.0)
+
+    try:
+        await websocket.send_json({"event": "session", "data": {"session_id": session.session_id}})
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.receive(), settings.ws_idle_timeout)
+            except asyncio.TimeoutError:
+                await websocket.close(code=status.WS_1000_NORMAL_CLOSURE, reason="idle timeout")
+                return
+            if message["type"] == "websocket.disconnect":
+                return
+            text = message.get("text")
+
+            retry_after = limiter.acquire()
+            if retry_after:
+                await _send_error(websocket, "Too many messages", retry_after=round(retry_after, 1))
+                continue
+            if text is None:
+                await _send_error(websocket, "Only text frames are accepted")
+                continue
+            if len(text) > _MAX_FRAME_CHARS:
+                await _send_error(websocket, "Frame too large")
+                continue
+            try:
+                frame = ChatFrame.model_validate_json(text)
+            except ValidationError as exc:
+                await _send_error(websocket, exc.errors(include_url=False, include_context=False))
+                continue
+            if not frame.message.strip():
+                await _send_error(websocket, "Message cannot be empty")
+                continue
+
+            # Closed explicitly so a send failing mid-reply still ends the stream's LLM call.
+            async with aclosing(engine.stream(frame.message, session.history, session, frame.seed)) as events:
+                async for event in events:
+                    if event["event"] == "done":
+                        await store.save(session)
+                        event["data"]["session_id"] = session.session_id
+                    await websocket.send_json(event)
+    except WebSocketDisconnect:
+        return
 
-    return ChatResponse(**result, source="llm" if engine._client else "rule")
 
+async def _send_error(websocket: WebSocket, detail: object, **extra: object) -> None:
+    await websocket.send_json({"event": "error", "data": {"detail": detail, **extra}})
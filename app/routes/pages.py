@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.services.assets import REVALIDATE, Asset
+
+
+router = APIRouter(include_in_schema=False)
+
+
+def _serve(request: Request, asset: Asset, cache_control: str) -> Response:
+    """Send the best encoding the client accepts, or 304 if it already has it."""
+    encoding = asset.negotiate(request.headers.get("accept-encoding", ""))
+    headers = asset.headers(encoding, cache_control)
+    if asset.not_modified(request.headers.get("if-none-match", ""), encoding):
+        return Response(status_code=304, headers=headers)
+    body = asset.encoded[encoding] if encoding else asset.body
+    return Response(body, media_type=asset.media_type, headers=headers)
+
+
+@router.get("/")
+async def home(request: Request) -> Response:
+    # The page references assets by hashed URL, so only the page itself needs revalidating.
+    return _serve(request, request.app.state.pages.page("index.html"), REVALIDATE)
+
+
+@router.api_route("/static/{path:path}", methods=["GET", "HEAD"])
+async def static(path: str, request: Request) -> Response:
+    asset, cache_control = request.app.state.assets.lookup(path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return _serve(request, asset, cache_control)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+
+from app.data.catalog import ProductCatalog
+from app.models.eligibility import EligibilityRequest
+from app.services.eligibility import EligibilityScreen
+
+
+router = APIRouter(prefix="/api/products", tags=["products"])
+
+
+def get_catalog(request: Request) -> ProductCatalog:
+    return request.app.state.catalog
+
+
+def get_eligibility(request: Request) -> EligibilityScreen:
+    return request.app.state.eligibility
+
+
+@router.get("")
+async def list_catalog(
+    amount: Optional[float] = Query(default=None, gt=0),
+    term_months: Optional[int] = Query(default=None, gt=0),
+    max_rate: Optional[float] = Query(default=None, gt=0),
+    limit: Optional[int] = Query(default=None, gt=0, le=100),
+    catalog: ProductCatalog = Depends(get_catalog),
+) -> Response:
+    """Products matching the filters, cheapest rate first; the full catalog without filters.
+
+    The body is spliced from JSON serialized once when the catalog was loaded.
+    """
+    if amount is None and term_months is None and max_rate is None and limit is None:
+        return Response(catalog.as_json(), media_type="application/json")
+
+    products = catalog.query(amount=amount, term_months=term_months, max_rate=max_rate, limit=limit)
+    return Response(catalog.json_array(product.id for product in products), media_type="application/json")
+
+
+@router.post("/eligibility")
+async def eligibility(
+    payload: EligibilityRequest, screen: EligibilityScreen = Depends(get_eligibility)
+) -> List[Dict[str, object]]:
+    """Every product as eligible, ineligible (with the failing rules) or unknown (with the facts still needed)."""
+    return [screening.to_dict() for screening in screen.screen(payload.model_dump(exclude_none=True))]
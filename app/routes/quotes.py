@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from app.models.quotes import AffordabilityRequest, QuoteRequest
+from app.services.quotes import QuoteEngine
+
+
+router = APIRouter(prefix="/api/quotes", tags=["quotes"])
+
+
+def get_quote_engine(request: Request) -> QuoteEngine:
+    return request.app.state.quotes
+
+
+@router.post("")
+async def quote(payload: QuoteRequest, engine: QuoteEngine = Depends(get_quote_engine)) -> List[Dict[str, object]]:
+    """Payment quotes for every offer that lends the amount, lowest monthly payment first."""
+    quotes = engine.quote(payload.amount, payload.product_ids, payload.term_months)
+    return [item.to_dict() for item in quotes]
+
+
+@router.post("/affordability")
+async def affordability(
+    payload: AffordabilityRequest, engine: QuoteEngine = Depends(get_quote_engine)
+) -> List[Dict[str, object]]:
+    """Largest amount each offer can lend within the monthly budget."""
+    offers = engine.affordability(payload.monthly_budget, payload.product_ids, payload.term_months)
+    return [item.to_dict() for item in offers]
+
+
+@router.get("/schedule")
+async def schedule(
+    product_id: str,
+    amount: float = Query(gt=0),
+    term_months: int = Query(gt=0, le=480),
+    engine: QuoteEngine = Depends(get_quote_engine),
+) -> Dict[str, List[float]]:
+    """Month-by-month amortization of ``amount`` over ``term_months``; both must be offered by the product."""
+    try:
+        return engine.schedule(product_id, amount, term_months)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Unknown product") from None
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
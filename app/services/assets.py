@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+
+try:
+    import brotli
+except ImportError:  # Optional: without it assets are only precompressed with gzip.
+    brotli = None
+
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+_COMPRESSIBLE = {"application/javascript", "application/json", "image/svg+xml"}
+
+
+@dataclass(frozen=True)
+class Asset:
+    """A response body prepared once: content hash and smaller encoded variants."""
+
+    body: bytes
+    media_type: str
+    digest: str
+    # Content-Encoding -> body, only for encodings that actually shrink it.
+    encoded: Dict[str, bytes]
+
+    @classmethod
+    def build(cls, body: bytes, media_type: str) -> "Asset":
+        encoded: Dict[str, bytes] = {}
+        if media_type.startswith("text/") or media_type.split(";")[0] in _COMPRESSIBLE:
+            if brotli is not None:
+                encoded["br"] = brotli.compress(body, quality=11)
+            # mtime=0 keeps the gzip bytes, and so the ETag, stable across restarts.
+            encoded["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            encoded = {name: data for name, data in encoded.items() if len(data) < len(body)}
+        return cls(body, media_type, hashlib.sha256(body).hexdigest()[:16], encoded)
+
+    def etag(self, encoding: Optional[str]) -> str:
+        # Strong ETags must differ between encodings of the same content.
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """The encoding to send for an ``Accept-Encoding`` header; ``None`` means identity."""
+        accepted = _accepted_encodings(accept_encoding)
+        for name in ("br", "gzip"):
+            if name in self.encoded and (name in accepted or "*" in accepted):
+                return name
+        return None
+
+    def headers(self, encoding: Optional[str], cache_control: str) -> Dict[str, str]:
+        headers = {"ETag": self.etag(encoding), "Cache-Control": cache_control}
+        if self.encoded:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return headers
+
+    def not_modified(self, if_none_match: str, encoding: Optional[str]) -> bool:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag(encoding) in tags
+
+
+def _accepted_encodings(header: str) -> List[str]:
+    accepted = []
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        if name and quality not in ("0", "0.0", "0.00", "0.000"):
+            accepted.append(name.strip().lower())
+    return accepted
+
+
+def _media_type(path: str) -> str:
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type in _COMPRESSIBLE:
+        media_type += "; charset=utf-8"
+    return media_type
+
+
+def _hashed_name(path: str, digest: str) -> str:
+    stem, suffix = os.path.splitext(path)
+    return f"{stem}.{digest[:10]}{suffix}"
+
+
+class StaticAssets:
+    """Every file under ``directory`` read, hashed and compressed once.
+
+    Each file is reachable under its plain path and under a content-hashed
+    name (``css/styles.<hash>.css``); :meth:`url` returns the hashed one,
+    which can be cached forever since new content gets a new URL. With
+    ``reload`` the directory is rescanned whenever a file changes.
+    """
+
+    def __init__(self, directory: str, prefix: str = "/static", reload: bool = False) -> None:
+        self.directory = directory
+        self.prefix = prefix.rstrip("/")
+        self.reload = reload
+        self._assets: Dict[str, Asset] = {}
+        self._hashed: Dict[str, str] = {}
+        self._signature: Tuple[Tuple[str, int, int], ...] = ()
+        # Bumped on every rescan, so pages know when their asset URLs went stale.
+        self.version = 0
+        self._scan(self._stat())
+
+    def url(self, path: str) -> str:
+        asset = self._assets.get(path)
+        if asset is None:
+            return f"{self.prefix}/{path}"
+        return f"{self.prefix}/{_hashed_name(path, asset.digest)}"
+
+    def lookup(self, path: str) -> Tuple[Optional[Asset], str]:
+        """The asset at ``path`` (plain or hashed) and the ``Cache-Control`` it is served with."""
+        self.refresh()
+        if path in self._hashed:
+            return self._assets[self._hashed[path]], IMMUTABLE
+        return self._assets.get(path), REVALIDATE
+
+    def refresh(self) -> bool:
+        """Rescan if reloading is on and any file changed; returns whether it did."""
+        if not self.reload:
+            return False
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._scan(signature)
+        return True
+
+    def _stat(self) -> Tuple[Tuple[str, int, int], ...]:
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                full_path = os.path.join(root, name)
+                stat = os.stat(full_path)
+                entries.append((full_path, stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(entries))
+
+    def _scan(self, signature: Tuple[Tuple[str, int, int], ...]) -> None:
+        assets: Dict[str, Asset] = {}
+        hashed: Dict[str, str] = {}
+        for full_path, _, _ in signature:
+            path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+            with open(full_path, "rb") as handle:
+                asset = Asset.build(handle.read(), _media_type(path))
+            assets[path] = asset
+            hashed[_hashed_name(path, asset.digest)] = path
+        self._assets, self._hashed, self._signature = assets, hashed, signature
+        self.version += 1
+
+
+class PageRenderer:
+    """Templates that do not vary per request, rendered once and kept as :class:`Asset`.
+
+    Templates get ``static_url`` for hashed asset URLs. With ``reload`` a
+    page is rendered again when its template or any static file changed.
+    """
+
+    def __init__(self, templates_dir: str, assets: StaticAssets, reload: bool = False) -> None:
+        self._assets = assets
+        self._reload = reload
+        self._env = Environment(
+            loader=FileSystemLoader(templates_dir),
+            autoescape=select_autoescape(["html", "xml"]),
+            auto_reload=reload,
+        )
+        self._env.globals["static_url"] = assets.url
+        self._pages: Dict[str, Tuple[Template, int, Asset]] = {}
+
+    def page(self, name: str) -> Asset:
+        cached = self._pages.get(name)
+        if cached is not None:
+            template, version, asset = cached
+            if not self._reload:
+                return asset
+            self._assets.refresh()
+            if template.is_up_to_date and version == self._assets.version:
+                return asset
+        template = self._env.get_template(name)
+        asset = Asset.build(template.render().encode("utf-8"), "text/html; charset=utf-8")
+        self._pages[name] = (template, self._assets.version, asset)
+        return asset
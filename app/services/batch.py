@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import AsyncIterator, Dict, Iterable, List
+
+from app.models.chat import ChatRequest
+from app.services.conversation import ConversationEngine, TurnPlan
+
+
+class BatchRunner:
+    """Answers many independent chat turns with at most ``concurrency`` replies in flight.
+
+    Turns are stateless: each one uses the history it was posted with and no
+    session is read or written. The rule-based planning of every turn runs
+    up front in one pass; only reply generation (the LLM call) is fanned out.
+    """
+
+    def __init__(self, engine: ConversationEngine, concurrency: int = 8) -> None:
+        self._engine = engine
+        self._concurrency = max(1, concurrency)
+
+    def plan(self, requests: Iterable[ChatRequest]) -> List[TurnPlan]:
+        return [
+            self._engine.plan_turn(
+                request.message, [message.model_dump() for message in request.history], seed=request.seed
+            )
+            for request in requests
+        ]
+
+    async def run(self, requests: Iterable[ChatRequest]) -> AsyncIterator[Dict[str, object]]:
+        """Yield ``{"index", "reply", "suggestions", "source"}`` per turn, in completion order.
+
+        A turn that fails yields ``{"index", "error"}`` instead; the rest carry on.
+        """
+        plans = self.plan(requests)
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def complete(index: int, plan: TurnPlan) -> Dict[str, object]:
+            async with semaphore:
+                try:
+                    result = await self._engine.complete(plan)
+                except Exception as exc:  # one bad turn must not sink the batch
+                    return {"index": index, "error": str(exc) or type(exc).__name__}
+            return {"index": index, **result}
+
+        tasks = [asyncio.create_task(complete(index, plan)) for index, plan in enumerate(plans)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # The consumer went away (e.g. the client disconnected): stop pending turns.
+            for task in tasks:
+                task.cancel()
+
+    async def ndjson(self, requests: Iterable[ChatRequest]) -> AsyncIterator[str]:
+        async for result in self.run(requests):
+            yield to_ndjson(result)
+
+
+def to_ndjson(record: Dict[str, object]) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Generic,
+    Hashable,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from app.config import Settings
+
+
+V = TypeVar("V")
+
+
+class LRUTTLCache(Generic[V]):
+    """Size-bounded LRU mapping whose entries also expire after ``ttl_seconds``.
+
+    Not thread-safe; it is meant to be used from the event loop.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CompletionCache:
+    """Caches finished LLM replies, keyed on the prompt they were generated for.
+
+    The key combines the stage, the normalized user message and a hash of
+    every other prompt message (system prompt, products, quotes, eligibility
+    notes, summary and conversation window), so only identical prompts share
+    a reply. Only the configured stages are cached (``*`` allows all).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, stages: FrozenSet[str]) -> None:
+        self._entries: LRUTTLCache[str] = LRUTTLCache(max_entries, ttl_seconds)
+        self._stages = stages
+
+    @property
+    def hits(self) -> int:
+        return self._entries.hits
+
+    @property
+    def misses(self) -> int:
+        return self._entries.misses
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def key(self, stage: str, messages: Sequence[Mapping[str, str]]) -> Optional[Hashable]:
+        """Cache key for a rendered prompt (user message last), or ``None`` for uncacheable stages."""
+        if "*" not in self._stages and stage not in self._stages:
+            return None
+        *context, message = messages
+        digest = hashlib.sha1(
+            json.dumps([[m.get("role"), m.get("content")] for m in context]).encode("utf-8")
+        ).hexdigest()
+        return (stage, normalize_message(message.get("content", "")), digest)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        return self._entries.get(key)
+
+    def set(self, key: Hashable, reply: str) -> None:
+        self._entries.set(key, reply)
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase, collapse whitespace and drop surrounding punctuation."""
+    return " ".join(message.lower().split()).strip(" .,!?;:")
+
+
+def build_completion_cache(settings: Settings) -> Optional[CompletionCache]:
+    if settings.completion_cache_size <= 0:
+        return None
+    return CompletionCache(
+        settings.completion_cache_size,
+        settings.completion_cache_ttl_seconds,
+        settings.completion_cache_stages,
+    )
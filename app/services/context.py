@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from app.services.prompts import MESSAGE_OVERHEAD_TOKENS, count_tokens
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+_SUMMARY_WORDS = 30
+
+
+@dataclass
+class RollingSummary:
+    """Extractive summary of the turns that slid out of the context window.
+
+    ``covered`` is the absolute number of conversation messages already folded
+    in, so the summary only grows by the messages that newly left the window
+    and the rendered text is rebuilt only when that happens.
+    """
+
+    covered: int = 0
+    lines: List[str] = field(default_factory=list)
+    text: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "RollingSummary":
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+    def extend(self, messages: Sequence[Mapping[str, str]], upto: int, max_tokens: int) -> None:
+        """Fold ``messages`` (absolute indexes ``upto - len(messages)``..``upto``) in."""
+        if upto <= self.covered:
+            return
+        start = max(0, len(messages) - (upto - self.covered))
+        for msg in messages[start:]:
+            if msg.get("role") == "user":
+                self.lines.append(f"- Customer: {_first_sentence(msg.get('content', ''))}")
+        self.covered = upto
+        # Oldest points go first once the summary outgrows its budget.
+        while self.lines and count_tokens("\n".join(self.lines)) > max_tokens:
+            self.lines.pop(0)
+        self.text = "\n".join(self.lines)
+
+
+def _first_sentence(text: str) -> str:
+    sentence = _SENTENCE_END.split(text.strip(), maxsplit=1)[0]
+    words = sentence.split()
+    if len(words) > _SUMMARY_WORDS:
+        return " ".join(words[:_SUMMARY_WORDS]) + "…"
+    return sentence
+
+
+@dataclass(frozen=True)
+class ContextWindow:
+    """The recent messages sent verbatim plus the summary of everything older."""
+
+    messages: List[Mapping[str, str]]
+    summary: str
+    tokens: int
+
+
+class ContextBuilder:
+    """Fits a conversation into a token budget.
+
+    The newest messages are kept verbatim (up to ``max_messages``) while they
+    fit; older ones are compacted into a :class:`RollingSummary`.
+    """
+
+    def __init__(self, max_messages: int = 10, summary_tokens: int = 200) -> None:
+        self.max_messages = max_messages
+        self.summary_tokens = summary_tokens
+
+    def build(
+        self,
+        history: Sequence[Mapping[str, str]],
+        available_tokens: int,
+        summary: Optional[RollingSummary] = None,
+        offset: int = 0,
+    ) -> ContextWindow:
+        """Select the window for ``history`` whose first message has absolute index ``offset``.
+
+        A session passes its stored ``summary`` so it is extended in place;
+        without one, a fresh summary is built for this call. Messages the
+        summary already covers are never sent verbatim again, even when this
+        turn's budget would fit them.
+        """
+        if summary is None:
+            summary = RollingSummary(covered=offset)
+        floor = min(len(history), max(0, summary.covered - offset))
+        budget = max(0, available_tokens - self.summary_tokens)
+        used = 0
+        start = len(history)
+        while start > floor and len(history) - start < self.max_messages:
+            cost = count_tokens(history[start - 1].get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+            if used + cost > budget:
+                break
+            used += cost
+            start -= 1
+
+        summary.extend(history[:start], offset + start, self.summary_tokens)
+        summary_tokens = count_tokens(summary.text) if summary.text else 0
+
+        return ContextWindow(messages=list(history[start:]), summary=summary.text, tokens=used + summary_tokens)
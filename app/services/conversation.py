@@ -1,222 +1,483 @@
 from __future__ import annotations
 
-import os
-import random
-from typing import Dict, List, Optional
+import asyncio
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    AsyncContextManager,
+    Awaitable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from app.config import Settings
+from app.data.catalog import DEFAULT_CATALOG, ProductCatalog
+from app.data.loan_products import LoanProduct
+from app.services.cache import CompletionCache, build_completion_cache
+from app.services.context import ContextBuilder
+from app.services.eligibility import INELIGIBLE, EligibilityScreen
+from app.services.facts import (
+    ApplicantProfile,
+    extract_amount,
+    extract_monthly_budget,
+    extract_term_months,
+)
+from app.services.fallback import FallbackTable, fallback_key, turn_seed
+from app.services.gateway import GatewayBusy, LLMGateway, build_llm_gateway
+from app.services.humanize import StreamingHumanizer, humanize
+from app.services.llm_client import api_errors, build_openai_client
+from app.services.matcher import KEYWORD_MATCHER, KeywordMatcher, MatchResult
+from app.services.metrics import LLM_TOKENS, REPLIES, STEP_SECONDS, TURNS
+from app.services.prompts import STAGE_PROMPTS, PromptLibrary, RenderedPrompt, count_tokens
+from app.services.quotes import QuoteEngine
+from app.services.resilience import CircuitBreaker, build_circuit_breaker, hedge
+from app.services.sessions import SessionState
+from app.services.similarity import SimilarityIndex
+from app.services.stage import StageMachine
+from app.services.transcripts import TranscriptLog, TurnRecord
+
+if TYPE_CHECKING:  # Loaded by ``llm_client`` only once an API key is configured.
+    from openai import AsyncOpenAI
+
+
+LLM_SAMPLING: Dict[str, float] = {
+    "temperature": 0.85,  # Higher temperature for more natural, varied responses
+    "max_tokens": 350,  # Increased for more natural conversation
+    "presence_penalty": 0.3,  # Encourage variety in responses
+    "frequency_penalty": 0.2,  # Reduce repetition
+}
+
+T = TypeVar("T")
+
+# Touches every rule-based step: a named product, an amount, a term and facts to screen.
+_WARM_UP_MESSAGE = (
+    "I'd like a personal loan of $15,000 over 36 months to consolidate my credit cards; "
+    "my credit score is 640 and I make $4,000 a month."
+)
+
+
+@dataclass
+class TurnPlan:
+    """Everything the rule-based part of a turn decided, before any reply is produced."""
+
+    message: str
+    conversation: List[Dict[str, str]]
+    session: Optional[SessionState]
+    match: MatchResult
+    stage: str
+    suggestions: List[LoanProduct]
+    mood: str
+    quotes: List[str] = field(default_factory=list)
+    # Why products the customer asked about were left out of ``suggestions``.
+    eligibility: List[str] = field(default_factory=list)
+    # Drives every random choice of the rule-based reply for this turn.
+    seed: Optional[int] = None
+    # ``time.perf_counter()`` when planning began; transcripts report latency from it.
+    started: float = field(default_factory=time.perf_counter)
 
-from openai import OpenAI
-from openai import APIError as OpenAIError
 
-from app.data.loan_products import LOAN_PRODUCTS, LoanProduct, list_products
+class ConversationEngine:
+    """Orchestrates chatbot conversations about loans.
 
+    One engine is shared by the whole process; it owns the pooled OpenAI client
+    and must be closed on shutdown.
+    """
 
-class ConversationEngine:
-    """Orchestrates chatbot conversations about loans."""
+    def __init__(
+        self,
+        client: Optional["AsyncOpenAI"] = None,
+        client_factory: Optional[Callable[[], Optional["AsyncOpenAI"]]] = None,
+        model: str = "gpt-4o-mini",
+        max_history: int = 20,
+        completion_cache: Optional[CompletionCache] = None,
+        prompts: Optional[PromptLibrary] = None,
+        context_builder: Optional[ContextBuilder] = None,
+        prompt_token_budget: int = 1500,
+        catalog: Optional[ProductCatalog] = None,
+        quotes: Optional[QuoteEngine] = None,
+        gateway: Optional[LLMGateway] = None,
+        latency_budget: Optional[float] = None,
+        hedge_delay: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        fallbacks: Optional[FallbackTable] = None,
+        similarity: Optional[SimilarityIndex] = None,
+        eligibility: Optional[EligibilityScreen] = None,
+        prerender_fallbacks: bool = False,
+        transcripts: Optional[TranscriptLog] = None,
+    ) -> None:
+        self._client: Optional["AsyncOpenAI"] = client
+        self._client_factory = client_factory
+        self._client_lock = threading.Lock()
+        self._llm_errors: Tuple[Type[BaseException], ...] = api_errors() if client is not None else ()
+        self._prerender_fallbacks = prerender_fallbacks
+        self._transcripts = transcripts
+        self._model = model
+        self._max_history = max_history
+        self._completion_cache = completion_cache
+        self._gateway = gateway
+        self._latency_budget = latency_budget
+        self._hedge_delay = hedge_delay
+        self._breaker = breaker
+        self._catalog = catalog or DEFAULT_CATALOG
+        self._prompts = prompts or PromptLibrary(self._catalog)
+        self._quotes = quotes or QuoteEngine(self._catalog)
+        self._fallbacks = fallbacks or FallbackTable()
+        self._similarity = similarity or SimilarityIndex(self._catalog)
+        self._eligibility = eligibility or EligibilityScreen(self._catalog)
+        self._context = context_builder or ContextBuilder()
+        self._prompt_token_budget = prompt_token_budget
+        self._matcher: KeywordMatcher = KEYWORD_MATCHER
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        catalog: Optional[ProductCatalog] = None,
+        quotes: Optional[QuoteEngine] = None,
+        eligibility: Optional[EligibilityScreen] = None,
+        transcripts: Optional[TranscriptLog] = None,
+    ) -> "ConversationEngine":
+        return cls(
+            catalog=catalog,
+            quotes=quotes,
+            eligibility=eligibility,
+            transcripts=transcripts,
+            client_factory=partial(build_openai_client, settings),
+            model=settings.openai_model,
+            max_history=settings.session_max_history,
+            completion_cache=build_completion_cache(settings),
+            gateway=build_llm_gateway(settings),
+            latency_budget=settings.llm_latency_budget or None,
+            hedge_delay=settings.llm_hedge_delay or None,
+            breaker=build_circuit_breaker(settings),
+            prerender_fallbacks=settings.fallback_prerender,
+            similarity=SimilarityIndex(catalog or DEFAULT_CATALOG, min_score=settings.similarity_min_score),
+            context_builder=ContextBuilder(
+                max_messages=settings.context_max_messages,
+                summary_tokens=settings.context_summary_tokens,
+            ),
+            prompt_token_budget=settings.prompt_token_budget,
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+
+    def warm_up(self) -> Dict[str, object]:
+        """Do the one-off work the first turns would otherwise pay for, and report it.
+
+        Builds the OpenAI client (importing the SDK) when a key is configured,
+        fills the rule-based reply table if asked to, and runs one message
+        through every rule-based step and every stage's prompt sizing. No
+        metrics are recorded. Blocking; the app runs it in a worker thread.
+        """
+        started = time.perf_counter()
+        client = self._llm()
+        if self._prerender_fallbacks:
+            self._fallbacks.prerender()
+
+        match = self._matcher.scan(_WARM_UP_MESSAGE)
+        suggestions, eligibility = self._select_products(_WARM_UP_MESSAGE, match, ApplicantProfile())
+        quotes = self._quote_lines(_WARM_UP_MESSAGE, suggestions)
+        mood = self._detect_emotion(_WARM_UP_MESSAGE, match)
+        for stage in STAGE_PROMPTS:
+            self._prompts.fixed_tokens(stage, _WARM_UP_MESSAGE, suggestions, quotes, eligibility)
+            self._fallback_response(
+                _WARM_UP_MESSAGE, suggestions, stage, [], mood, match, quotes, 0, eligibility
+            )
+        return {
+            "catalog_products": len(self._catalog),
+            "prompt_stages": len(STAGE_PROMPTS),
+            "fallback_replies": len(self._fallbacks),
+            "llm": "ready" if client is not None else "disabled",
+            "warm_up_seconds": round(time.perf_counter() - started, 4),
+        }
 
-    def __init__(self) -> None:
-        self._client: Optional[OpenAI] = None
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            self._client = OpenAI(api_key=api_key)
+    def _llm(self) -> Optional["AsyncOpenAI"]:
+        """The OpenAI client, built on first use; ``None`` when no API key is configured."""
+        if self._client_factory is not None:
+            # Warm-up builds it in a worker thread; a turn arriving meanwhile waits for it.
+            with self._client_lock:
+                if self._client_factory is not None:
+                    client = self._client_factory()
+                    if client is not None:
+                        self._llm_errors = api_errors()
+                    self._client = client
+                    self._client_factory = None
+        return self._client
 
     def available_products(self) -> List[Dict[str, object]]:
-        return list_products()
-
-    def suggest_products(self, message: str) -> List[LoanProduct]:
-        lowered = message.lower()
-        suggestions: List[LoanProduct] = []
-
-        if any(keyword in lowered for keyword in ["home", "house", "mortgage"]):
-            suggestions.append(LOAN_PRODUCTS["home_plus"])
-        if any(keyword in lowered for keyword in ["car", "vehicle", "auto"]):
-            suggestions.append(LOAN_PRODUCTS["auto_express"])
-        if any(keyword in lowered for keyword in ["business", "company", "startup"]):
-            suggestions.append(LOAN_PRODUCTS["biz_growth"])
-        if any(keyword in lowered for keyword in ["debt", "consolidate", "credit card"]):
-            suggestions.append(LOAN_PRODUCTS["debt_relief"])
-        if any(keyword in lowered for keyword in ["school", "college", "education", "study"]):
-            suggestions.append(LOAN_PRODUCTS["edu_future"])
+        return self._catalog.as_dicts()
+
+    def suggest_products(self, message: str, match: Optional[MatchResult] = None) -> List[LoanProduct]:
+        """Products relevant to ``message``, else the first few in the catalog."""
+        return self._ranked_products(message, match or self._matcher.scan(message)) or self._catalog.first(3)
+
+    def _ranked_products(
+        self, message: str, match: MatchResult, earlier: Sequence[str] = ()
+    ) -> List[LoanProduct]:
+        """Products relevant to this turn, best first; empty when nothing points anywhere.
+
+        ``earlier`` lists the products the customer named on previous turns,
+        most recent first.
+        """
+        suggestions: List[LoanProduct] = [
+            self._catalog.get(product_id)
+            for product_id in match.labels("product")
+            if product_id in self._catalog
+        ]
 
         if not suggestions:
-            suggestions = list(LOAN_PRODUCTS.values())[:3]
-
-        return suggestions
+            # No product named: products whose texts resemble the message.
+            suggestions = [hit.product for hit in self._similarity.search(message, limit=3)]
 
-    def _get_conversation_stage(self, conversation: List[Dict[str, str]], message: str) -> str:
-        """Determine what stage of the conversation we're in."""
-        if len(conversation) == 0:
-            return "initial_greeting"
-        
-        # Count messages to determine stage
-        message_count = len([m for m in conversation if m.get("role") == "user"])
-        
-        # Check if they've mentioned loan-related terms
-        lowered = message.lower()
-        loan_keywords = ["loan", "borrow", "finance", "mortgage", "credit", "debt", "rate", "interest", "home", "car", "business", "education"]
-        has_loan_intent = any(keyword in lowered for keyword in loan_keywords)
-        
-        # Check conversation history for loan mentions
-        conversation_text = " ".join([m.get("content", "").lower() for m in conversation])
-        has_mentioned_loans = any(keyword in conversation_text for keyword in loan_keywords)
-        
-        if message_count <= 2 and not has_loan_intent and not has_mentioned_loans:
-            return "rapport_building"
-        elif has_loan_intent or has_mentioned_loans:
-            return "loan_discussion"
-        elif message_count <= 4:
-            return "transitioning"
-        else:
-            return "loan_discussion"
-
-    def respond(self, message: str, conversation: List[Dict[str, str]]) -> Dict[str, object]:
-        """Return a chatbot response."""
+        if not suggestions:
+            # A follow-up ("what are the rates?") is about the products discussed so far.
+            suggestions = [
+                self._catalog.get(product_id) for product_id in earlier if product_id in self._catalog
+            ][:3]
 
-        stage = self._get_conversation_stage(conversation, message)
-        loan_suggestions = self.suggest_products(message) if stage == "loan_discussion" else []
-        mood = self._detect_emotion(message)
-        
-        ai_reply = self._attempt_llm_response(message, conversation, loan_suggestions, stage)
+        if not suggestions:
+            # Nothing similar either: use the amount/term they mentioned, cheapest first.
+            amount = extract_amount(message)
+            term_months = extract_term_months(message)
+            if amount is not None or term_months is not None:
+                suggestions = self._catalog.query(amount=amount, term_months=term_months, limit=3)
 
-        if not ai_reply:
-            ai_reply = self._fallback_response(message, loan_suggestions, stage, conversation, mood)
+        return suggestions
 
-        return {
-            "reply": ai_reply,
-            "suggestions": [loan.to_dict() for loan in loan_suggestions],
-        }
+    def _relevance_order(self, message: str) -> Iterator[LoanProduct]:
+        """Every catalog product once, those resembling ``message`` first."""
+        seen = set()
+        for hit in self._similarity.search(message, limit=None):
+            seen.add(hit.product.id)
+            yield hit.product
+        for product in self._catalog:
+            if product.id not in seen:
+                yield product
+
+    def new_session(self, session_id: str, history: List[Dict[str, str]]) -> SessionState:
+        """Start a server-side session, rebuilding its stage and profile from ``history`` once."""
+        session = SessionState(
+            session_id=session_id,
+            stage=StageMachine.from_history(history, self._matcher),
+            profile=ApplicantProfile.from_history(history, self._matcher),
+        )
+        for entry in history:
+            session.append(entry.get("role", "user"), entry.get("content", ""), self._max_history)
+        return session
+
+    def _stage_machine(
+        self, conversation: List[Dict[str, str]], session: Optional[SessionState]
+    ) -> StageMachine:
+        if session is not None:
+            return session.stage
+        return StageMachine.from_history(conversation, self._matcher)
+
+    def _applicant_profile(
+        self, conversation: List[Dict[str, str]], session: Optional[SessionState]
+    ) -> ApplicantProfile:
+        if session is not None:
+            return session.profile
+        return ApplicantProfile.from_history(conversation, self._matcher)
+
+    def _get_conversation_stage(
+        self,
+        conversation: List[Dict[str, str]],
+        message: str,
+        match: Optional[MatchResult] = None,
+    ) -> str:
+        """Determine what stage of the conversation we're in."""
+        machine = self._stage_machine(conversation, None)
+        return machine.classify(match or self._matcher.scan(message))
 
-    def _attempt_llm_response(
+    def plan_turn(
         self,
         message: str,
         conversation: List[Dict[str, str]],
-        suggestions: List[LoanProduct],
-        stage: str,
-    ) -> Optional[str]:
-        if not self._client:
-            return None
+        session: Optional[SessionState] = None,
+        seed: Optional[int] = None,
+    ) -> TurnPlan:
+        """Run every rule-based step of a turn; no I/O happens here.
+
+        The rule-based reply is seeded from ``seed``, else the session id, plus
+        the message and its position in the conversation, so replaying a turn
+        reproduces it.
+        """
+        started = time.perf_counter()
+        with STEP_SECONDS.time("stage"):
+            match = self._matcher.scan(message)
+            if session is not None:
+                conversation = session.history
+                position = session.total_messages
+            else:
+                position = len(conversation)
+            stage = self._stage_machine(conversation, session).classify(match)
+        TURNS.inc(stage)
+        with STEP_SECONDS.time("suggestions"):
+            loan_suggestions: List[LoanProduct] = []
+            eligibility: List[str] = []
+            if stage == "loan_discussion":
+                loan_suggestions, eligibility = self._select_products(
+                    message, match, self._applicant_profile(conversation, session)
+                )
+            quotes = self._quote_lines(message, loan_suggestions) if loan_suggestions else []
+        return TurnPlan(
+            message=message,
+            conversation=conversation,
+            session=session,
+            match=match,
+            stage=stage,
+            suggestions=loan_suggestions,
+            mood=self._detect_emotion(message, match),
+            quotes=quotes,
+            eligibility=eligibility,
+            seed=turn_seed(_seed_text(seed, session), message, position),
+            started=started,
+        )
+
+    async def respond(
+        self,
+        message: str,
+        conversation: List[Dict[str, str]],
+        session: Optional[SessionState] = None,
+        seed: Optional[int] = None,
+    ) -> Dict[str, object]:
+        """Return a chatbot response.
+
+        Works without an OpenAI client: the rule-based fallback answers instead.
+        With a ``session`` its stored history is used and the turn is recorded
+        into it; the caller persists the session.
+        """
+        return await self.complete(self.plan_turn(message, conversation, session, seed))
+
+    async def complete(self, plan: TurnPlan) -> Dict[str, object]:
+        """Produce the reply for a planned turn.
+
+        ``source`` reports which path answered: ``cache``, ``llm``, ``hedge``
+        (the backup LLM request won) or, for the rule-based reply, ``rule``,
+        ``deadline`` (the latency budget ran out), ``circuit_open`` or ``busy``
+        (the LLM gateway turned the call away).
+        """
+        rendered = self._render_prompt(plan) if self._llm() is not None else None
+        cache_key = self._cache_key(plan, rendered)
+        ai_reply = self._completion_cache.get(cache_key) if cache_key is not None else None
+        source = "cache"
 
-        # Stage-specific prompts for relationship building
-        if stage == "initial_greeting":
-            system_prompt = """You are Astra, a friendly and personable loan advisor at AstraFin. You're like a trusted friend who happens to work in finance.
+        if not ai_reply:
+            ai_reply, source = await self._attempt_llm_response(plan, rendered)
+            if ai_reply and cache_key is not None:
+                self._completion_cache.set(cache_key, ai_reply)
 
-CRITICAL: This is the FIRST message. DO NOT mention loans, financing, or anything business-related yet. Just be warm and friendly.
+        if not ai_reply:
+            # The rule-based reply only costs microseconds, so it is produced
+            # once the LLM has lost rather than speculatively for every turn.
+            ai_reply = self._plan_fallback(plan)
 
-Your approach:
-- Greet them warmly and naturally (like you just met at a coffee shop)
-- Ask how their day is going or make a friendly observation
-- Show genuine interest in them as a person
-- Keep it light, casual, and human
-- Use natural language with contractions
-- Maybe ask what brought them here today (but don't assume it's about loans)
-- Keep it under 80 words
-- Be genuinely curious about them
+        REPLIES.inc(source)
+        self._log_turn(plan, ai_reply, source)
+        if plan.session is not None:
+            self._record_turn(plan.session, plan.message, plan.match, ai_reply)
 
-Example tone: "Hey! Thanks for stopping by. How's your day going? 😊" or "Hi there! Nice to meet you. What brings you here today?"""
-        
-        elif stage == "rapport_building":
-            system_prompt = """You are Astra, a friendly loan advisor at AstraFin. You're building a relationship first, like a good salesperson.
-
-CRITICAL: DO NOT jump into loans yet. Build rapport and connection first.
-
-Your approach:
-- Show genuine interest in what they're saying
-- Ask follow-up questions about their life, goals, or situation
-- Share a bit about yourself if it feels natural (but keep it brief)
-- Find common ground or things to relate to
-- Make them feel heard and understood
-- Keep it conversational and friendly
-- Use phrases like "That's interesting!", "Tell me more about that", "I can relate to that"
-- Only mention loans if THEY bring it up first
-- Keep responses under 100 words
-
-Remember: People buy from people they like. Build the relationship first."""
-        
-        elif stage == "transitioning":
-            system_prompt = """You are Astra, a friendly loan advisor at AstraFin. You're naturally transitioning from getting to know them to understanding their financial needs.
-
-Your approach:
-- Acknowledge what they've shared about themselves
-- Gently ask about their goals or what they're looking to accomplish
-- Still be warm and personal, but start exploring their needs
-- Use phrases like "So what are you hoping to achieve?", "What's your situation like?", "I'm curious - what brought you here today?"
-- Don't push too hard - let them guide the conversation
-- If they mention financial goals, show interest and ask follow-up questions
-- Keep it natural and conversational (under 120 words)"""
-        
-        else:  # loan_discussion
-            system_prompt = """You are Astra, a friendly and empathetic loan advisor at AstraFin. You've built rapport, now you're helping them with their financial needs.
-
-Your personality:
-- Warm, approachable, and conversational (like talking to a trusted friend)
-- Use natural language, occasional contractions (I'm, you're, that's), and varied sentence lengths
-- Show empathy and understanding - acknowledge their situation
-- Ask thoughtful follow-up questions to understand their needs better
-- Be encouraging and supportive, especially if they seem uncertain
-- Use casual phrases like "I get it", "That makes sense", "Here's the thing", "You know what"
-- Occasionally use emojis sparingly (😊 👍 💡) but don't overdo it
-- Keep responses conversational and under 150 words
-- Never sound robotic or use corporate jargon
-
-Important guidelines:
-- Always be transparent that final approval depends on underwriting
-- Don't make promises about approval or rates
-- Focus on understanding their needs first, then suggest options
-- If they seem stressed or worried, acknowledge it and be reassuring
-- Match their energy level - if they're casual, be casual; if formal, be professional but still warm"""
-
-        # Only include loan products if we're in loan discussion stage
-        context_content = ""
-        if stage == "loan_discussion" and suggestions:
-            suggestion_summary = "\n".join(
-                f"• {loan.name}: {loan.description} Interest rates start at {loan.interest_rate}% "
-                f"with terms ranging from {min(loan.term_months)} to {max(loan.term_months)} months. "
-                f"Loan amounts: ${loan.min_amount:,} to ${loan.max_amount:,}"
-                for loan in suggestions
-            )
-            context_content = f"""Available loan products you can discuss:
-{suggestion_summary}
+        return {
+            "reply": ai_reply,
+            "suggestions": self._suggestion_dicts(plan),
+            "source": source,
+        }
 
-"""
-        
-        # Build conversation context
-        if len(conversation) > 0:
-            recent_context = conversation[-5:] if len(conversation) >= 5 else conversation
-            context_content += "\nRecent conversation context:\n"
-            for msg in recent_context:
-                role_label = "Customer" if msg.get("role") == "user" else "You"
-                context_content += f"{role_label}: {msg.get('content', '')}\n"
-        
-        # Add stage-specific reminders
-        if stage == "rapport_building":
-            context_content += "\nREMINDER: You're in rapport-building stage. DO NOT mention loans yet. Just be friendly and get to know them."
-        elif stage == "transitioning":
-            context_content += "\nREMINDER: You're transitioning. Gently explore their needs but don't push. Let them guide the conversation."
-
-        messages = [
-            {"role": "system", "content": system_prompt},
-        ]
-        
-        if context_content.strip():
-            messages.append({
-                "role": "system",
-                "content": context_content.strip()
-            })
-        
-        # Add conversation history (last 10 messages for context)
-        messages.extend(conversation[-10:])
-        messages.append({"role": "user", "content": message})
+    async def _attempt_llm_response(
+        self, plan: TurnPlan, rendered: Optional[RenderedPrompt]
+    ) -> Tuple[Optional[str], str]:
+        """The LLM reply (or ``None``) and the ``source`` to report for it."""
+        if rendered is None:
+            return None, "rule"
+        if self._breaker is not None and not self._breaker.allow():
+            return None, "circuit_open"
+
+        messages = rendered.messages
+        LLM_TOKENS.observe(rendered.tokens, "in")
+        # Identical prompts in flight at the same time share one upstream call;
+        # the hedge is a deliberate second call and is never coalesced.
+        prompt_key = tuple((m["role"], m["content"]) for m in messages)
 
         try:
-            completion = self._client.chat.completions.create(
-                model="gpt-4o-mini",
+            if self._hedge_delay is None:
+                attempt = self._gated_completion(plan, messages, prompt_key)
+                reply, hedged = await self._within_budget(attempt), False
+            else:
+                attempt = hedge(
+                    lambda: self._gated_completion(plan, messages, prompt_key),
+                    lambda: self._gated_completion(plan, messages, None),
+                    self._hedge_delay,
+                )
+                reply, hedged = await self._within_budget(attempt)
+        except asyncio.TimeoutError:
+            self._record_llm_outcome(ok=False)
+            return None, "deadline"
+        except GatewayBusy:
+            return None, "busy"
+        except self._llm_errors:
+            self._record_llm_outcome(ok=False)
+            return None, "rule"
+
+        self._record_llm_outcome(ok=True)
+        if not reply:
+            return None, "rule"
+        return reply, "hedge" if hedged else "llm"
+
+    async def _gated_completion(
+        self, plan: TurnPlan, messages: List[Dict[str, str]], prompt_key: Optional[Hashable]
+    ) -> Optional[str]:
+        if self._gateway is None:
+            return await self._complete_messages(messages)
+        return await self._gateway.call(
+            prompt_key, self._session_owner(plan), lambda: self._complete_messages(messages)
+        )
+
+    async def _within_budget(self, awaitable: Awaitable[T]) -> T:
+        if self._latency_budget is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, self._latency_budget)
+
+    @staticmethod
+    async def _before(deadline: Optional[float], awaitable: Awaitable[T]) -> T:
+        """Await ``awaitable``, raising ``asyncio.TimeoutError`` at loop time ``deadline``."""
+        if deadline is None:
+            return await awaitable
+        remaining = deadline - asyncio.get_running_loop().time()
+        return await asyncio.wait_for(awaitable, max(0.0, remaining))
+
+    def _record_llm_outcome(self, ok: bool) -> None:
+        if self._breaker is None:
+            return
+        if ok:
+            self._breaker.record_success()
+        else:
+            self._breaker.record_failure()
+
+    async def _complete_messages(self, messages: List[Dict[str, str]]) -> Optional[str]:
+        with STEP_SECONDS.time("llm"):
+            completion = await self._client.chat.completions.create(
+                model=self._model,
                 messages=messages,
-                temperature=0.85,  # Higher temperature for more natural, varied responses
-                max_tokens=350,  # Increased for more natural conversation
-                presence_penalty=0.3,  # Encourage variety in responses
-                frequency_penalty=0.2,  # Reduce repetition
+                **LLM_SAMPLING,
             )
-        except OpenAIError:
-            return None
+        if completion.usage is not None:
+            LLM_TOKENS.observe(completion.usage.completion_tokens, "out")
 
         response = completion.choices[0].message.content if completion.choices else None
         
@@ -225,19 +486,273 @@ Important guidelines:
             response = self._humanize_response(response)
         
         return response
+
+    def _llm_slot(self, plan: TurnPlan) -> AsyncContextManager[None]:
+        if self._gateway is None:
+            return nullcontext()
+        return self._gateway.slot(self._session_owner(plan))
+
+    @staticmethod
+    def _session_owner(plan: TurnPlan) -> Optional[str]:
+        return plan.session.session_id if plan.session is not None else None
+
+    async def stream(
+        self,
+        message: str,
+        conversation: List[Dict[str, str]],
+        session: Optional[SessionState] = None,
+        seed: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, object]]:
+        """Yield a reply as ``suggestions``, ``token`` and ``done`` events.
+
+        Suggestions are sent before the model starts generating. Tokens are
+        humanized incrementally; if the LLM is unavailable, fails or misses
+        the latency budget before the first token, the rule-based reply is
+        sent as a single token event. ``done`` carries the ``source`` as in
+        :meth:`complete`; a ``session`` is handled as in :meth:`respond`.
+        """
+
+        plan = self.plan_turn(message, conversation, session, seed)
+
+        yield {"event": "suggestions", "data": self._suggestion_dicts(plan)}
+
+        parts: List[str] = []
+        source = "llm"
+        rendered = self._render_prompt(plan) if self._llm() is not None else None
+        cache_key = self._cache_key(plan, rendered)
+        cached = self._completion_cache.get(cache_key) if cache_key is not None else None
+        if cached:
+            parts.append(cached)
+            source = "cache"
+            yield {"event": "token", "data": cached}
+        elif rendered is None:
+            source = "rule"
+        elif self._breaker is not None and not self._breaker.allow():
+            source = "circuit_open"
+        else:
+            messages = rendered.messages
+            LLM_TOKENS.observe(rendered.tokens, "in")
+            humanizer = StreamingHumanizer()
+            # The latency budget covers the wait for the model's first content;
+            # once it is streaming, the reply is let through to the end.
+            deadline = None
+            if self._latency_budget is not None:
+                deadline = asyncio.get_running_loop().time() + self._latency_budget
+            llm_stream = None
+            try:
+                # Streams are not coalesced or hedged, but hold a gateway slot throughout.
+                async with self._llm_slot(plan):
+                    started = time.perf_counter()
+                    llm_stream = await self._before(
+                        deadline,
+                        self._client.chat.completions.create(
+                            model=self._model,
+                            messages=messages,
+                            stream=True,
+                            **LLM_SAMPLING,
+                        ),
+                    )
+                    chunks = llm_stream.__aiter__()
+                    while True:
+                        try:
+                            chunk = await self._before(deadline, chunks.__anext__())
+                        except StopAsyncIteration:
+                            break
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            deadline = None
+                        text = humanizer.feed(delta) if delta else ""
+                        if text:
+                            parts.append(text)
+                            yield {"event": "token", "data": text}
+            except asyncio.TimeoutError:
+                self._record_llm_outcome(ok=False)
+                source = "deadline"
+            except GatewayBusy:
+                source = "busy"
+            except self._llm_errors:
+                # Whatever already reached the client stays; with nothing sent
+                # the rule-based reply takes over below.
+                self._record_llm_outcome(ok=False)
+                source = "rule"
+            else:
+                self._record_llm_outcome(ok=True)
+                tail = humanizer.flush()
+                if tail:
+                    parts.append(tail)
+                    yield {"event": "token", "data": tail}
+                if parts and cache_key is not None:
+                    self._completion_cache.set(cache_key, "".join(parts))
+            finally:
+                if llm_stream is not None:
+                    await llm_stream.close()
+                    STEP_SECONDS.observe(time.perf_counter() - started, "llm")
+            if parts:
+                LLM_TOKENS.observe(count_tokens("".join(parts)), "out")
+                # The streamed text is what the customer saw, even if it was cut short.
+                source = "llm"
+
+        if not parts:
+            reply = self._plan_fallback(plan)
+            parts.append(reply)
+            if source == "llm":
+                source = "rule"
+            yield {"event": "token", "data": reply}
+
+        REPLIES.inc(source)
+        reply = "".join(parts)
+        self._log_turn(plan, reply, source)
+        if session is not None:
+            self._record_turn(session, message, plan.match, reply)
+
+        yield {"event": "done", "data": {"reply": reply, "source": source}}
+
+    def suggestions_json(self, suggestions: List[Dict[str, object]]) -> bytes:
+        """JSON array of reply suggestions, spliced from the catalog's cached fragments."""
+        return self._catalog.json_array(suggestion["id"] for suggestion in suggestions)
+
+    def _suggestion_dicts(self, plan: TurnPlan) -> List[Dict[str, object]]:
+        return [self._catalog.product_dict(loan.id) for loan in plan.suggestions]
+
+    def _plan_fallback(self, plan: TurnPlan) -> str:
+        return self._fallback_response(
+            plan.message,
+            plan.suggestions,
+            plan.stage,
+            plan.conversation,
+            plan.mood,
+            plan.match,
+            plan.quotes,
+            plan.seed,
+            plan.eligibility,
+        )
+
+    def _select_products(
+        self, message: str, match: MatchResult, profile: ApplicantProfile
+    ) -> Tuple[List[LoanProduct], List[str]]:
+        """Suggestions for a loan turn, with a line on why for each relevant product the facts rule out.
+
+        The relevant products are screened against the customer's stated
+        facts. If the screen rules out all of them, or nothing was relevant,
+        up to three products the facts do not rule out (eligible, or still
+        undecided) are suggested instead, those resembling the message first.
+        """
+        candidates = self._ranked_products(message, match, profile.products)
+        facts = profile.with_message(message)
+        if not facts:
+            return candidates or self._catalog.first(3), []
+
+        screenings = {screening.product_id: screening for screening in self._eligibility.screen(facts)}
+        kept: List[LoanProduct] = []
+        notes: List[str] = []
+        for loan in candidates:
+            screening = screenings.get(loan.id)
+            if screening is not None and screening.status == INELIGIBLE:
+                notes.append(self._eligibility.explain(screening, facts))
+            else:
+                kept.append(loan)
+        if not kept:
+            open_products = (
+                product
+                for product in self._relevance_order(message)
+                if screenings[product.id].status != INELIGIBLE
+            )
+            kept = list(islice(open_products, 3))
+        return kept, notes
+
+    def _quote_lines(self, message: str, suggestions: List[LoanProduct]) -> List[str]:
+        """Locally computed payment figures for the amount or budget in ``message``."""
+        amount = extract_amount(message)
+        budget = extract_monthly_budget(message)
+        if amount is None and budget is None:
+            return []
+        term_months = extract_term_months(message)
+        product_ids = [loan.id for loan in suggestions]
+        lines: List[str] = []
+        seen = set()
+        if amount is not None:
+            # Quotes come cheapest-payment first: keep the best one per product.
+            for quote in self._quotes.quote(amount, product_ids, term_months):
+                if quote.product_id in seen:
+                    continue
+                seen.add(quote.product_id)
+                lines.append(
+                    f"• {quote.product_name}: about ${quote.monthly_payment:,.2f}/month to borrow "
+                    f"${quote.amount:,.0f} over {quote.term_months} months at {quote.interest_rate}% "
+                    f"(${quote.total_interest:,.0f} total interest)"
+                )
+        if budget is not None:
+            seen = set()
+            for offer in self._quotes.affordability(budget, product_ids, term_months):
+                if offer.product_id in seen:
+                    continue
+                seen.add(offer.product_id)
+                lines.append(
+                    f"• {offer.product_name}: ${offer.monthly_budget:,.0f}/month covers up to about "
+                    f"${offer.max_amount:,.0f} over {offer.term_months} months at {offer.interest_rate}%"
+                )
+        return lines
+
+    def _cache_key(self, plan: TurnPlan, rendered: Optional[RenderedPrompt]) -> Optional[Hashable]:
+        # Keyed on the prompt actually sent: window, summary, products, quotes and eligibility.
+        if self._completion_cache is None or rendered is None:
+            return None
+        return self._completion_cache.key(plan.stage, rendered.messages)
+
+    def _record_turn(
+        self, session: SessionState, message: str, match: MatchResult, reply: str
+    ) -> None:
+        session.stage.advance(match)
+        session.stage.observe("user", message, self._matcher, match)
+        session.stage.observe("assistant", reply, self._matcher)
+        session.profile.observe(message, match.labels("product"))
+        session.append("user", message, self._max_history)
+        session.append("assistant", reply, self._max_history)
+
+    def _log_turn(self, plan: TurnPlan, reply: str, source: str) -> None:
+        if self._transcripts is None:
+            return
+        self._transcripts.record(
+            TurnRecord(
+                timestamp=time.time(),
+                session_id=plan.session.session_id if plan.session is not None else None,
+                message=plan.message,
+                reply=reply,
+                stage=plan.stage,
+                mood=plan.mood,
+                suggestions=tuple(loan.id for loan in plan.suggestions),
+                source=source,
+                latency_ms=round((time.perf_counter() - plan.started) * 1e3, 3),
+            )
+        )
+
+    def _render_prompt(self, plan: TurnPlan) -> RenderedPrompt:
+        """Render the prompt, fitting the conversation into the token budget.
+
+        With a session, the rolling summary of older turns is kept on it and
+        only extended when the window slides.
+        """
+        with STEP_SECONDS.time("prompt"):
+            available = self._prompt_token_budget - self._prompts.fixed_tokens(
+                plan.stage, plan.message, plan.suggestions, plan.quotes, plan.eligibility
+            )
+            if plan.session is not None:
+                window = self._context.build(
+                    plan.conversation,
+                    available,
+                    summary=plan.session.summary,
+                    offset=plan.session.total_messages - len(plan.conversation),
+                )
+            else:
+                window = self._context.build(plan.conversation, available)
+            return self._prompts.render(
+                plan.stage, plan.message, plan.suggestions, window, plan.quotes, plan.eligibility
+            )
     
     def _humanize_response(self, response: str) -> str:
         """Post-process AI response to make it more human-like."""
         # Remove overly formal patterns
-        response = response.replace("I understand that", "I get that")
-        response = response.replace("I would like to", "I'd like to")
-        response = response.replace("I am", "I'm")
-        response = response.replace("you are", "you're")
-        response = response.replace("it is", "it's")
-        response = response.replace("that is", "that's")
-        response = response.replace("do not", "don't")
-        response = response.replace("cannot", "can't")
-        response = response.replace("will not", "won't")
+        response = humanize(response)
         
         # Ensure it doesn't end too formally
         if response.endswith(".") and len(response.split()) > 20:
@@ -253,154 +768,34 @@ Important guidelines:
         stage: str,
         conversation: List[Dict[str, str]],
         mood: str,
+        match: Optional[MatchResult] = None,
+        quotes: Optional[List[str]] = None,
+        seed: Optional[int] = None,
+        eligibility: Optional[List[str]] = None,
     ) -> str:
-        lowered = message.lower()
+        """Rule-based reply; a pure function of its arguments.
+
+        ``seed`` picks between equivalent phrasings and defaults to one derived
+        from ``message`` and the length of ``conversation``.
+        """
+        match = match or self._matcher.scan(message)
+        if seed is None:
+            seed = turn_seed("", message, len(conversation))
         message_count = len([m for m in conversation if m.get("role") == "user"])
-        empathy_prefix = self._empathy_prefix(mood)
-        
-        # Stage-based responses
-        if stage == "initial_greeting":
-            greetings = [
-                "Hey there! 😊 Thanks for stopping by. How's your day going?",
-                "Hi! Nice to meet you. What brings you here today?",
-                "Hey! Welcome. How are you doing today?",
-                "Hi there! Great to have you here. What's on your mind?",
-            ]
-            response = random.choice(greetings)
-            response = self._wrap_with_empathy(empathy_prefix, response)
-            return self._add_soft_closing(response, stage)
-        
-        elif stage == "rapport_building":
-            # Build rapport - ask personal questions, show interest
-            if message_count == 1:
-                response = "That's great to hear! Tell me a bit more about yourself - what do you do, or what are you passionate about? 😊"
-            elif message_count == 2:
-                response = "I love that! So what are you hoping to accomplish? Any big plans or goals you're working towards?"
-            else:
-                response = "That sounds really interesting! I'm curious - what made you reach out today? Is there something specific you're looking to achieve?"
-            response = self._wrap_with_empathy(empathy_prefix, response)
-            return self._add_soft_closing(response, stage)
-        
-        elif stage == "transitioning":
-            # Gently transition to understanding their needs
-            if any(word in lowered for word in ["goal", "want", "need", "looking", "hoping"]):
-                response = "That's awesome! I'd love to help you with that. Can you tell me a bit more about what you're thinking? What's your situation like?"
-            else:
-                response = "Got it! So what are you hoping to accomplish? I'm here to help figure out the best way forward for you."
-            response = self._wrap_with_empathy(empathy_prefix, response)
-            return self._add_soft_closing(response, stage)
-        
-        else:  # loan_discussion
-            # Now we can discuss loans
-            if any(word in lowered for word in ["rate", "interest", "cost", "price", "how much"]):
-                intro = "Great question! Let me break down the rates for you - it really depends on what type of loan you're interested in."
-            elif any(word in lowered for word in ["urgent", "quick", "soon", "asap", "fast"]):
-                intro = "I totally get that you need this sorted quickly! Let's find something that works for your timeline."
-            else:
-                intro = "Perfect! I'd love to help you find financing that actually fits your situation."
-            
-            intro = self._wrap_with_empathy(empathy_prefix, intro)
-            lines = [intro]
-            
-            if suggestions:
-                lines.append("\nHere are a few options that might work for you:")
-                for loan in suggestions[:3]:
-                    lines.append(
-                        f"• {loan.name} - {loan.description} Rates start around {loan.interest_rate}% with terms up to {max(loan.term_months)} months."
-                    )
-
-            # Natural follow-up question
-            if any(word in lowered for word in ["home", "house", "mortgage"]):
-                follow_up = "What's your target loan amount? And are you thinking about a fixed or variable rate?"
-            elif any(word in lowered for word in ["car", "vehicle", "auto"]):
-                follow_up = "What kind of vehicle are you looking at? And what's your budget range?"
-            elif any(word in lowered for word in ["business", "company"]):
-                follow_up = "Tell me a bit more about your business - how long have you been operating, and what do you need the funds for?"
-            else:
-                follow_up = "What's the loan amount you're thinking about? And what's your timeline for getting this sorted?"
-
-            lines.append(f"\n{follow_up}")
-            lines.append("\nJust so you know - final approval and rates depend on a full application review, but I'm here to guide you through everything! 👍")
-
-            response = "\n\n".join(lines)
-            return self._add_soft_closing(response, stage)
-
-    def _detect_emotion(self, message: str) -> str:
-        lowered = message.lower()
-        mood_keywords = {
-            "stressed": ["worried", "stressed", "anxious", "overwhelmed", "nervous", "unsure", "confused"],
-            "excited": ["excited", "thrilled", "can't wait", "pumped", "stoked"],
-            "urgent": ["urgent", "asap", "deadline", "rush", "quick", "soon"],
-            "celebratory": ["celebrate", "milestone", "wedding", "baby", "graduation", "anniversary"],
-        }
-        for mood, keywords in mood_keywords.items():
-            if any(keyword in lowered for keyword in keywords):
-                return mood
-        if "?" in message and not any(keyword in lowered for keyword in ["loan", "rate", "interest"]):
+        key = fallback_key(stage, mood, match, message_count, seed)
+        return self._fallbacks.render(key, suggestions, quotes, eligibility)
+
+    def _detect_emotion(self, message: str, match: Optional[MatchResult] = None) -> str:
+        match = match or self._matcher.scan(message)
+        moods = match.labels("mood")
+        if moods:
+            return moods[0]
+        if "?" in message and not match.has("loan_terms"):
             return "curious"
         return "neutral"
 
-    def _empathy_prefix(self, mood: str) -> str:
-        phrases = {
-            "stressed": [
-                "I hear you — let's take this one step at a time.",
-                "Totally understand that this can feel heavy.",
-            ],
-            "urgent": [
-                "Got it, speed matters here.",
-                "I feel the clock with you, so let's move quickly.",
-            ],
-            "excited": [
-                "Love the energy you're bringing!",
-                "I can feel your excitement from here!",
-            ],
-            "celebratory": [
-                "Congratulations on the milestone!",
-                "That's such a special moment — thanks for sharing it with me.",
-            ],
-            "curious": [
-                "Great questions — I appreciate your curiosity.",
-                "Love that you're digging in with thoughtful questions.",
-            ],
-        }
-        if mood in phrases:
-            return random.choice(phrases[mood])
-        return ""
-
-    def _wrap_with_empathy(self, prefix: str, text: str) -> str:
-        if not prefix:
-            return text
-        if text.lower().startswith(prefix.lower()):
-            return text
-        return f"{prefix} {text}".strip()
-
-    def _add_soft_closing(self, text: str, stage: str) -> str:
-        stripped = text.strip()
-        if not stripped or stripped.endswith(("?", "!", "…")):
-            # Already ends with strong punctuation or question
-            return stripped
-        closers_map = {
-            "initial_greeting": [
-                "How's the day treating you so far?",
-                "Happy to chat whenever you're ready.",
-            ],
-            "rapport_building": [
-                "Tell me whatever feels most relevant.",
-                "I'm all ears if you want to share more.",
-            ],
-            "transitioning": [
-                "What details feel most important to you right now?",
-                "Where would you like to start?",
-            ],
-            "loan_discussion": [
-                "Does that line up with what you'd need?",
-                "How does that feel compared to what you were imagining?",
-                "Want me to dig into numbers next?",
-            ],
-        }
-        closers = closers_map.get(stage, ["What else is on your mind?"])
-        closer = random.choice(closers)
-        if "\n\n" in stripped:
-            return f"{stripped}\n\n{closer}"
-        return f"{stripped} {closer}"
 
+def _seed_text(seed: Optional[int], session: Optional[SessionState]) -> str:
+    if seed is not None:
+        return str(seed)
+    return session.session_id if session is not None else ""
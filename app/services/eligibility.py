@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.data.loan_products import LoanProduct
+from app.services.facts import extract_amount
+
+
+# Applicant facts the rules can test. Yes/no facts are 1.0 or 0.0.
+FACTS: Tuple[str, ...] = (
+    "credit_score",
+    "business_credit_score",
+    "dti",
+    "annual_revenue",
+    "years_operating",
+    "vehicle_age",
+    "years_since_bankruptcy",
+    "employed",
+    "insured",
+    "enrolled",
+)
+_FACT_INDEX = {name: index for index, name in enumerate(FACTS)}
+_FACT_FORMATS: Dict[str, str] = {
+    "credit_score": "a score of {:.0f}",
+    "business_credit_score": "a business score of {:.0f}",
+    "dti": "a ratio of {:g}%",
+    "annual_revenue": "${:,.0f} a year",
+    "years_operating": "{:g} years in business",
+    "vehicle_age": "a {:g}-year-old vehicle",
+    "years_since_bankruptcy": "a bankruptcy {:g} years ago",
+}
+
+ELIGIBLE = "eligible"
+INELIGIBLE = "ineligible"
+UNKNOWN = "unknown"
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One eligibility requirement: ``fact`` compared with ``threshold`` by ``op``."""
+
+    text: str
+    fact: str
+    op: str  # ">=", ">", "<=" or "<"
+    threshold: float
+
+
+def _number(group: str) -> float:
+    return float(group.replace(",", ""))
+
+
+def _revenue(match: "re.Match[str]") -> Optional[float]:
+    return extract_amount(match.group(1))
+
+
+# Checked in order, first match wins; "business credit score" must precede "credit score".
+_RULE_PATTERNS: List[Tuple["re.Pattern[str]", str, str, Callable[["re.Match[str]"], Optional[float]]]] = [
+    (re.compile(r"business credit score\D*(\d+)", re.I), "business_credit_score", ">=", lambda m: _number(m.group(1))),
+    (re.compile(r"credit score\D*(\d{3})", re.I), "credit_score", ">=", lambda m: _number(m.group(1))),
+    (
+        re.compile(r"debt[- ]to[- ]income(?: ratio)? (?:below|under|less than) (\d+(?:\.\d+)?)\s*%", re.I),
+        "dti",
+        "<",
+        lambda m: _number(m.group(1)),
+    ),
+    (re.compile(r"annual revenue (?:above|over|of at least) (.+)", re.I), "annual_revenue", ">", _revenue),
+    (re.compile(r"(\d+)\+? years? (?:of )?operating history", re.I), "years_operating", ">=", lambda m: _number(m.group(1))),
+    (re.compile(r"vehicle not older than (\d+) years?", re.I), "vehicle_age", "<=", lambda m: _number(m.group(1))),
+    (
+        re.compile(r"no bankruptc(?:y|ies) in (?:the )?last (\d+) years?", re.I),
+        "years_since_bankruptcy",
+        ">=",
+        lambda m: _number(m.group(1)),
+    ),
+    (re.compile(r"(?:stable )?employment history|proof of employment", re.I), "employed", ">=", lambda m: 1.0),
+    (re.compile(r"proof of insurance|insured", re.I), "insured", ">=", lambda m: 1.0),
+    (re.compile(r"enrollment proof|proof of enrollment", re.I), "enrolled", ">=", lambda m: 1.0),
+]
+
+
+def compile_rule(text: str) -> Optional[Rule]:
+    """Structured form of an eligibility line; ``None`` for lines that are not checkable."""
+    for pattern, fact, op, threshold in _RULE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            value = threshold(match)
+            if value is not None:
+                return Rule(text, fact, op, value)
+    return None
+
+
+@dataclass(frozen=True)
+class Screening:
+    product_id: str
+    product_name: str
+    status: str  # eligible | ineligible | unknown
+    failed: Tuple[str, ...]  # texts of the rules the applicant fails
+    missing: Tuple[str, ...]  # facts still needed to decide the remaining rules
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+class EligibilityScreen:
+    """Every product's eligibility lines compiled into one table of predicates.
+
+    Screening an applicant evaluates all rules of all products in a few
+    vectorized NumPy operations. A product is ``ineligible`` if any rule
+    fails, ``unknown`` if a rule depends on a fact that is missing, and
+    otherwise ``eligible``. Lines that are not checkable ("Flexible
+    repayment grace period") are ignored.
+    """
+
+    def __init__(self, products: Iterable[LoanProduct]) -> None:
+        self._products: List[LoanProduct] = list(products)
+        owners: List[int] = []
+        self.rules: List[Rule] = []
+        for column, product in enumerate(self._products):
+            for line in product.eligibility:
+                rule = compile_rule(line)
+                if rule is not None:
+                    owners.append(column)
+                    self.rules.append(rule)
+
+        self._owner = np.array(owners, dtype=np.intp)
+        self._fact = np.array([_FACT_INDEX[rule.fact] for rule in self.rules], dtype=np.intp)
+        # Every comparison is turned into ``sign * value >= sign * threshold`` (or ``>``).
+        self._sign = np.array([-1.0 if rule.op.startswith("<") else 1.0 for rule in self.rules])
+        self._bound = self._sign * np.array([rule.threshold for rule in self.rules], dtype=float)
+        self._strict = np.array([rule.op in (">", "<") for rule in self.rules], dtype=bool)
+        self._by_text: Dict[str, Rule] = {rule.text: rule for rule in self.rules}
+
+    def screen(self, facts: Mapping[str, float]) -> List[Screening]:
+        """One :class:`Screening` per product, in catalog order."""
+        values = np.full(len(FACTS), np.nan)
+        for name, value in facts.items():
+            values[_FACT_INDEX[name]] = float(value)
+
+        observed = self._sign * values[self._fact]
+        known = ~np.isnan(observed)
+        with np.errstate(invalid="ignore"):
+            passed = np.where(self._strict, observed > self._bound, observed >= self._bound)
+        failed = known & ~passed
+        count = len(self._products)
+        failed_per_product = np.bincount(self._owner[failed], minlength=count)
+        unknown_per_product = np.bincount(self._owner[~known], minlength=count)
+
+        failed_rules: Dict[int, List[str]] = {}
+        for index in np.flatnonzero(failed):
+            failed_rules.setdefault(int(self._owner[index]), []).append(self.rules[index].text)
+        missing_facts: Dict[int, List[str]] = {}
+        for index in np.flatnonzero(~known):
+            facts_needed = missing_facts.setdefault(int(self._owner[index]), [])
+            if self.rules[index].fact not in facts_needed:
+                facts_needed.append(self.rules[index].fact)
+
+        screenings = []
+        for column, product in enumerate(self._products):
+            if failed_per_product[column]:
+                status = INELIGIBLE
+            elif unknown_per_product[column]:
+                status = UNKNOWN
+            else:
+                status = ELIGIBLE
+            screenings.append(
+                Screening(
+                    product_id=product.id,
+                    product_name=product.name,
+                    status=status,
+                    failed=tuple(failed_rules.get(column, ())),
+                    missing=tuple(missing_facts.get(column, ())),
+                )
+            )
+        return screenings
+
+    def explain(self, screening: Screening, facts: Mapping[str, float]) -> str:
+        """One line saying why a product does not fit, quoting the applicant's own figures."""
+        reasons = []
+        for text in screening.failed:
+            rule = self._by_text.get(text)
+            template = _FACT_FORMATS.get(rule.fact) if rule is not None else None
+            if template is not None and rule.fact in facts:
+                reasons.append(f"{text} (you mentioned {template.format(facts[rule.fact])})")
+            else:
+                reasons.append(text)
+        return f"• {screening.product_name} isn't a fit yet: " + "; ".join(reasons)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence
+
+if TYPE_CHECKING:
+    from app.services.matcher import KeywordMatcher
+
+
+_NUMBER = r"(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)"
+_SCALES = {"k": 1_000, "thousand": 1_000, "grand": 1_000, "m": 1_000_000, "million": 1_000_000}
+
+# "$45k", "$45,000", "45k", "45 thousand", "45000 dollars"
+_AMOUNT_PATTERN = re.compile(
+    rf"\$\s*{_NUMBER}\s*(k|m|thousand|million)?\b"
+    rf"|\b{_NUMBER}\s*(k|m|thousand|grand|million)\b"
+    rf"|\b{_NUMBER}\s*(?:dollars|usd)\b",
+    re.IGNORECASE,
+)
+# Follows an amount that is a monthly budget: "$500 a month", "$500/mo", "500 per month"
+_PER_MONTH = re.compile(r"\s*(?:/\s*mo(?:nth)?\b|(?:a|per|each|every)\s+month\b|monthly\b)", re.IGNORECASE)
+# "60 months", "5 years", "36-month", "10 yrs"
+_TERM_PATTERN = re.compile(r"\b(\d{1,3})[\s-]*(months?|mos?|years?|yrs?)\b", re.IGNORECASE)
+
+
+def _to_number(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def _amount_value(match: "re.Match[str]") -> float:
+    groups = match.groups()
+    for number, scale in ((groups[0], groups[1]), (groups[2], groups[3]), (groups[4], None)):
+        if number:
+            return _to_number(number) * _SCALES.get((scale or "").lower(), 1)
+    return 0.0
+
+
+def extract_amount(message: str) -> Optional[float]:
+    """First loan amount mentioned in ``message``, in dollars; monthly budgets are skipped."""
+    for match in _AMOUNT_PATTERN.finditer(message):
+        if not _PER_MONTH.match(message, match.end()):
+            return _amount_value(match)
+    return None
+
+
+def extract_monthly_budget(message: str) -> Optional[float]:
+    """First amount stated per month ("$500 a month"), in dollars."""
+    for match in _AMOUNT_PATTERN.finditer(message):
+        if _PER_MONTH.match(message, match.end()):
+            return _amount_value(match)
+    return None
+
+
+def extract_term_months(message: str) -> Optional[int]:
+    """First loan term mentioned in ``message``, converted to months."""
+    match = _TERM_PATTERN.search(message)
+    if not match:
+        return None
+    value = int(match.group(1))
+    return value * 12 if match.group(2).lower().startswith("y") else value
+
+
+# Applicant facts for eligibility screening, keyed by the names in
+# ``app.services.eligibility.FACTS``. Each pattern's first group is the value.
+_BUSINESS_SCORE = re.compile(r"\bbusiness credit score\D{0,15}?(\d{1,3})\b", re.IGNORECASE)
+_CREDIT_SCORE = re.compile(
+    r"(?<!business )\b(?:credit score|fico(?: score)?|credit rating)\D{0,15}?(\d{3})\b"
+    r"|\b(\d{3})\s+(?:credit score|credit|fico)\b",
+    re.IGNORECASE,
+)
+_DTI = re.compile(r"\b(?:dti|debt[- ]to[- ]income)(?: ratio)?\D{0,15}?(\d{1,2}(?:\.\d+)?)\s*%?", re.IGNORECASE)
+_REVENUE = re.compile(r"\b(?:revenue|sales|turnover)\b", re.IGNORECASE)
+_YEARS_OPERATING = re.compile(
+    r"\b(?:in business|operating|running|open(?:ed)?)\D{0,20}?(\d{1,2})\s*(?:years?|yrs?)\b"
+    r"|\b(\d{1,2})\s*(?:years?|yrs?)\s+(?:in business|operating)\b",
+    re.IGNORECASE,
+)
+_VEHICLE_AGE = re.compile(
+    r"\b(\d{1,2})[- ]years?[- ]old\s+(?:car|truck|vehicle|suv|van)\b"
+    r"|\b(?:car|truck|vehicle|suv|van) is (\d{1,2}) years? old\b",
+    re.IGNORECASE,
+)
+_MODEL_YEAR = re.compile(r"\b((?:19|20)\d{2})\b(?=[^.?!]{0,25}\b(?:car|truck|vehicle|suv|van)\b)", re.IGNORECASE)
+_BANKRUPTCY_AGO = re.compile(r"\bbankrupt\w*\D{0,30}?(\d{1,2})\s*years? ago\b", re.IGNORECASE)
+_BANKRUPTCY_RECENT = re.compile(r"\bbankrupt\w*\b[^.?!]{0,30}\b(this|last) year\b", re.IGNORECASE)
+_NO_BANKRUPTCY = re.compile(r"\b(?:never (?:\w+ ){0,2}bankrupt\w*|no bankruptc\w*)", re.IGNORECASE)
+_UNEMPLOYED = re.compile(r"\b(?:unemployed|out of work|lost my job|laid off|between jobs)\b", re.IGNORECASE)
+_EMPLOYED = re.compile(r"\b(?:employed|full[- ]time|part[- ]time|my job|i work|work as|working as|salary)\b", re.IGNORECASE)
+_UNINSURED = re.compile(r"\b(?:uninsured|no insurance)\b", re.IGNORECASE)
+_INSURED = re.compile(r"\b(?:insured|have insurance|got insurance)\b", re.IGNORECASE)
+_ENROLLED = re.compile(r"\b(?:enrolled|admitted|accepted (?:to|into|at))\b", re.IGNORECASE)
+
+
+def _first_group(match: "re.Match[str]") -> str:
+    return next(group for group in match.groups() if group is not None)
+
+
+def extract_applicant_facts(message: str, current_year: Optional[int] = None) -> Dict[str, float]:
+    """Facts about the applicant stated in ``message``; yes/no facts are 1.0 or 0.0."""
+    facts: Dict[str, float] = {}
+    match = _BUSINESS_SCORE.search(message)
+    if match:
+        facts["business_credit_score"] = float(match.group(1))
+    match = _CREDIT_SCORE.search(message)
+    if match and 300 <= int(_first_group(match)) <= 850:
+        facts["credit_score"] = float(_first_group(match))
+    match = _DTI.search(message)
+    if match:
+        facts["dti"] = float(match.group(1))
+    match = _REVENUE.search(message)
+    if match:
+        # The amount closest after the keyword ("revenue of about $150k"), or just before it.
+        amount = extract_amount(message[match.end() : match.end() + 40])
+        if amount is None:
+            amount = extract_amount(message[max(0, match.start() - 40) : match.start()])
+        if amount is not None:
+            facts["annual_revenue"] = amount
+    match = _YEARS_OPERATING.search(message)
+    if match:
+        facts["years_operating"] = float(_first_group(match))
+    match = _VEHICLE_AGE.search(message)
+    if match:
+        facts["vehicle_age"] = float(_first_group(match))
+    else:
+        match = _MODEL_YEAR.search(message)
+        if match:
+            year = current_year or date.today().year
+            facts["vehicle_age"] = float(max(0, year - int(match.group(1))))
+    if _NO_BANKRUPTCY.search(message):
+        facts["years_since_bankruptcy"] = math.inf
+    else:
+        match = _BANKRUPTCY_AGO.search(message)
+        if match:
+            facts["years_since_bankruptcy"] = float(match.group(1))
+        else:
+            match = _BANKRUPTCY_RECENT.search(message)
+            if match:
+                facts["years_since_bankruptcy"] = 0.0 if match.group(1).lower() == "this" else 1.0
+    if _UNEMPLOYED.search(message):
+        facts["employed"] = 0.0
+    elif _EMPLOYED.search(message):
+        facts["employed"] = 1.0
+    if _UNINSURED.search(message):
+        facts["insured"] = 0.0
+    elif _INSURED.search(message):
+        facts["insured"] = 1.0
+    if _ENROLLED.search(message):
+        facts["enrolled"] = 1.0
+    return facts
+
+
+# Stateless clients re-send their history every turn; each message's facts are extracted once.
+_message_facts = lru_cache(maxsize=4096)(extract_applicant_facts)
+
+
+@dataclass
+class ApplicantProfile:
+    """Applicant facts and products asked about so far, updated one user message at a time.
+
+    Like the stage machine it is stored with a session, so a turn only
+    extracts facts from its new message. A later statement of a fact wins.
+    """
+
+    facts: Dict[str, float] = field(default_factory=dict)
+    # Product ids the customer named, most recent first.
+    products: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_history(
+        cls, history: List[Mapping[str, str]], matcher: Optional["KeywordMatcher"] = None
+    ) -> "ApplicantProfile":
+        profile = cls()
+        for entry in history:
+            if entry.get("role", "user") == "user":
+                content = entry.get("content", "")
+                profile.observe(content, matcher.scan(content).labels("product") if matcher else ())
+        return profile
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "ApplicantProfile":
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+    def observe(self, message: str, products: Sequence[str] = ()) -> None:
+        """Record a user message that is now part of the conversation, and the products it named."""
+        self.facts.update(_message_facts(message))
+        if products:
+            self.products = [*products, *(product for product in self.products if product not in products)]
+
+    def with_message(self, message: str) -> Dict[str, float]:
+        """The facts known once ``message`` is taken into account; the profile is unchanged."""
+        return {**self.facts, **_message_facts(message)}
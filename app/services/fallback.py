@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.data.loan_products import LoanProduct
+from app.services.matcher import MatchResult
+
+
+GREETINGS = [
+    "Hey there! 😊 Thanks for stopping by. How's your day going?",
+    "Hi! Nice to meet you. What brings you here today?",
+    "Hey! Welcome. How are you doing today?",
+    "Hi there! Great to have you here. What's on your mind?",
+]
+
+RAPPORT_REPLIES = {
+    "first": "That's great to hear! Tell me a bit more about yourself - what do you do, or what are you passionate about? 😊",
+    "second": "I love that! So what are you hoping to accomplish? Any big plans or goals you're working towards?",
+    "later": "That sounds really interesting! I'm curious - what made you reach out today? Is there something specific you're looking to achieve?",
+}
+
+TRANSITION_REPLIES = {
+    "goal": "That's awesome! I'd love to help you with that. Can you tell me a bit more about what you're thinking? What's your situation like?",
+    "other": "Got it! So what are you hoping to accomplish? I'm here to help figure out the best way forward for you.",
+}
+
+LOAN_INTROS = {
+    "pricing": "Great question! Let me break down the rates for you - it really depends on what type of loan you're interested in.",
+    "speed": "I totally get that you need this sorted quickly! Let's find something that works for your timeline.",
+    "other": "Perfect! I'd love to help you find financing that actually fits your situation.",
+}
+
+LOAN_FOLLOW_UPS = {
+    "home": "What's your target loan amount? And are you thinking about a fixed or variable rate?",
+    "auto": "What kind of vehicle are you looking at? And what's your budget range?",
+    "business": "Tell me a bit more about your business - how long have you been operating, and what do you need the funds for?",
+    "other": "What's the loan amount you're thinking about? And what's your timeline for getting this sorted?",
+}
+
+LOAN_DISCLAIMER = "Just so you know - final approval and rates depend on a full application review, but I'm here to guide you through everything! 👍"
+
+EMPATHY_PHRASES = {
+    "stressed": [
+        "I hear you — let's take this one step at a time.",
+        "Totally understand that this can feel heavy.",
+    ],
+    "urgent": [
+        "Got it, speed matters here.",
+        "I feel the clock with you, so let's move quickly.",
+    ],
+    "excited": [
+        "Love the energy you're bringing!",
+        "I can feel your excitement from here!",
+    ],
+    "celebratory": [
+        "Congratulations on the milestone!",
+        "That's such a special moment — thanks for sharing it with me.",
+    ],
+    "curious": [
+        "Great questions — I appreciate your curiosity.",
+        "Love that you're digging in with thoughtful questions.",
+    ],
+}
+
+SOFT_CLOSERS = {
+    "initial_greeting": [
+        "How's the day treating you so far?",
+        "Happy to chat whenever you're ready.",
+    ],
+    "rapport_building": [
+        "Tell me whatever feels most relevant.",
+        "I'm all ears if you want to share more.",
+    ],
+    "transitioning": [
+        "What details feel most important to you right now?",
+        "Where would you like to start?",
+    ],
+    "loan_discussion": [
+        "Does that line up with what you'd need?",
+        "How does that feel compared to what you were imagining?",
+        "Want me to dig into numbers next?",
+    ],
+}
+DEFAULT_CLOSERS = ["What else is on your mind?"]
+
+MOODS = ("neutral", "curious", *EMPATHY_PHRASES.keys())
+# Reply variants per stage; each one selects a fixed text above.
+VARIANTS: Dict[str, Tuple[str, ...]] = {
+    "initial_greeting": tuple(str(index) for index in range(len(GREETINGS))),
+    "rapport_building": tuple(RAPPORT_REPLIES),
+    "transitioning": tuple(TRANSITION_REPLIES),
+    "loan_discussion": tuple(f"{intro}/{follow_up}" for intro, follow_up in product(LOAN_INTROS, LOAN_FOLLOW_UPS)),
+}
+
+
+@dataclass(frozen=True)
+class FallbackKey:
+    """Everything a rule-based reply depends on besides the suggested products and quotes."""
+
+    stage: str
+    mood: str
+    variant: str
+    empathy: int
+    closer: int
+
+
+def turn_seed(seed: str, message: str, history_length: int) -> int:
+    """Stable per-turn seed, so the same turn of the same conversation replays identically."""
+    digest = hashlib.sha1(f"{seed}\0{history_length}\0{message}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def fallback_key(
+    stage: str,
+    mood: str,
+    match: MatchResult,
+    user_message_count: int,
+    seed: int,
+) -> FallbackKey:
+    """Pick the reply variant for a turn; ``seed`` decides between equivalent phrasings."""
+    # Each choice consumes a few of the seed's bits; cheaper than a seeded ``random.Random``.
+    seed, greeting = divmod(seed, len(GREETINGS))
+    seed, empathy = divmod(seed, len(EMPATHY_PHRASES.get(mood, [""])))
+    closer = seed % len(SOFT_CLOSERS.get(stage, DEFAULT_CLOSERS))
+    if stage == "initial_greeting":
+        variant = str(greeting)
+    elif stage == "rapport_building":
+        variant = {1: "first", 2: "second"}.get(user_message_count, "later")
+    elif stage == "transitioning":
+        variant = "goal" if match.has("intent:goal") else "other"
+    else:
+        if match.has("intent:pricing"):
+            intro = "pricing"
+        elif match.has("intent:speed"):
+            intro = "speed"
+        else:
+            intro = "other"
+        if match.has("product:home_plus"):
+            follow_up = "home"
+        elif match.has("product:auto_express"):
+            follow_up = "auto"
+        elif match.has("topic:business"):
+            follow_up = "business"
+        else:
+            follow_up = "other"
+        variant = f"{intro}/{follow_up}"
+    return FallbackKey(stage=stage, mood=mood, variant=variant, empathy=empathy, closer=closer)
+
+
+class FallbackTable:
+    """Rule-based replies rendered once per :class:`FallbackKey` and reused.
+
+    Greeting, rapport and transition replies are stored whole. Loan replies
+    store their fixed head and tail; the suggested products, quotes and
+    eligibility notes are spliced in per turn. The key space is finite, so the table is bounded;
+    :meth:`prerender` fills it up front.
+    """
+
+    def __init__(self) -> None:
+        self._rendered: Dict[FallbackKey, Tuple[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rendered)
+
+    def prerender(self) -> int:
+        """Render every key; returns the table size."""
+        for stage, variants in VARIANTS.items():
+            closers = SOFT_CLOSERS.get(stage, DEFAULT_CLOSERS)
+            for mood in MOODS:
+                empathies = range(len(EMPATHY_PHRASES.get(mood, [""])))
+                for variant, empathy, closer in product(variants, empathies, range(len(closers))):
+                    self.parts(FallbackKey(stage, mood, variant, empathy, closer))
+        return len(self._rendered)
+
+    def render(
+        self,
+        key: FallbackKey,
+        suggestions: Sequence[LoanProduct] = (),
+        quotes: Optional[Sequence[str]] = None,
+        eligibility: Optional[Sequence[str]] = None,
+    ) -> str:
+        head, tail = self.parts(key)
+        if key.stage != "loan_discussion":
+            return head
+
+        lines = [head]
+        if suggestions:
+            lines.append("\nHere are a few options that might work for you:")
+            for loan in suggestions[:3]:
+                lines.append(
+                    f"• {loan.name} - {loan.description} Rates start around {loan.interest_rate}% with terms up to {max(loan.term_months)} months."
+                )
+        if quotes:
+            lines.append("\nHere's roughly what the numbers look like:")
+            lines.extend(quotes)
+        if eligibility:
+            lines.append("\nA few things to know before applying:")
+            lines.extend(eligibility)
+        lines.append(tail)
+        return "\n\n".join(lines)
+
+    def parts(self, key: FallbackKey) -> Tuple[str, str]:
+        parts = self._rendered.get(key)
+        if parts is None:
+            parts = self._rendered[key] = _render_parts(key)
+        return parts
+
+
+def _render_parts(key: FallbackKey) -> Tuple[str, str]:
+    empathy = EMPATHY_PHRASES[key.mood][key.empathy] if key.mood in EMPATHY_PHRASES else ""
+    closer = SOFT_CLOSERS.get(key.stage, DEFAULT_CLOSERS)[key.closer]
+
+    if key.stage == "initial_greeting":
+        text = GREETINGS[int(key.variant)]
+    elif key.stage == "rapport_building":
+        text = RAPPORT_REPLIES[key.variant]
+    elif key.stage == "transitioning":
+        text = TRANSITION_REPLIES[key.variant]
+    else:
+        intro, follow_up = key.variant.split("/")
+        head = wrap_with_empathy(empathy, LOAN_INTROS[intro])
+        # The disclaimer never ends in a question, so the closer always follows it.
+        tail = f"\n{LOAN_FOLLOW_UPS[follow_up]}\n\n\n{LOAN_DISCLAIMER}\n\n{closer}"
+        return head, tail
+
+    return add_soft_closing(wrap_with_empathy(empathy, text), closer), ""
+
+
+def wrap_with_empathy(prefix: str, text: str) -> str:
+    if not prefix:
+        return text
+    if text.lower().startswith(prefix.lower()):
+        return text
+    return f"{prefix} {text}".strip()
+
+
+def add_soft_closing(text: str, closer: str) -> str:
+    stripped = text.strip()
+    if not stripped or stripped.endswith(("?", "!", "…")):
+        # Already ends with strong punctuation or question
+        return stripped
+    if "\n\n" in stripped:
+        return f"{stripped}\n\n{closer}"
+    return f"{stripped} {closer}"
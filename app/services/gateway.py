@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable, Optional, TypeVar
+
+from app.config import Settings
+
+
+T = TypeVar("T")
+
+
+class GatewayBusy(Exception):
+    """The LLM gateway is saturated; the caller should answer without the LLM."""
+
+
+class _SharedCall:
+    """An upstream call and the number of callers awaiting its result."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[object]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class LLMGateway:
+    """Admission control in front of the upstream LLM.
+
+    * at most ``max_in_flight`` upstream calls run at once;
+    * up to ``max_queue`` more wait for a slot, for at most ``queue_timeout``
+      seconds; beyond that callers are rejected with :class:`GatewayBusy`;
+    * waiting callers are served round-robin across sessions, and a session
+      may not have more than ``max_per_session`` calls running or waiting;
+    * identical in-progress prompts are coalesced: followers await the
+      leader's result instead of calling upstream again. The call is
+      cancelled, and its slot freed, once every caller awaiting it is.
+
+    Meant to be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout: float,
+        max_per_session: int,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_per_session = max_per_session
+        self.rejected = 0
+        self.coalesced = 0
+        self._active = 0
+        self._waiting = 0
+        # Waiters per owner; owners are rotated so each gets a turn in order.
+        self._queues: "OrderedDict[Hashable, Deque[asyncio.Future[None]]]" = OrderedDict()
+        self._per_owner: Dict[Hashable, int] = {}
+        self._pending: Dict[Hashable, _SharedCall] = {}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self._active,
+            "waiting": self._waiting,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+        }
+
+    async def call(
+        self,
+        key: Optional[Hashable],
+        owner: Optional[Hashable],
+        factory: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Run ``factory()`` under a slot, sharing the result with identical ``key`` calls.
+
+        ``key`` identifies the prompt (``None`` disables coalescing) and
+        ``owner`` the session it belongs to (``None`` for anonymous callers).
+        """
+        if key is None:
+            # Nobody else can be waiting on this call, so it runs in the caller's
+            # task: a deadline or a lost hedge race cancels it and frees its slot.
+            return await self._run(owner, factory)
+
+        shared = self._pending.get(key)
+        if shared is None:
+            task = asyncio.ensure_future(self._run(owner, factory))
+            shared = self._pending[key] = _SharedCall(task)
+            task.add_done_callback(lambda _, call=shared: self._unshare(key, call))
+            # Keeps an abandoned leader's failure from being reported as unretrieved.
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        else:
+            self.coalesced += 1
+
+        shared.waiters += 1
+        try:
+            # A cancelled caller leaves the upstream call to the callers still waiting on it.
+            return await asyncio.shield(shared.task)
+        finally:
+            shared.waiters -= 1
+            if not shared.waiters and not shared.task.done():
+                # The last interested caller went away: stop the call and free its slot.
+                self._unshare(key, shared)
+                shared.task.cancel()
+
+    def _unshare(self, key: Hashable, shared: "_SharedCall") -> None:
+        if self._pending.get(key) is shared:
+            del self._pending[key]
+
+    async def _run(self, owner: Optional[Hashable], factory: Callable[[], Awaitable[T]]) -> T:
+        async with self.slot(owner):
+            return await factory()
+
+    @asynccontextmanager
+    async def slot(self, owner: Optional[Hashable]) -> AsyncIterator[None]:
+        """Hold one upstream slot for the body, e.g. for the whole of a streamed reply."""
+        if owner is None:
+            owner = object()
+        await self._acquire(owner)
+        try:
+            yield
+        finally:
+            self._release(owner)
+
+    async def _acquire(self, owner: Hashable) -> None:
+        if self._per_owner.get(owner, 0) >= self.max_per_session:
+            self.rejected += 1
+            raise GatewayBusy("too many calls for this session")
+        if self._active < self.max_in_flight and not self._waiting:
+            self._active += 1
+            self._per_owner[owner] = self._per_owner.get(owner, 0) + 1
+            return
+        if self._waiting >= self.max_queue:
+            self.rejected += 1
+            raise GatewayBusy("LLM queue is full")
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(owner, deque()).append(waiter)
+        self._waiting += 1
+        self._per_owner[owner] = self._per_owner.get(owner, 0) + 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up: pass it on.
+                self._release(owner)
+            else:
+                waiter.cancel()
+                self._forget(owner, waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self.rejected += 1
+                raise GatewayBusy("timed out waiting for the LLM") from None
+            raise
+
+    def _forget(self, owner: Hashable, waiter: "asyncio.Future[None]") -> None:
+        queue = self._queues.get(owner)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            self._waiting -= 1
+            if not queue:
+                del self._queues[owner]
+        self._drop_owner(owner)
+
+    def _drop_owner(self, owner: Hashable) -> None:
+        count = self._per_owner.get(owner, 0) - 1
+        if count > 0:
+            self._per_owner[owner] = count
+        else:
+            self._per_owner.pop(owner, None)
+
+    def _release(self, owner: Hashable) -> None:
+        self._drop_owner(owner)
+        # Hand the slot straight to the next owner in line, so newcomers
+        # cannot overtake callers that are already waiting.
+        while self._queues:
+            next_owner, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            self._waiting -= 1
+            if queue:
+                self._queues.move_to_end(next_owner)
+            else:
+                del self._queues[next_owner]
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+
+def build_llm_gateway(settings: Settings) -> Optional[LLMGateway]:
+    if settings.llm_max_in_flight <= 0:
+        return None
+    return LLMGateway(
+        max_in_flight=settings.llm_max_in_flight,
+        max_queue=settings.llm_max_queue,
+        queue_timeout=settings.llm_queue_timeout,
+        max_per_session=settings.llm_max_per_session,
+    )
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.data.rewrites import REWRITE_RULES
+
+
+class PhraseRewriter:
+    """Rewrites every rule phrase in one regex pass.
+
+    Phrases match on word boundaries and case-insensitively; the replacement
+    copies the case of the matched text (all caps or a leading capital).
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, str]]) -> None:
+        self._replacements: Dict[str, str] = {formal.lower(): casual for formal, casual in rules}
+        phrases = sorted(self._replacements, key=len, reverse=True)
+        initials = "".join(sorted({re.escape(phrase[0]) for phrase in phrases}))
+        # The initial-letter lookahead lets the scanner skip most positions
+        # before trying the alternation.
+        self._pattern = re.compile(
+            rf"(?=[{initials}])\b(?:" + "|".join(re.escape(phrase) for phrase in phrases) + r")\b",
+            re.IGNORECASE,
+        )
+        self.max_length = max(len(phrase) for phrase in phrases)
+        # Replacements for the usual spellings, so most matches are one lookup.
+        self._cased: Dict[str, str] = {}
+        for phrase in phrases:
+            for variant in (phrase, phrase[0].upper() + phrase[1:], phrase.upper()):
+                self._cased[variant] = self._replacement(variant)
+
+    def rewrite(self, text: str, start: int = 0, end: Optional[int] = None) -> str:
+        """Rewrite ``text[start:end]``.
+
+        Characters outside the range only serve as word-boundary context; no
+        phrase may straddle ``start`` or ``end`` (see :meth:`safe_cut`).
+        """
+        end = len(text) if end is None else end
+        if start == 0 and end == len(text):
+            return self._pattern.sub(self._substitute, text)
+        # Matching runs over the whole text so boundaries see the real
+        # neighbours; only the range is assembled.
+        parts: List[str] = []
+        last = start
+        for match in self._pattern.finditer(text, start):
+            if match.start() >= end:
+                break
+            parts.append(text[last:match.start()])
+            parts.append(self._substitute(match))
+            last = match.end()
+        parts.append(text[last:end])
+        return "".join(parts)
+
+    def safe_cut(self, text: str, start: int = 0) -> int:
+        """Largest prefix end of ``text`` that can be rewritten without seeing more text.
+
+        Everything from the last ``max_length`` characters is held back, so the
+        character after any phrase ending before the cut is known; a phrase
+        straddling the cut moves the cut to its end.
+        """
+        cut = len(text) - self.max_length
+        if cut <= start:
+            return start
+        for match in self._pattern.finditer(text, max(start, cut - self.max_length + 1)):
+            if match.start() >= cut:
+                break
+            if cut < match.end():
+                return match.end()
+        return cut
+
+    def _substitute(self, match: "re.Match[str]") -> str:
+        matched = match.group()
+        casual = self._cased.get(matched)
+        return casual if casual is not None else self._replacement(matched)
+
+    def _replacement(self, matched: str) -> str:
+        casual = self._replacements[matched.lower()]
+        if matched.isupper() and len(matched) > 1:
+            return casual.upper()
+        if matched[0].isupper():
+            return casual[0].upper() + casual[1:]
+        return casual[0].lower() + casual[1:]
+
+
+REWRITER = PhraseRewriter(REWRITE_RULES)
+
+
+def humanize(text: str) -> str:
+    return REWRITER.rewrite(text)
+
+
+class StreamingHumanizer:
+    """Apply :func:`humanize` to a reply that arrives in chunks.
+
+    Text is released as soon as no rewrite phrase can straddle the cut point
+    and the word boundary after it is known, so at most ``max_length``
+    characters are held back. Leading and trailing whitespace of the whole
+    reply is stripped, as in the non-streaming path.
+    """
+
+    def __init__(self, rewriter: PhraseRewriter = REWRITER) -> None:
+        self._rewriter = rewriter
+        # One already emitted character stays in front of the buffer as
+        # word-boundary context: "b" + "it is" must not become "bit's".
+        self._context = ""
+        self._buffer = ""
+        self._started = False
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        text = self._context + self._buffer
+        offset = len(self._context)
+        cut = self._rewriter.safe_cut(text, offset)
+        # Trailing whitespace waits in case the reply ends here.
+        cut = offset + len(text[offset:cut].rstrip())
+        if cut <= offset:
+            return ""
+        rewritten = self._rewriter.rewrite(text, offset, cut)
+        self._context = text[cut - 1]
+        self._buffer = text[cut:]
+        return self._emit(rewritten)
+
+    def flush(self) -> str:
+        text = self._context + self._buffer
+        rewritten = self._rewriter.rewrite(text, len(self._context)).rstrip()
+        self._context = self._buffer = ""
+        return self._emit(rewritten)
+
+    def _emit(self, text: str) -> str:
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
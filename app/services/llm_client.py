@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import TYPE_CHECKING, Optional, Tuple, Type
+
+from app.config import Settings
+
+if TYPE_CHECKING:  # The SDK is imported on first use: it is most of the app's import time.
+    from openai import AsyncOpenAI
+
+
+def _sdk_httpx() -> ModuleType:
+    """The httpx package the SDK's default client is built on.
+
+    Newer SDK releases use the ``httpx2`` fork, whose client rejects plain
+    ``httpx`` limits and timeouts, so those are built from the same package.
+    """
+    from openai import DefaultAsyncHttpxClient
+
+    for base in DefaultAsyncHttpxClient.__mro__:
+        package = base.__module__.split(".")[0]
+        if package.startswith("httpx"):
+            return importlib.import_module(package)
+    return importlib.import_module("httpx")
+
+
+def api_errors() -> Tuple[Type[BaseException], ...]:
+    """Exceptions a failed OpenAI call raises; importing them loads the SDK."""
+    from openai import APIError
+
+    return (APIError,)
+
+
+def build_openai_client(settings: Settings) -> Optional["AsyncOpenAI"]:
+    """Create the process-wide async OpenAI client backed by a keep-alive connection pool.
+
+    Returns ``None`` when no API key is configured so callers can run rule-only;
+    the SDK is then never imported.
+    """
+
+    if not settings.openai_api_key:
+        return None
+
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    http = _sdk_httpx()
+    http_client = DefaultAsyncHttpxClient(
+        limits=http.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry,
+        ),
+        timeout=http.Timeout(settings.openai_timeout, connect=settings.openai_connect_timeout),
+    )
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url,
+        max_retries=settings.openai_max_retries,
+        http_client=http_client,
+    )
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Mapping, Sequence, Tuple
+
+from app.data.keywords import KEYWORD_TABLE
+
+
+@dataclass(frozen=True)
+class KeywordHit:
+    keyword: str
+    start: int
+    end: int
+    tags: FrozenSet[str]
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """Every keyword found in one text, with the union of their tags."""
+
+    hits: Tuple[KeywordHit, ...]
+    tags: FrozenSet[str]
+    _order: Mapping[str, int]
+
+    def has(self, tag: str) -> bool:
+        return tag in self.tags
+
+    def labels(self, prefix: str) -> List[str]:
+        """Labels of the ``prefix:label`` tags present, in keyword-table order."""
+        marker = f"{prefix}:"
+        found = [tag for tag in self.tags if tag.startswith(marker)]
+        found.sort(key=self._order.__getitem__)
+        return [tag[len(marker):] for tag in found]
+
+
+class KeywordMatcher:
+    """Finds all table keywords in a text with one compiled, word-bounded regex.
+
+    A keyword containing another keyword (``credit card`` contains ``credit``)
+    carries both keywords' tags, since the regex reports non-overlapping hits.
+    """
+
+    def __init__(self, table: Mapping[str, Sequence[str]]) -> None:
+        self._order: Dict[str, int] = {tag: index for index, tag in enumerate(table)}
+        keywords = {keyword.lower() for words in table.values() for keyword in words}
+        bounded = {
+            keyword: re.compile(rf"\b{self._escape(keyword)}(?:s|es)?\b") for keyword in keywords
+        }
+        self._tags: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(
+                tag
+                for tag, words in table.items()
+                for word in words
+                if bounded[word.lower()].search(keyword)
+            )
+            for keyword in keywords
+        }
+        # Longest first so multi-word keywords win over their prefixes.
+        alternation = "|".join(self._escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+        self._pattern = re.compile(rf"\b(?P<kw>{alternation})(?:s|es)?\b", re.IGNORECASE)
+
+    @staticmethod
+    def _escape(keyword: str) -> str:
+        return re.escape(keyword).replace("'", "['’]")
+
+    def scan(self, text: str) -> MatchResult:
+        hits = []
+        tags: set = set()
+        for match in self._pattern.finditer(text):
+            keyword = match.group("kw").lower().replace("’", "'")
+            keyword_tags = self._tags[keyword]
+            hits.append(KeywordHit(keyword, match.start(), match.end(), keyword_tags))
+            tags.update(keyword_tags)
+        return MatchResult(tuple(hits), frozenset(tags), self._order)
+
+
+KEYWORD_MATCHER = KeywordMatcher(KEYWORD_TABLE)
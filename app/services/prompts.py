@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Sequence
+
+from app.data.loan_products import LoanProduct
+
+if TYPE_CHECKING:
+    from app.services.context import ContextWindow
+
+
+# Stage-specific system prompts for relationship building.
+STAGE_PROMPTS: Mapping[str, str] = {
+    "initial_greeting": """You are Astra, a friendly and personable loan advisor at AstraFin. You're like a trusted friend who happens to work in finance.
+
+CRITICAL: This is the FIRST message. DO NOT mention loans, financing, or anything business-related yet. Just be warm and friendly.
+
+Your approach:
+- Greet them warmly and naturally (like you just met at a coffee shop)
+- Ask how their day is going or make a friendly observation
+- Show genuine interest in them as a person
+- Keep it light, casual, and human
+- Use natural language with contractions
+- Maybe ask what brought them here today (but don't assume it's about loans)
+- Keep it under 80 words
+- Be genuinely curious about them
+
+Example tone: "Hey! Thanks for stopping by. How's your day going? 😊" or "Hi there! Nice to meet you. What brings you here today?""",
+    "rapport_building": """You are Astra, a friendly loan advisor at AstraFin. You're building a relationship first, like a good salesperson.
+
+CRITICAL: DO NOT jump into loans yet. Build rapport and connection first.
+
+Your approach:
+- Show genuine interest in what they're saying
+- Ask follow-up questions about their life, goals, or situation
+- Share a bit about yourself if it feels natural (but keep it brief)
+- Find common ground or things to relate to
+- Make them feel heard and understood
+- Keep it conversational and friendly
+- Use phrases like "That's interesting!", "Tell me more about that", "I can relate to that"
+- Only mention loans if THEY bring it up first
+- Keep responses under 100 words
+
+Remember: People buy from people they like. Build the relationship first.""",
+    "transitioning": """You are Astra, a friendly loan advisor at AstraFin. You're naturally transitioning from getting to know them to understanding their financial needs.
+
+Your approach:
+- Acknowledge what they've shared about themselves
+- Gently ask about their goals or what they're looking to accomplish
+- Still be warm and personal, but start exploring their needs
+- Use phrases like "So what are you hoping to achieve?", "What's your situation like?", "I'm curious - what brought you here today?"
+- Don't push too hard - let them guide the conversation
+- If they mention financial goals, show interest and ask follow-up questions
+- Keep it natural and conversational (under 120 words)""",
+    "loan_discussion": """You are Astra, a friendly and empathetic loan advisor at AstraFin. You've built rapport, now you're helping them with their financial needs.
+
+Your personality:
+- Warm, approachable, and conversational (like talking to a trusted friend)
+- Use natural language, occasional contractions (I'm, you're, that's), and varied sentence lengths
+- Show empathy and understanding - acknowledge their situation
+- Ask thoughtful follow-up questions to understand their needs better
+- Be encouraging and supportive, especially if they seem uncertain
+- Use casual phrases like "I get it", "That makes sense", "Here's the thing", "You know what"
+- Occasionally use emojis sparingly (😊 👍 💡) but don't overdo it
+- Keep responses conversational and under 150 words
+- Never sound robotic or use corporate jargon
+
+Important guidelines:
+- Always be transparent that final approval depends on underwriting
+- Don't make promises about approval or rates
+- Focus on understanding their needs first, then suggest options
+- If they seem stressed or worried, acknowledge it and be reassuring
+- Match their energy level - if they're casual, be casual; if formal, be professional but still warm""",
+}
+
+STAGE_REMINDERS: Mapping[str, str] = {
+    "rapport_building": "\nREMINDER: You're in rapport-building stage. DO NOT mention loans yet. Just be friendly and get to know them.",
+    "transitioning": "\nREMINDER: You're transitioning. Gently explore their needs but don't push. Let them guide the conversation.",
+}
+
+PRODUCTS_HEADER = "Available loan products you can discuss:\n"
+QUOTES_HEADER = "Payment estimates computed for this customer (use these figures, don't estimate your own):\n"
+ELIGIBILITY_HEADER = "Products this customer does not qualify for yet (explain why if it comes up; don't offer them):\n"
+SUMMARY_HEADER = "\nEarlier in this conversation:\n"
+
+# Approximate chat-format overhead per message and per reply (OpenAI cookbook).
+MESSAGE_OVERHEAD_TOKENS = 4
+_REPLY_PRIMING_TOKENS = 3
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    """Cheap local token estimate: one token per word or punctuation mark."""
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def product_snippet(loan: LoanProduct) -> str:
+    return (
+        f"• {loan.name}: {loan.description} Interest rates start at {loan.interest_rate}% "
+        f"with terms ranging from {min(loan.term_months)} to {max(loan.term_months)} months. "
+        f"Loan amounts: ${loan.min_amount:,} to ${loan.max_amount:,}"
+    )
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    messages: List[Dict[str, str]]
+    tokens: int
+
+
+class PromptLibrary:
+    """Stage prompts and product snippets rendered once, composed per turn.
+
+    Static text is never reformatted after construction and its token counts
+    are cached, so a turn only counts the conversation text it adds (see
+    :class:`~app.services.context.ContextBuilder`).
+    """
+
+    def __init__(self, products: Iterable[LoanProduct]) -> None:
+        self._snippets: Dict[str, str] = {
+            loan.id: product_snippet(loan) + "\n" for loan in products
+        }
+        self._tokens: Dict[str, int] = {
+            text: count_tokens(text)
+            for text in [
+                *STAGE_PROMPTS.values(),
+                *STAGE_REMINDERS.values(),
+                *self._snippets.values(),
+                PRODUCTS_HEADER,
+                QUOTES_HEADER,
+                ELIGIBILITY_HEADER,
+            ]
+        }
+
+    def snippet(self, loan: LoanProduct) -> str:
+        snippet = self._snippets.get(loan.id)
+        if snippet is None:
+            snippet = self._snippets[loan.id] = product_snippet(loan) + "\n"
+            self._tokens[snippet] = count_tokens(snippet)
+        return snippet
+
+    def fixed_tokens(
+        self,
+        stage: str,
+        message: str,
+        suggestions: Sequence[LoanProduct],
+        quotes: Sequence[str] = (),
+        eligibility: Sequence[str] = (),
+    ) -> int:
+        """Tokens of everything in the prompt except the conversation context."""
+        tokens = self._tokens[self._system_prompt(stage)] + _REPLY_PRIMING_TOKENS
+        tokens += 3 * MESSAGE_OVERHEAD_TOKENS + count_tokens(message)
+        if stage == "loan_discussion" and suggestions:
+            tokens += self._tokens[PRODUCTS_HEADER]
+            tokens += sum(self._tokens[self.snippet(loan)] for loan in suggestions)
+            if quotes:
+                tokens += self._tokens[QUOTES_HEADER] + sum(count_tokens(line) for line in quotes)
+        if stage == "loan_discussion" and eligibility:
+            tokens += self._tokens[ELIGIBILITY_HEADER] + sum(count_tokens(line) for line in eligibility)
+        reminder = STAGE_REMINDERS.get(stage)
+        if reminder:
+            tokens += self._tokens[reminder]
+        return tokens
+
+    def render(
+        self,
+        stage: str,
+        message: str,
+        suggestions: Sequence[LoanProduct],
+        window: ContextWindow,
+        quotes: Sequence[str] = (),
+        eligibility: Sequence[str] = (),
+    ) -> RenderedPrompt:
+        system_prompt = self._system_prompt(stage)
+        parts: List[str] = []
+
+        # Only include loan products if we're in loan discussion stage
+        if stage == "loan_discussion" and suggestions:
+            parts.append(PRODUCTS_HEADER)
+            parts.extend(self.snippet(loan) for loan in suggestions)
+            parts.append("\n")
+            if quotes:
+                parts.append(QUOTES_HEADER)
+                parts.append("\n".join(quotes))
+                parts.append("\n\n")
+        if stage == "loan_discussion" and eligibility:
+            parts.append(ELIGIBILITY_HEADER)
+            parts.append("\n".join(eligibility))
+            parts.append("\n\n")
+
+        # Older turns travel as a summary; recent ones as real messages below.
+        if window.summary:
+            parts.append(SUMMARY_HEADER)
+            parts.append(window.summary)
+            parts.append("\n")
+
+        reminder = STAGE_REMINDERS.get(stage)
+        if reminder:
+            parts.append(reminder)
+
+        messages = [{"role": "system", "content": system_prompt}]
+        context_content = "".join(parts).strip()
+        if context_content:
+            messages.append({"role": "system", "content": context_content})
+
+        messages.extend(window.messages)
+        messages.append({"role": "user", "content": message})
+
+        tokens = self.fixed_tokens(stage, message, suggestions, quotes, eligibility) + window.tokens
+        return RenderedPrompt(messages=messages, tokens=tokens)
+
+    def _system_prompt(self, stage: str) -> str:
+        return STAGE_PROMPTS.get(stage, STAGE_PROMPTS["loan_discussion"])
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.data.catalog import ProductCatalog
+
+
+def monthly_payments(principal: np.ndarray, annual_rate: np.ndarray, term_months: np.ndarray) -> np.ndarray:
+    """Level monthly payment of fully amortizing loans; arguments broadcast.
+
+    ``annual_rate`` is a percentage (``6.25`` for 6.25%).
+    """
+    principal = np.asarray(principal, dtype=float)
+    rate = np.asarray(annual_rate, dtype=float) / 1200.0
+    term = np.asarray(term_months, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.power(1.0 + rate, term)
+        payment = principal * rate * growth / (growth - 1.0)
+    return np.where(rate == 0, principal / term, payment)
+
+
+def max_principals(budget: np.ndarray, annual_rate: np.ndarray, term_months: np.ndarray) -> np.ndarray:
+    """Largest principal whose monthly payment fits ``budget``; inverse of :func:`monthly_payments`."""
+    budget = np.asarray(budget, dtype=float)
+    rate = np.asarray(annual_rate, dtype=float) / 1200.0
+    term = np.asarray(term_months, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        principal = budget * (1.0 - np.power(1.0 + rate, -term)) / rate
+    return np.where(rate == 0, budget * term, principal)
+
+
+@dataclass(frozen=True)
+class Quote:
+    product_id: str
+    product_name: str
+    amount: float
+    term_months: int
+    interest_rate: float
+    monthly_payment: float
+    total_interest: float
+    total_paid: float
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class Affordability:
+    product_id: str
+    product_name: str
+    term_months: int
+    interest_rate: float
+    monthly_budget: float
+    max_amount: float
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+class QuoteEngine:
+    """Prices every (product, term) combination of a catalog in one NumPy pass.
+
+    The flattened offer arrays are built once per catalog, so a quote is a few
+    array operations regardless of how many products and terms there are.
+    """
+
+    def __init__(self, catalog: ProductCatalog) -> None:
+        self._catalog = catalog
+        offers = [(product, term) for product in catalog for term in product.term_months]
+        self._ids = np.array([product.id for product, _ in offers], dtype=object)
+        self._names = np.array([product.name for product, _ in offers], dtype=object)
+        self._rates = np.array([product.interest_rate for product, _ in offers], dtype=float)
+        self._terms = np.array([term for _, term in offers], dtype=int)
+        self._min_amounts = np.array([product.min_amount for product, _ in offers], dtype=float)
+        self._max_amounts = np.array([product.max_amount for product, _ in offers], dtype=float)
+
+    def _offer_mask(
+        self, product_ids: Optional[Iterable[str]], term_months: Optional[int]
+    ) -> np.ndarray:
+        mask = np.ones(len(self._ids), dtype=bool)
+        if product_ids is not None:
+            mask &= np.isin(self._ids, list(product_ids))
+        if term_months is not None:
+            mask &= self._terms == term_months
+        return mask
+
+    def quote(
+        self,
+        amount: float,
+        product_ids: Optional[Iterable[str]] = None,
+        term_months: Optional[int] = None,
+    ) -> List[Quote]:
+        """Quotes for every offer that lends ``amount``, lowest monthly payment first."""
+        mask = self._offer_mask(product_ids, term_months)
+        mask &= (self._min_amounts <= amount) & (amount <= self._max_amounts)
+        index = np.flatnonzero(mask)
+        payments = monthly_payments(amount, self._rates[index], self._terms[index])
+        totals = payments * self._terms[index]
+        order = np.argsort(payments, kind="stable")
+        return [
+            Quote(
+                product_id=self._ids[index[i]],
+                product_name=self._names[index[i]],
+                amount=float(amount),
+                term_months=int(self._terms[index[i]]),
+                interest_rate=float(self._rates[index[i]]),
+                monthly_payment=round(float(payments[i]), 2),
+                total_interest=round(float(totals[i] - amount), 2),
+                total_paid=round(float(totals[i]), 2),
+            )
+            for i in order
+        ]
+
+    def payment_grid(
+        self,
+        amounts: Iterable[float],
+        product_ids: Optional[Iterable[str]] = None,
+        term_months: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Monthly payments for amounts × offers as a 2-D array (NaN where not lendable)."""
+        mask = self._offer_mask(product_ids, term_months)
+        amount_column = np.asarray(list(amounts), dtype=float)[:, None]
+        payments = monthly_payments(amount_column, self._rates[mask], self._terms[mask])
+        lendable = (self._min_amounts[mask] <= amount_column) & (amount_column <= self._max_amounts[mask])
+        return {
+            "product_ids": self._ids[mask],
+            "term_months": self._terms[mask],
+            "payments": np.where(lendable, payments, np.nan),
+        }
+
+    def affordability(
+        self,
+        monthly_budget: float,
+        product_ids: Optional[Iterable[str]] = None,
+        term_months: Optional[int] = None,
+    ) -> List[Affordability]:
+        """Largest amount each offer can lend within ``monthly_budget``, highest first.
+
+        Offers whose minimum amount is out of reach are left out.
+        """
+        mask = self._offer_mask(product_ids, term_months)
+        index = np.flatnonzero(mask)
+        principals = np.minimum(
+            max_principals(monthly_budget, self._rates[index], self._terms[index]),
+            self._max_amounts[index],
+        )
+        keep = principals >= self._min_amounts[index]
+        index, principals = index[keep], principals[keep]
+        order = np.argsort(-principals, kind="stable")
+        return [
+            Affordability(
+                product_id=self._ids[index[i]],
+                product_name=self._names[index[i]],
+                term_months=int(self._terms[index[i]]),
+                interest_rate=float(self._rates[index[i]]),
+                monthly_budget=float(monthly_budget),
+                max_amount=round(float(principals[i]), 2),
+            )
+            for i in order
+        ]
+
+    def schedule(self, product_id: str, amount: float, term_months: int) -> Dict[str, List[float]]:
+        """Full amortization schedule, computed in closed form for all months at once.
+
+        Raises ``KeyError`` for an unknown product and ``ValueError`` for an
+        amount or term the product does not offer.
+        """
+        product = self._catalog.get(product_id)
+        if product is None:
+            raise KeyError(product_id)
+        if not product.min_amount <= amount <= product.max_amount:
+            raise ValueError(f"{product.name} lends ${product.min_amount:,} to ${product.max_amount:,}")
+        if term_months not in product.term_months:
+            raise ValueError(
+                f"{product.name} offers terms of {', '.join(str(term) for term in product.term_months)} months"
+            )
+        rate = product.interest_rate / 1200.0
+        payment = float(monthly_payments(amount, product.interest_rate, term_months))
+        months = np.arange(1, term_months + 1)
+        if rate == 0:
+            balance = amount - payment * months
+        else:
+            growth = np.power(1.0 + rate, months)
+            balance = amount * growth - payment * (growth - 1.0) / rate
+        balance = np.clip(balance, 0.0, None)
+        previous = np.concatenate(([float(amount)], balance[:-1]))
+        interest = previous * rate
+        principal = payment - interest
+        return {
+            "month": months.tolist(),
+            "payment": np.full(term_months, round(payment, 2)).tolist(),
+            "principal": np.round(principal, 2).tolist(),
+            "interest": np.round(interest, 2).tolist(),
+            "balance": np.round(balance, 2).tolist(),
+        }
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, Tuple, TypeVar
+
+from app.config import Settings
+
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """Skips a dependency for ``cooldown_seconds`` after ``failure_threshold`` consecutive failures.
+
+    Once the cooldown has passed a single trial call is let through; its
+    outcome closes the breaker again or restarts the cooldown. A trial that
+    never reports back simply allows another one after the next cooldown.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        cooldown_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self._clock = clock
+        self._opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self._clock() - self._opened_at < self.cooldown_seconds:
+            return False
+        # Half-open: this caller is the trial, everyone else waits another cooldown.
+        self._opened_at = self._clock()
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._opened_at is not None or self.failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+
+
+class RateLimiter:
+    """Allows at most ``limit`` events in any ``window`` seconds (a sliding window)."""
+
+    def __init__(self, limit: int, window: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.limit = limit
+        self.window = window
+        self._clock = clock
+        self._events: Deque[float] = deque()
+
+    def acquire(self) -> float:
+        """Record an event; returns 0 if allowed, else the seconds until one would be."""
+        now = self._clock()
+        while self._events and now - self._events[0] >= self.window:
+            self._events.popleft()
+        if len(self._events) >= self.limit:
+            return self._events[0] + self.window - now
+        self._events.append(now)
+        return 0.0
+
+
+async def hedge(
+    primary: Callable[[], Awaitable[T]],
+    backup: Callable[[], Awaitable[T]],
+    delay: float,
+) -> Tuple[T, bool]:
+    """Run ``primary``; if it has not finished after ``delay`` seconds, race ``backup`` against it.
+
+    Returns the first successful result and whether it came from ``backup``.
+    If every attempt fails, the primary's exception is raised. Losers are
+    cancelled.
+    """
+    first = asyncio.ensure_future(primary())
+    attempts = {first: False}
+    try:
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if not done:
+            attempts[asyncio.ensure_future(backup())] = True
+        pending = set(attempts)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), attempts[task]
+        raise first.exception()
+    finally:
+        for task in attempts:
+            task.cancel()
+
+
+def build_circuit_breaker(settings: Settings) -> Optional[CircuitBreaker]:
+    if settings.llm_breaker_threshold <= 0:
+        return None
+    return CircuitBreaker(settings.llm_breaker_threshold, settings.llm_breaker_cooldown)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+from typing import Dict, Mapping, Optional
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # Optional: the stdlib encoder produces the same bytes, only slower.
+    orjson = None
+
+
+def dumps(value: object) -> bytes:
+    """Compact UTF-8 JSON, the same form as the catalog's cached product fragments."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class SplicedJSONResponse(Response):
+    """A JSON object response whose ``bytes`` members are already-encoded JSON.
+
+    Cached fragments, such as a catalog's product JSON, are spliced in as
+    they are; only the other members are encoded. Returned directly from a
+    route, it also skips FastAPI's ``response_model`` validation, so the
+    route must build exactly the declared shape.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Mapping[str, object],
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        super().__init__(content, status_code, headers)
+
+    def render(self, content: Mapping[str, object]) -> bytes:
+        members = [
+            dumps(key) + b":" + (value if isinstance(value, bytes) else dumps(value))
+            for key, value in content.items()
+        ]
+        return b"{" + b",".join(members) + b"}"
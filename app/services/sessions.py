@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.config import Settings
+from app.services.cache import LRUTTLCache
+from app.services.context import RollingSummary
+from app.services.facts import ApplicantProfile
+from app.services.stage import StageMachine
+
+
+@dataclass
+class SessionState:
+    """Server-side conversation plus the stage machine and profile the engine keeps up to date.
+
+    ``history`` only retains the most recent messages; the stage machine and
+    the applicant profile cover the whole conversation, so trimming never
+    changes the detected stage or forgets a stated fact.
+    """
+
+    session_id: str
+    history: List[Dict[str, str]] = field(default_factory=list)
+    total_messages: int = 0
+    # How many of ``total_messages`` the store has written; the rest are saved next.
+    saved_messages: int = 0
+    stage: StageMachine = field(default_factory=StageMachine)
+    summary: RollingSummary = field(default_factory=RollingSummary)
+    profile: ApplicantProfile = field(default_factory=ApplicantProfile)
+
+    def append(self, role: str, content: str, max_history: int) -> None:
+        self.history.append({"role": role, "content": content})
+        self.total_messages += 1
+        if len(self.history) > max_history:
+            del self.history[: len(self.history) - max_history]
+
+
+class SessionStore:
+    """Interface for conversation storage backends."""
+
+    async def get(self, session_id: str) -> Optional[SessionState]:
+        raise NotImplementedError
+
+    async def save(self, state: SessionState) -> None:
+        """Persist ``state``, including every message appended since it was last saved or loaded."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store with LRU eviction and idle TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._cache: LRUTTLCache[SessionState] = LRUTTLCache(max_entries, ttl_seconds)
+
+    async def get(self, session_id: str) -> Optional[SessionState]:
+        return self._cache.get(session_id)
+
+    async def save(self, state: SessionState) -> None:
+        state.saved_messages = state.total_messages
+        self._cache.set(state.session_id, state)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Durable store that survives restarts; only new messages are written per turn."""
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        session_id TEXT PRIMARY KEY,
+        total_messages INTEGER NOT NULL,
+        stage TEXT NOT NULL,
+        summary TEXT NOT NULL,
+        profile TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS messages (
+        session_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        role TEXT NOT NULL,
+        content TEXT NOT NULL,
+        PRIMARY KEY (session_id, seq)
+    );
+    CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_history: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_history = max_history
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+        self._purge_expired()
+
+    async def get(self, session_id: str) -> Optional[SessionState]:
+        return await asyncio.to_thread(self._get, session_id)
+
+    async def save(self, state: SessionState) -> None:
+        await asyncio.to_thread(self._save, state)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT total_messages, stage, summary, profile, updated_at FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[4] + self._ttl_seconds <= time.time():
+                self._delete(session_id)
+                return None
+            messages = self._conn.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? ORDER BY seq DESC LIMIT ?",
+                (session_id, self._max_history),
+            ).fetchall()
+        return SessionState(
+            session_id=session_id,
+            history=[{"role": role, "content": content} for role, content in reversed(messages)],
+            total_messages=row[0],
+            saved_messages=row[0],
+            stage=StageMachine.from_dict(json.loads(row[1])),
+            summary=RollingSummary.from_dict(json.loads(row[2])),
+            profile=ApplicantProfile.from_dict(json.loads(row[3])),
+        )
+
+    def _save(self, state: SessionState) -> None:
+        # A new session also writes the history it was seeded with.
+        new_messages = min(state.total_messages - state.saved_messages, len(state.history))
+        first_seq = state.total_messages - new_messages
+        appended = state.history[len(state.history) - new_messages :]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET total_messages = excluded.total_messages, "
+                "stage = excluded.stage, summary = excluded.summary, profile = excluded.profile, "
+                "updated_at = excluded.updated_at",
+                (
+                    state.session_id,
+                    state.total_messages,
+                    json.dumps(state.stage.to_dict()),
+                    json.dumps(state.summary.to_dict()),
+                    json.dumps(state.profile.to_dict()),
+                    time.time(),
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?)",
+                [
+                    (state.session_id, first_seq + offset, message["role"], message["content"])
+                    for offset, message in enumerate(appended)
+                ],
+            )
+            self._conn.execute(
+                "DELETE FROM messages WHERE session_id = ? AND seq < ?",
+                (state.session_id, state.total_messages - self._max_history),
+            )
+        state.saved_messages = state.total_messages
+
+    def _delete(self, session_id: str) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+
+    def _purge_expired(self) -> None:
+        cutoff = time.time() - self._ttl_seconds
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM messages WHERE session_id IN "
+                "(SELECT session_id FROM sessions WHERE updated_at < ?)",
+                (cutoff,),
+            )
+            self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (cutoff,))
+
+
+def build_session_store(settings: Settings) -> SessionStore:
+    if settings.session_backend == "sqlite":
+        return SQLiteSessionStore(
+            settings.session_db_path, settings.session_ttl_seconds, settings.session_max_history
+        )
+    return InMemorySessionStore(settings.session_max_entries, settings.session_ttl_seconds)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.data.expansions import QUERY_EXPANSIONS
+from app.data.loan_products import LoanProduct
+
+
+_WORD = re.compile(r"[a-z0-9]+")
+_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z])")
+STOP_WORDS = frozenset(
+    "a about an and are as at be by can for from get have i in into is it its like looking "
+    "me my need new no not of on or our over so than that the their this to up us want we "
+    "what with would you your".split()
+)
+
+
+def _fold(word: str) -> str:
+    """Plural folding: "debts" -> "debt", "studies" -> "study", "businesses" -> "business"."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("sses", "xes", "ches", "shes", "zzes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms without stop words; CamelCase names are split ("HomePlus" -> home, plus)."""
+    words = _WORD.findall(_CAMEL.sub(" ", text).lower())
+    return [_fold(word) for word in words if word not in STOP_WORDS]
+
+
+def _product_terms(product: LoanProduct) -> List[str]:
+    # The name counts twice: it is the most specific text a product has.
+    name = tokenize(product.name)
+    return name + name + tokenize(product.description) + tokenize(" ".join(product.eligibility))
+
+
+@dataclass(frozen=True)
+class ScoredProduct:
+    product: LoanProduct
+    score: float
+
+
+class SimilarityIndex:
+    """TF-IDF vectors of every product's name, description and eligibility.
+
+    The vectors are stored sparsely, one posting list per term (the products
+    using it and their weights) in CSR layout, so memory grows with the
+    catalog's text rather than with vocabulary times products. A message is
+    scored by summing the postings of its few terms. Scores are cosine
+    similarities; products below ``min_score`` are not returned. Terms in
+    more than ``max_df`` of the products ("loan", "year") are left out: they
+    say nothing about which product fits. Message words are first expanded
+    with ``expansions`` onto product vocabulary.
+    """
+
+    def __init__(
+        self,
+        products: Iterable[LoanProduct],
+        min_score: float = 0.25,
+        max_df: float = 0.5,
+        expansions: Mapping[str, Sequence[str]] = QUERY_EXPANSIONS,
+    ) -> None:
+        self.min_score = min_score
+        self._products: List[LoanProduct] = list(products)
+        documents = [Counter(_product_terms(product)) for product in self._products]
+        frequency = Counter(term for document in documents for term in document)
+        count = len(self._products)
+        ubiquitous = max(1.0, max_df * count)
+        terms = sorted(term for term, df in frequency.items() if df <= ubiquitous)
+        self._rows: Dict[str, int] = {term: row for row, term in enumerate(terms)}
+
+        document_frequency = np.array([frequency[term] for term in terms], dtype=np.float64)
+        self._idf = np.log((1 + count) / (1 + document_frequency)) + 1
+        rows, columns, weights = array("l"), array("l"), array("d")
+        for column, document in enumerate(documents):
+            weighted = {
+                self._rows[term]: (1 + math.log(occurrences)) * self._idf[self._rows[term]]
+                for term, occurrences in document.items()
+                if term in self._rows
+            }
+            norm = math.sqrt(sum(weight * weight for weight in weighted.values())) or 1.0
+            for row, weight in weighted.items():
+                rows.append(row)
+                columns.append(column)
+                weights.append(weight / norm)
+
+        # Postings of term ``row`` are ``[indptr[row], indptr[row + 1])``, in catalog order.
+        rows_array = np.asarray(rows, dtype=np.intp)
+        order = np.argsort(rows_array, kind="stable")
+        # A list: a search reads a handful of bounds, and list indexing beats NumPy's scalar indexing.
+        self._indptr: List[int] = [0, *np.cumsum(np.bincount(rows_array, minlength=len(terms))).tolist()]
+        self._columns = np.asarray(columns, dtype=np.int32)[order]
+        self._weights = np.asarray(weights, dtype=np.float32)[order]
+
+        self._expansions: Dict[str, List[str]] = {
+            _fold(word): [_fold(term) for term in targets] for word, targets in expansions.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def search(self, text: str, limit: Optional[int] = 3) -> List[ScoredProduct]:
+        """Products similar to ``text``, best first, ties in catalog order."""
+        weights = self._query_weights(text)
+        if not weights:
+            return []
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        indptr = self._indptr
+        columns = np.concatenate([self._columns[indptr[row] : indptr[row + 1]] for row in weights])
+        contributions = np.concatenate([self._weights[indptr[row] : indptr[row + 1]] for row in weights])
+        contributions *= np.repeat(
+            np.fromiter(weights.values(), dtype=np.float32, count=len(weights)) / norm,
+            [indptr[row + 1] - indptr[row] for row in weights],
+        )
+        scores = np.bincount(columns, weights=contributions, minlength=len(self._products))
+
+        candidates = np.flatnonzero(scores >= self.min_score)
+        if limit is not None and candidates.size > limit:
+            # Only the top ``limit`` need sorting, however large the catalog.
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        ranked = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [ScoredProduct(self._products[index], float(scores[index])) for index in ranked]
+
+    def _query_weights(self, text: str) -> Dict[int, float]:
+        counts: Counter = Counter()
+        for term in tokenize(text):
+            counts[term] += 1
+            for expanded in self._expansions.get(term, ()):
+                counts[expanded] += 1
+        weights: Dict[int, float] = {}
+        for term, occurrences in counts.items():
+            row = self._rows.get(term)
+            if row is not None:
+                weights[row] = (1 + math.log(occurrences)) * self._idf[row]
+        return weights
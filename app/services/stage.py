@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from app.services.matcher import KeywordMatcher, MatchResult
+
+
+INITIAL_GREETING = "initial_greeting"
+RAPPORT_BUILDING = "rapport_building"
+TRANSITIONING = "transitioning"
+LOAN_DISCUSSION = "loan_discussion"
+
+
+@dataclass
+class StageMachine:
+    """Conversation stage tracked incrementally, one message at a time.
+
+    Transitions (evaluated for each new user message):
+
+    - no prior messages -> ``initial_greeting``
+    - loans mentioned now or before -> ``loan_discussion`` (sticky)
+    - up to 2 prior user messages -> ``rapport_building``
+    - up to 4 prior user messages -> ``transitioning``
+    - otherwise -> ``loan_discussion``
+
+    Every update costs O(new message); once loans came up no text is scanned
+    at all. The state is plain data so it can be stored with a session.
+    """
+
+    message_count: int = 0
+    user_message_count: int = 0
+    has_mentioned_loans: bool = False
+    current: str = INITIAL_GREETING
+
+    @classmethod
+    def from_history(cls, history: List[Dict[str, str]], matcher: KeywordMatcher) -> "StageMachine":
+        machine = cls()
+        for entry in history:
+            role = entry.get("role", "user")
+            content = entry.get("content", "")
+            # Once loans came up, neither classify nor observe needs the text.
+            match = None if machine.has_mentioned_loans else matcher.scan(content)
+            if role == "user":
+                machine.advance(match)
+            machine.observe(role, content, matcher, match)
+        return machine
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "StageMachine":
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+    def classify(self, match: Optional[MatchResult]) -> str:
+        """Stage for an incoming user message, given its keyword match.
+
+        ``match`` may be ``None`` once loans have been mentioned.
+        """
+        if self.message_count == 0:
+            return INITIAL_GREETING
+        if self.has_mentioned_loans or (match is not None and match.has("loan")):
+            return LOAN_DISCUSSION
+        if self.user_message_count <= 2:
+            return RAPPORT_BUILDING
+        if self.user_message_count <= 4:
+            return TRANSITIONING
+        return LOAN_DISCUSSION
+
+    def observe(
+        self,
+        role: str,
+        content: str,
+        matcher: KeywordMatcher,
+        match: Optional[MatchResult] = None,
+    ) -> None:
+        """Record a message that is now part of the conversation."""
+        self.message_count += 1
+        if role == "user":
+            self.user_message_count += 1
+        if not self.has_mentioned_loans:
+            self.has_mentioned_loans = (match or matcher.scan(content)).has("loan")
+
+    def advance(self, match: Optional[MatchResult]) -> str:
+        """Classify a new user message and make it the current stage."""
+        self.current = self.classify(match)
+        return self.current
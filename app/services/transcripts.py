@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.config import Settings
+from app.services.metrics import TRANSCRIPT_RECORDS
+from app.services.serialization import dumps
+
+
+@dataclass(frozen=True)
+class TurnRecord:
+    """One answered chat turn, as written to the transcript log."""
+
+    timestamp: float  # Unix time the reply was produced
+    session_id: Optional[str]
+    message: str
+    reply: str
+    stage: str
+    mood: str
+    suggestions: Tuple[str, ...]  # suggested product ids; turns with any are the sales leads
+    source: str
+    latency_ms: float  # from planning the turn to its reply
+
+    def to_dict(self) -> Dict[str, object]:
+        # Spelled out: ``dataclasses.asdict`` deep-copies and was most of the JSONL writer's time.
+        return {
+            "timestamp": self.timestamp,
+            "session_id": self.session_id,
+            "message": self.message,
+            "reply": self.reply,
+            "stage": self.stage,
+            "mood": self.mood,
+            "suggestions": list(self.suggestions),
+            "source": self.source,
+            "latency_ms": self.latency_ms,
+        }
+
+
+def rotate(path: str, backups: int) -> None:
+    """Shift ``path`` to ``path.1``, ``path.1`` to ``path.2`` and so on, keeping ``backups`` files."""
+    if backups <= 0:
+        os.remove(path)
+        return
+    for index in range(backups - 1, 0, -1):
+        older = f"{path}.{index}"
+        if os.path.exists(older):
+            os.replace(older, f"{path}.{index + 1}")
+    os.replace(path, f"{path}.1")
+
+
+class TranscriptSink:
+    """Interface for transcript storage; called from a worker thread, one batch at a time."""
+
+    def write(self, records: Sequence[TurnRecord]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        return None
+
+
+class JSONLSink(TranscriptSink):
+    """Append-only JSON Lines file, rotated once it would grow past ``max_bytes`` (0: never)."""
+
+    def __init__(self, path: str, max_bytes: int = 0, backups: int = 5) -> None:
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._file = open(path, "ab")
+
+    def write(self, records: Sequence[TurnRecord]) -> None:
+        data = b"".join(dumps(record.to_dict()) + b"\n" for record in records)
+        size = self._file.tell()
+        if self._max_bytes and size and size + len(data) > self._max_bytes:
+            self._file.close()
+            rotate(self._path, self._backups)
+            self._file = open(self._path, "ab")
+        self._file.write(data)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SQLiteSink(TranscriptSink):
+    """A ``turns`` table, one transaction per batch; the file is rotated past ``max_bytes``."""
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS turns (
+        timestamp REAL NOT NULL,
+        session_id TEXT,
+        message TEXT NOT NULL,
+        reply TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        mood TEXT NOT NULL,
+        suggestions TEXT NOT NULL,
+        source TEXT NOT NULL,
+        latency_ms REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS turns_session_id ON turns (session_id);
+    """
+
+    def __init__(self, path: str, max_bytes: int = 0, backups: int = 5) -> None:
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, check_same_thread=False)
+        conn.executescript(self._SCHEMA)
+        return conn
+
+    def write(self, records: Sequence[TurnRecord]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO turns VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        record.timestamp,
+                        record.session_id,
+                        record.message,
+                        record.reply,
+                        record.stage,
+                        record.mood,
+                        json.dumps(list(record.suggestions)),
+                        record.source,
+                        record.latency_ms,
+                    )
+                    for record in records
+                ],
+            )
+        if self._max_bytes and os.path.getsize(self._path) > self._max_bytes:
+            self._conn.close()
+            rotate(self._path, self._backups)
+            self._conn = self._connect()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class TranscriptLog:
+    """Records chat turns without making replies wait for the disk.
+
+    :meth:`record` only appends to a bounded in-memory queue. A background
+    task takes up to ``batch_size`` records at a time, as soon as that many
+    are queued or ``flush_interval`` seconds after the first one, and hands
+    them to the sink in a worker thread. When the queue is full the record
+    is dropped, or with ``overflow="spill"`` appended to a buffered side
+    file (``spill_path``) to be merged by hand; requests never wait either
+    way. :meth:`close` writes everything still queued.
+    """
+
+    def __init__(
+        self,
+        sink: TranscriptSink,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        overflow: str = "drop",
+        spill_path: Optional[str] = None,
+    ) -> None:
+        self._sink = sink
+        self._queue: asyncio.Queue[TurnRecord] = asyncio.Queue(max(1, max_queue))
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._spill_path = spill_path if overflow == "spill" else None
+        self._spill_file = None
+        self._wake = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the writer; call from the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def record(self, record: TurnRecord) -> bool:
+        """Queue ``record``; ``False`` if it was dropped or spilled instead."""
+        if not self._closing:
+            try:
+                self._queue.put_nowait(record)
+            except asyncio.QueueFull:
+                pass
+            else:
+                if self._queue.qsize() >= self._batch_size:
+                    self._wake.set()
+                return True
+        self._overflow(record)
+        return False
+
+    async def close(self) -> None:
+        self._closing = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+        else:
+            await self._flush(self._drain(self._queue.qsize()))
+        if self._spill_file is not None:
+            self._spill_file.close()
+        await asyncio.to_thread(self._sink.close)
+
+    async def _run(self) -> None:
+        while True:
+            if self._queue.qsize() < self._batch_size and not self._closing:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self._flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+            batch = self._drain(self._batch_size)
+            if batch:
+                await self._flush(batch)
+            elif self._closing:
+                return
+
+    def _drain(self, limit: int) -> List[TurnRecord]:
+        batch: List[TurnRecord] = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _flush(self, batch: List[TurnRecord]) -> None:
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self._sink.write, batch)
+        except Exception:  # A failing disk must not take the writer down with it.
+            TRANSCRIPT_RECORDS.inc("failed", amount=len(batch))
+        else:
+            TRANSCRIPT_RECORDS.inc("written", amount=len(batch))
+
+    def _overflow(self, record: TurnRecord) -> None:
+        if self._spill_path is None or self._closing:
+            TRANSCRIPT_RECORDS.inc("dropped")
+            return
+        if self._spill_file is None:
+            # A large buffer keeps the event loop's disk writes rare and sequential.
+            self._spill_file = open(self._spill_path, "ab", buffering=1 << 20)
+        self._spill_file.write(dumps(record.to_dict()) + b"\n")
+        TRANSCRIPT_RECORDS.inc("spilled")
+
+
+def build_transcript_log(settings: Settings) -> Optional[TranscriptLog]:
+    if settings.transcript_backend == "jsonl":
+        path = settings.transcript_path or "transcript_log.jsonl"
+        sink: TranscriptSink = JSONLSink(path, settings.transcript_max_bytes, settings.transcript_backups)
+    elif settings.transcript_backend == "sqlite":
+        path = settings.transcript_path or "transcript_log.db"
+        sink = SQLiteSink(path, settings.transcript_max_bytes, settings.transcript_backups)
+    else:
+        return None
+    return TranscriptLog(
+        sink,
+        max_queue=settings.transcript_queue_size,
+        batch_size=settings.transcript_batch_size,
+        flush_interval=settings.transcript_flush_interval,
+        overflow=settings.transcript_overflow,
+        spill_path=f"{path}.spill.jsonl",
+    )
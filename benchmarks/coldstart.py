@@ -0,0 +1,143 @@
+"""Cold start of the app: ``python -m benchmarks.coldstart``.
+
+Each sample is a fresh interpreter that imports ``app.main``, runs the
+lifespan startup and waits for the engine warm-up that ``/ready`` reports.
+It runs once without an OpenAI key (rule-only; the SDK must not be
+imported) and once with a dummy key (the SDK loads during warm-up; no
+request is sent). The command exits with status 1 when a case's median
+time to ready is over ``--budget``, so it can gate CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.common import compare, report_regressions, write_report
+
+
+ROOT = Path(__file__).resolve().parent.parent
+CASES: Dict[str, Dict[str, str]] = {
+    "rule_only": {},
+    "openai_key": {"OPENAI_API_KEY": "sk-coldstart-benchmark"},
+}
+
+# Run in the child; times are from just after interpreter start-up.
+_PROBE = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def main():
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+        await app.state.warm_up
+        return started, time.perf_counter()
+
+started, ready = asyncio.run(main())
+print(json.dumps({
+    "import_ms": (imported - start) * 1e3,
+    "startup_ms": (started - imported) * 1e3,
+    "ready_ms": (ready - start) * 1e3,
+    "openai_at_serving": "openai" in sys.modules,
+}))
+"""
+
+
+def _environment(extra: Dict[str, str]) -> Dict[str, str]:
+    env = {key: value for key, value in os.environ.items() if not key.startswith("OPENAI_")}
+    env.update(extra)
+    env["METRICS_ENABLED"] = "false"
+    return env
+
+
+def sample(extra_env: Dict[str, str]) -> Dict[str, float]:
+    """One cold start in a new interpreter; ``process_ms`` includes interpreter start-up."""
+    began = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=ROOT,
+        env=_environment(extra_env),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - began) * 1e3
+    return result
+
+
+def slowest_imports(count: int = 10) -> List[str]:
+    """The modules with the largest cumulative import time under ``app.main``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT,
+        env=_environment({}),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].strip()))
+    rows.sort(reverse=True)
+    return [f"{cumulative / 1e3:8.1f} ms  {name}" for cumulative, name in rows[:count]]
+
+
+def run(repeat: int) -> Dict[str, Dict[str, float]]:
+    sample({})  # Untimed: compiles bytecode so every timed run starts the same way.
+    results: Dict[str, Dict[str, float]] = {}
+    for case, extra_env in CASES.items():
+        samples = [sample(extra_env) for _ in range(repeat)]
+        if case == "rule_only" and any(s["openai_at_serving"] for s in samples):
+            raise SystemExit("The OpenAI SDK was imported without an API key")
+        results[case] = {
+            metric: round(sorted(s[metric] for s in samples)[len(samples) // 2], 1)
+            for metric in ("import_ms", "startup_ms", "ready_ms", "process_ms")
+        }
+        summary = "  ".join(f"{metric} {value:8.1f}" for metric, value in results[case].items())
+        print(f"{case:12s} {summary}")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.coldstart", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per case")
+    parser.add_argument("--budget", type=float, default=1500.0, help="Median milliseconds to ready allowed per case")
+    parser.add_argument("--imports", action="store_true", help="Also list the slowest imports under app.main")
+    parser.add_argument("-o", "--output", help="JSON report path (default benchmarks/results/)")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    if args.imports:
+        print("Slowest imports (cumulative):")
+        for line in slowest_imports():
+            print(f"  {line}")
+    path = write_report("coldstart", results, args.output, repeat=args.repeat, budget_ms=args.budget)
+    print(f"Saved {path}")
+
+    status = 0
+    over = {case: metrics["ready_ms"] for case, metrics in results.items() if metrics["ready_ms"] > args.budget}
+    for case, ready_ms in over.items():
+        print(f"{case}: ready after {ready_ms:.1f} ms, over the {args.budget:g} ms budget")
+        status = 1
+    if args.baseline:
+        status = max(status, report_regressions(compare(results, args.baseline, args.threshold)))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
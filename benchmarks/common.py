@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Metrics where a larger value is an improvement; every other metric is a cost.
+HIGHER_IS_BETTER = {"throughput_rps"}
+
+
+def environment() -> Dict[str, str]:
+    """Where a run happened, so results from different machines are not compared blindly."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def time_call(fn: Callable[[], object], min_time: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+    """Per-call time of ``fn`` in microseconds, timeit-style.
+
+    The loop count is calibrated so one batch takes about ``min_time``; the
+    batch is repeated ``repeat`` times and the median and best are reported.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10 or number >= 1_000_000:
+            break
+        number *= 10
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    samples.sort()
+    return {"median_us": round(samples[len(samples) // 2], 3), "min_us": round(samples[0], 3), "loops": number}
+
+
+def write_report(name: str, results: Dict[str, Dict[str, float]], output: Optional[str], **extra: object) -> Path:
+    """Save a run as JSON; by default under ``benchmarks/results/<name>-<timestamp>.json``."""
+    report = {"benchmark": name, "environment": environment(), **extra, "results": results}
+    if output:
+        path = Path(output)
+    else:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = RESULTS_DIR / f"{name}-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline_path: str, threshold: float
+) -> List[str]:
+    """Regressions against a saved report: metrics more than ``threshold`` (a fraction) worse."""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))["results"]
+    regressions: List[str] = []
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            before = baseline.get(case, {}).get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(before, (int, float)) or before <= 0:
+                continue
+            if metric == "loops" or metric.endswith("_count"):
+                continue
+            change = (value - before) / before
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > threshold:
+                regressions.append(f"{case} {metric}: {before:g} -> {value:g} ({change:+.1%})")
+    return regressions
+
+
+def report_regressions(regressions: List[str]) -> int:
+    """Print regressions and return the process exit code for them."""
+    if not regressions:
+        print("No regressions against the baseline.")
+        return 0
+    print("Regressions against the baseline:")
+    for line in regressions:
+        print(f"  {line}")
+    return 1
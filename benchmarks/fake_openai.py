@@ -0,0 +1,136 @@
+"""A local OpenAI-compatible chat completions server with configurable latency.
+
+Used by the load test; it can also run on its own for manual testing::
+
+    python -m benchmarks.fake_openai --port 8001 --latency 0.3
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8001/v1 uvicorn app.main:app
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from typing import AsyncIterator, Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+REPLY = (
+    "That sounds like a great plan, and I'm glad you reached out. Based on what you shared, "
+    "the option above is worth a closer look. What matters most to you right now?"
+)
+
+
+def create_app(latency: float = 0.2, jitter: float = 0.0, seed: int = 0) -> FastAPI:
+    """Fake server answering every completion with :data:`REPLY` after ``latency`` ± ``jitter`` seconds."""
+    app = FastAPI()
+    rng = random.Random(seed)
+    app.state.calls = 0
+
+    def delay() -> float:
+        return max(0.0, latency + rng.uniform(-jitter, jitter))
+
+    @app.post("/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+        prompt_tokens = sum(len(str(message.get("content", "")).split()) for message in body.get("messages", []))
+        if body.get("stream"):
+            return StreamingResponse(_stream(body, delay()), media_type="text/event-stream")
+        await asyncio.sleep(delay())
+        return JSONResponse(
+            {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": REPLY}}
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(REPLY.split()),
+                    "total_tokens": prompt_tokens + len(REPLY.split()),
+                },
+            }
+        )
+
+    return app
+
+
+async def _stream(body: Dict[str, object], latency: float) -> AsyncIterator[bytes]:
+    # The first token arrives after the latency; the rest follow quickly.
+    await asyncio.sleep(latency)
+    words = REPLY.split(" ")
+    for index, word in enumerate(words):
+        chunk = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "delta": {"content": word if index == 0 else " " + word}, "finish_reason": None}],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+        await asyncio.sleep(0.002)
+    yield b"data: [DONE]\n\n"
+
+
+class FakeOpenAIServer:
+    """Runs the fake server on a free local port in a background thread.
+
+    It gets its own event loop so its work does not skew the load generator.
+    """
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.0, port: Optional[int] = None) -> None:
+        self.app = create_app(latency, jitter)
+        self.port = port or _free_port()
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    @property
+    def calls(self) -> int:
+        return self.app.state.calls
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("fake OpenAI server did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fake_openai", description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before each reply")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform ± jitter on the latency")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency, args.jitter), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Phrase rewriting: ``python -m benchmarks.humanize``.
+
+Compares the single-pass :class:`PhraseRewriter` with the previous chain of
+``str.replace`` calls, on whole replies of several sizes and streamed in
+small chunks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Dict, List, Optional
+
+from app.data.rewrites import REWRITE_RULES
+from app.services.humanize import StreamingHumanizer, humanize
+from benchmarks.common import compare, report_regressions, time_call, write_report
+
+
+_REPLY = (
+    "I understand that this is a big decision, and I am glad you asked. It is worth comparing "
+    "the options: you are looking at a fixed rate, and that is usually easier to plan around. "
+    "I would like to be clear that we cannot promise approval and will not pull your credit "
+    "without asking, so do not worry about that yet. "
+)
+REPLY_SIZES = {"short": 1, "medium": 4, "long": 16}
+CHUNK_CHARS = 6
+
+
+def legacy_humanize(text: str) -> str:
+    """The replace chain ``humanize`` used before the single-pass rewriter."""
+    for formal, casual in REWRITE_RULES:
+        text = text.replace(formal, casual)
+    return text
+
+
+class LegacyStreamingHumanizer:
+    """The chunked humanizer built on :func:`legacy_humanize`, for comparison."""
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._started = False
+        self._hold = max(len(formal) for formal, _ in REWRITE_RULES) - 1
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        cut = self._safe_cut()
+        if cut <= 0:
+            return ""
+        segment = self._buffer[:cut]
+        stripped = segment.rstrip()
+        self._buffer = segment[len(stripped):] + self._buffer[cut:]
+        return self._emit(legacy_humanize(stripped))
+
+    def flush(self) -> str:
+        text, self._buffer = self._buffer, ""
+        return self._emit(legacy_humanize(text).rstrip())
+
+    def _safe_cut(self) -> int:
+        cut = len(self._buffer) - self._hold
+        if cut <= 0:
+            return 0
+        moved = True
+        while moved:
+            moved = False
+            for formal, _ in REWRITE_RULES:
+                start = self._buffer.find(formal, max(0, cut - len(formal) + 1))
+                if 0 <= start < cut < start + len(formal):
+                    cut = start + len(formal)
+                    moved = True
+        return cut
+
+    def _emit(self, text: str) -> str:
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
+
+
+def stream_in_chunks(text: str, humanizer_class: type = StreamingHumanizer) -> str:
+    humanizer = humanizer_class()
+    parts: List[str] = [
+        humanizer.feed(text[index:index + CHUNK_CHARS]) for index in range(0, len(text), CHUNK_CHARS)
+    ]
+    parts.append(humanizer.flush())
+    return "".join(parts)
+
+
+def run(min_time: float, repeat: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for label, copies in REPLY_SIZES.items():
+        reply = _REPLY * copies
+        cases = {
+            f"legacy_replace[{label}]": lambda: legacy_humanize(reply),
+            f"rewriter[{label}]": lambda: humanize(reply),
+            f"legacy_stream[{label}]": lambda: stream_in_chunks(reply, LegacyStreamingHumanizer),
+            f"rewriter_stream[{label}]": lambda: stream_in_chunks(reply),
+        }
+        for name, fn in cases.items():
+            results[name] = time_call(fn, min_time, repeat)
+            print(f"{name:28s} {len(reply):5d} chars {results[name]['median_us']:10.2f} us")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.humanize", description=__doc__.splitlines()[0])
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timed batch")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed batches per case")
+    parser.add_argument("-o", "--output", help="JSON report path (default benchmarks/results/)")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.min_time, args.repeat)
+    path = write_report("humanize", results, args.output, chunk_chars=CHUNK_CHARS)
+    print(f"Saved {path}")
+    if args.baseline:
+        return report_regressions(compare(results, args.baseline, args.threshold))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
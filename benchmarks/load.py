@@ -0,0 +1,108 @@
+"""Load test of ``POST /api/chat/respond``: ``python -m benchmarks.load``.
+
+The app runs in-process (driven through ``httpx.ASGITransport``) and talks to
+a local fake OpenAI server with configurable latency, so the numbers measure
+this service rather than the provider. Throughput and latency percentiles
+are printed and saved as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import compare, percentile, report_regressions, write_report
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.micro import make_history, make_message
+
+
+async def _drive(requests: int, concurrency: int, history_size: int, seed: int) -> Dict[str, object]:
+    # Imported here so the environment set up by main() is what the app reads.
+    from app.main import app
+
+    rng = random.Random(seed)
+    payloads = [
+        {"message": make_message(rng, rng.randint(4, 30))[:500], "history": make_history(rng, history_size)}
+        for _ in range(requests)
+    ]
+    latencies: List[float] = []
+    sources: Counter = Counter()
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with app.router.lifespan_context(app):
+        await app.state.warm_up  # What /ready waits for.
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+
+            async def one(payload: Dict[str, object]) -> None:
+                nonlocal errors
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.post("/api/chat/respond", json=payload)
+                    latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+                    return
+                sources[response.json().get("source")] += 1
+
+            # One warm-up request so connection setup is not in the measurements.
+            await client.post("/api/chat/respond", json=payloads[0])
+            started = time.perf_counter()
+            await asyncio.gather(*(one(payload) for payload in payloads))
+            elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "throughput_rps": round(requests / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "errors_count": errors,
+        "sources": dict(sources),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--requests", type=int, default=500)
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake OpenAI latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Uniform ± jitter on the latency")
+    parser.add_argument("--history", type=int, default=6, help="Messages of history sent with each request")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("-o", "--output", help="JSON report path (default benchmarks/results/)")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    with FakeOpenAIServer(latency=args.latency, jitter=args.jitter) as server:
+        os.environ["OPENAI_API_KEY"] = "fake-key"
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        result = asyncio.run(_drive(args.requests, args.concurrency, args.history, args.seed))
+        result["llm_calls_count"] = server.calls
+
+    case = f"respond[c={args.concurrency},latency={args.latency * 1000:g}ms,history={args.history}]"
+    results = {case: result}
+    print(case)
+    for metric, value in result.items():
+        print(f"  {metric:16s} {value}")
+    path = write_report("load", results, args.output, requests=args.requests, seed=args.seed)
+    print(f"Saved {path}")
+    if args.baseline:
+        return report_regressions(compare(results, args.baseline, args.threshold))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Micro-benchmarks of the rule-based chat path: ``python -m benchmarks.micro``.
+
+Each ``ConversationEngine`` step is timed across message lengths and history
+sizes with seeded inputs, so runs on the same machine are comparable. The
+similarity index is also searched over synthetic catalogs of growing size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from typing import Callable, Dict, List, Optional
+
+from app.data.catalog import DEFAULT_CATALOG
+from app.data.loan_products import LoanProduct
+from app.services.conversation import ConversationEngine
+from app.services.similarity import SimilarityIndex
+from benchmarks.common import compare, report_regressions, time_call, write_report
+
+
+_FILLER = (
+    "i am thinking about what to do next and would like to understand my options before "
+    "deciding because my situation changed a little this year and the timing matters"
+).split()
+_TOPICAL = [
+    "loan", "mortgage", "house", "car", "business", "tuition", "debt", "rate", "monthly",
+    "payment", "stressed", "excited", "quickly", "$25k", "60 months", "credit cards",
+]
+_REPLY = (
+    "I would be happy to help you with that. It is important that you do not rush, and "
+    "I cannot promise approval, but you are looking at a solid option. Let us compare "
+    "the rates and terms together so you will feel confident about the next step."
+)
+
+MESSAGE_WORDS = {"short": 6, "medium": 40, "long": 90}
+HISTORY_SIZES = (0, 10, 50, 200)
+CATALOG_SIZES = (5, 1_000, 20_000)
+
+
+def make_message(rng: random.Random, words: int) -> str:
+    picks = [rng.choice(_TOPICAL) if rng.random() < 0.25 else rng.choice(_FILLER) for _ in range(words)]
+    return " ".join(picks).capitalize() + "?"
+
+
+def make_history(rng: random.Random, size: int) -> List[Dict[str, str]]:
+    history = []
+    for index in range(size):
+        role = "user" if index % 2 == 0 else "assistant"
+        content = make_message(rng, 20) if role == "user" else _REPLY
+        history.append({"role": role, "content": content})
+    return history
+
+
+def make_products(rng: random.Random, size: int) -> List[LoanProduct]:
+    """The real catalog, padded with products described in shuffled catalog vocabulary."""
+    products = list(DEFAULT_CATALOG)
+    words = " ".join(f"{p.name} {p.description} {' '.join(p.eligibility)}" for p in products).split()
+    words += [f"term{index}" for index in range(3000)]
+    for index in range(size - len(products)):
+        products.append(
+            LoanProduct(
+                id=f"synthetic_{index}",
+                name=" ".join(rng.sample(words, 2)),
+                description=" ".join(rng.choices(words, k=14)),
+                min_amount=1000,
+                max_amount=100000,
+                interest_rate=5.0,
+                term_months=[36],
+                eligibility=[" ".join(rng.choices(words, k=4)) for _ in range(3)],
+            )
+        )
+    return products
+
+
+def run(min_time: float, repeat: int) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(1234)
+    engine = ConversationEngine()
+    cases: Dict[str, Callable[[], object]] = {}
+
+    for label, words in MESSAGE_WORDS.items():
+        message = make_message(rng, words)
+        cases[f"suggest_products[{label}]"] = lambda m=message: engine.suggest_products(m)
+        cases[f"detect_emotion[{label}]"] = lambda m=message: engine._detect_emotion(m)
+        reply = " ".join([_REPLY] * max(1, words // 20))
+        cases[f"humanize_response[{label}]"] = lambda r=reply: engine._humanize_response(r)
+
+    message = make_message(rng, MESSAGE_WORDS["medium"])
+    suggestions = engine.suggest_products("home car business loan")
+    for size in HISTORY_SIZES:
+        history = make_history(rng, size)
+        cases[f"conversation_stage[history={size}]"] = (
+            lambda h=history: engine._get_conversation_stage(h, message)
+        )
+        stage = engine._get_conversation_stage(history, message)
+        mood = engine._detect_emotion(message)
+        cases[f"fallback_response[history={size}]"] = (
+            lambda h=history, s=stage: engine._fallback_response(message, suggestions, s, h, mood)
+        )
+
+    query = "I want to renovate my kitchen and pay off two credit cards"
+    for size in CATALOG_SIZES:
+        index = SimilarityIndex(make_products(rng, size))
+        cases[f"similarity_search[products={size}]"] = lambda i=index: i.search(query)
+
+    results = {}
+    for name, fn in cases.items():
+        results[name] = time_call(fn, min_time=min_time, repeat=repeat)
+        print(f"{name:45s} {results[name]['median_us']:10.2f} us")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.micro", description=__doc__.splitlines()[0])
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timed batch")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed batches per case")
+    parser.add_argument("-o", "--output", help="JSON report path (default benchmarks/results/)")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.min_time, args.repeat)
+    path = write_report("micro", results, args.output, min_time=args.min_time, repeat=args.repeat)
+    print(f"Saved {path}")
+    if args.baseline:
+        return report_regressions(compare(results, args.baseline, args.threshold))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
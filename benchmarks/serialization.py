@@ -0,0 +1,91 @@
+"""Chat reply serialization: ``python -m benchmarks.serialization``.
+
+Compares the previous ``/api/chat/respond`` path (``ChatResponse`` built
+from suggestion dicts, re-validated against ``response_model`` and encoded
+with the stdlib) with :class:`SplicedJSONResponse` splicing the catalog's
+cached product fragments, for replies with 0 to 3 suggestions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.models.chat import ChatResponse
+from app.services.conversation import ConversationEngine
+from app.services.serialization import SplicedJSONResponse, orjson
+from benchmarks.common import compare, report_regressions, time_call, write_report
+
+
+SUGGESTION_COUNTS = (0, 1, 3)
+_SESSION_ID = "0123456789abcdef0123456789abcdef"
+_REPLY = (
+    "Perfect! I'd love to help you find financing that actually fits your situation. "
+    "Here are a few options that might work for you — let me know which one feels right. "
+) * 3
+
+_ADAPTER = TypeAdapter(ChatResponse)
+
+
+def validated_body(result: Dict[str, object]) -> bytes:
+    """What FastAPI did per reply for ``return ChatResponse(...)`` with ``response_model``."""
+    model = ChatResponse(**result, session_id=_SESSION_ID)
+    content = _ADAPTER.dump_python(_ADAPTER.validate_python(model.model_dump()), mode="json")
+    return JSONResponse(content).body
+
+
+def spliced_body(engine: ConversationEngine, result: Dict[str, object]) -> bytes:
+    return SplicedJSONResponse(
+        {
+            "reply": result["reply"],
+            "suggestions": engine.suggestions_json(result["suggestions"]),
+            "source": result["source"],
+            "session_id": _SESSION_ID,
+        }
+    ).body
+
+
+def run(min_time: float, repeat: int) -> Dict[str, Dict[str, float]]:
+    engine = ConversationEngine()
+    products = engine.available_products()
+    results: Dict[str, Dict[str, float]] = {}
+    for count in SUGGESTION_COUNTS:
+        result = {"reply": _REPLY, "suggestions": products[:count], "source": "llm"}
+        if json.loads(validated_body(result)) != json.loads(spliced_body(engine, result)):
+            raise SystemExit(f"Bodies differ with {count} suggestions")
+        cases = {
+            f"validated[suggestions={count}]": lambda r=result: validated_body(r),
+            f"spliced[suggestions={count}]": lambda r=result: spliced_body(engine, r),
+        }
+        for name, fn in cases.items():
+            results[name] = time_call(fn, min_time, repeat)
+            print(f"{name:28s} {results[name]['median_us']:10.2f} us")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.serialization", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timed batch")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed batches per case")
+    parser.add_argument("-o", "--output", help="JSON report path (default benchmarks/results/)")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.min_time, args.repeat)
+    path = write_report("serialization", results, args.output, orjson=orjson is not None)
+    print(f"Saved {path}")
+    if args.baseline:
+        return report_regressions(compare(results, args.baseline, args.threshold))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
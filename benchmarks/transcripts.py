@@ -0,0 +1,100 @@
+"""Transcript logging cost per chat turn: ``python -m benchmarks.transcripts``.
+
+Compares what a reply would wait for if each turn were written where it is
+answered (a JSONL append and flush, or a SQLite insert and commit) with
+:meth:`TranscriptLog.record`, which only queues the turn. Sustained writer
+throughput per backend is measured separately by queueing ``--records``
+turns and timing until :meth:`TranscriptLog.close` has written them all.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.services.transcripts import JSONLSink, SQLiteSink, TranscriptLog, TranscriptSink, TurnRecord
+from benchmarks.common import compare, report_regressions, time_call, write_report
+
+
+_RECORD = TurnRecord(
+    timestamp=1_700_000_000.0,
+    session_id="0123456789abcdef0123456789abcdef",
+    message="I need a car loan of $20,000 over 48 months",
+    reply="Perfect! I'd love to help you find financing that actually fits your situation. " * 6,
+    stage="loan_discussion",
+    mood="neutral",
+    suggestions=("auto_express",),
+    source="llm",
+    latency_ms=412.5,
+)
+
+SINKS: Dict[str, Callable[[str], TranscriptSink]] = {
+    "jsonl": lambda directory: JSONLSink(os.path.join(directory, "bench.jsonl")),
+    "sqlite": lambda directory: SQLiteSink(os.path.join(directory, "bench.db")),
+}
+
+
+def per_turn(directory: str, min_time: float, repeat: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for name, make_sink in SINKS.items():
+        sink = make_sink(directory)
+        results[f"sync_{name}"] = time_call(lambda: sink.write([_RECORD]), min_time, repeat)
+        sink.close()
+
+    # No writer runs here, so the queue is sized to hold every call of the timed batches.
+    log = TranscriptLog(SINKS["jsonl"](directory), max_queue=20_000_000)
+    results["enqueue"] = time_call(lambda: log.record(_RECORD), min_time, repeat)
+    return results
+
+
+async def _sustained(sink: TranscriptSink, records: int, batch_size: int) -> float:
+    log = TranscriptLog(sink, max_queue=records, batch_size=batch_size)
+    log.start()
+    start = time.perf_counter()
+    for _ in range(records):
+        log.record(_RECORD)
+    await log.close()
+    return time.perf_counter() - start
+
+
+def throughput(directory: str, records: int, batch_size: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for name, make_sink in SINKS.items():
+        elapsed = asyncio.run(_sustained(make_sink(directory), records, batch_size))
+        results[f"writer_{name}[batch={batch_size}]"] = {"throughput_rps": round(records / elapsed, 1)}
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.transcripts", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timed batch")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed batches per case")
+    parser.add_argument("--records", type=int, default=50_000, help="Turns written in the throughput cases")
+    parser.add_argument("--batch-size", type=int, default=200, help="Writer batch size in the throughput cases")
+    parser.add_argument("-o", "--output", help="JSON report path (default benchmarks/results/)")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = per_turn(directory, args.min_time, args.repeat)
+        results.update(throughput(directory, args.records, args.batch_size))
+    for name, metrics in results.items():
+        value = metrics.get("median_us")
+        print(f"{name:28s} " + (f"{value:10.2f} us" if value is not None else f"{metrics['throughput_rps']:10.1f} records/s"))
+    path = write_report("transcripts", results, args.output, records=args.records, batch_size=args.batch_size)
+    print(f"Saved {path}")
+    if args.baseline:
+        return report_regressions(compare(results, args.baseline, args.threshold))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,38 @@ import { motion, AnimatePresence } from 'framer-motion';
 import Typewriter from './Typewriter';
 import Magnetic from './Magnetic';
 
+// Parses the server-sent events of /api/chat/stream as they arrive.
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            block.split('\n').forEach((line) => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+}
+
 export default function ChatStage() {
     const [messages, setMessages] = useState([]);
     const [input, setInput] = useState('');
     const [isTyping, setIsTyping] = useState(false);
+    const sessionIdRef = useRef(null);
     const chatEndRef = useRef(null);
 
     const scrollToBottom = () => {
@@ -40,23 +68,39 @@ export default function ChatStage() {
 
         // Simulate API call
         try {
-            const response = await fetch("http://localhost:8000/api/chat/respond", {
+            const response = await fetch("http://localhost:8000/api/chat/stream", {
                 method: "POST",
                 headers: { "Content-Type": "application/json" },
-                body: JSON.stringify({
-                    message: input,
-                    history: messages.slice(-8)
-                }),
+                // Once the server holds the session only the new message is sent.
+                body: JSON.stringify(sessionIdRef.current
+                    ? { message: input, session_id: sessionIdRef.current }
+                    : { message: input, history: messages.slice(-8).map(({ role, content }) => ({ role, content })) }
+                ),
             });
 
-            if (!response.ok) throw new Error("Failed to fetch");
+            if (!response.ok || !response.body) throw new Error("Failed to fetch");
 
-            const data = await response.json();
+            // Tokens are appended to a single assistant message as they arrive.
+            let started = false;
+            await readEventStream(response, (event, data) => {
+                if (event === 'done') {
+                    sessionIdRef.current = data.session_id || sessionIdRef.current;
+                    return;
+                }
+                if (event !== 'token') return;
+                if (!started) {
+                    started = true;
+                    setIsTyping(false);
+                    setMessages(prev => [...prev, { role: 'assistant', content: data, streamed: true }]);
+                    return;
+                }
+                setMessages(prev => {
+                    const last = prev[prev.length - 1];
+                    return [...prev.slice(0, -1), { ...last, content: last.content + data }];
+                });
+            });
 
-            setTimeout(() => {
-                setIsTyping(false);
-                setMessages(prev => [...prev, { role: 'assistant', content: data.reply }]);
-            }, 500);
+            if (!started) throw new Error("Empty reply");
         } catch (error) {
             // Enhanced humanized AI responses with personality
             setTimeout(() => {
@@ -175,7 +219,7 @@ export default function ChatStage() {
                             transition={{ type: "spring", stiffness: 300, damping: 24 }}
                             className={`message ${msg.role === 'assistant' ? 'bot' : 'user'}`}
                         >
-                            {msg.role === 'assistant' ? (
+                            {msg.role === 'assistant' && !msg.streamed ? (
                                 <Typewriter text={msg.content} />
                             ) : (
                                 msg.content
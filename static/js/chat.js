@@ -15,6 +15,7 @@ const starterPills = conversationStartersSection
 const contextChips = Array.from(document.querySelectorAll(".context-chip"));
 
 const conversationHistory = [];
+let sessionId = null;
 let messageIndex = 0;
 let typingIndicator = null;
 
@@ -110,6 +111,35 @@ function appendMessage(role, content, animate = true) {
 
   chatWindow.appendChild(message);
   scrollToBottom();
+  return message;
+}
+
+/* --- Streaming --- */
+// Parses the server-sent events of /api/chat/stream as they arrive.
+async function readEventStream(response, onEvent) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = "message";
+      let data = "";
+      block.split("\n").forEach((line) => {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      });
+      if (data) onEvent(event, JSON.parse(data));
+    }
+  }
 }
 
 function typeText(element, text, speed = 15) {
@@ -159,30 +189,44 @@ async function sendMessage(event, presetMessage = null) {
 
   typingIndicator = createTypingIndicator();
 
-  const payload = {
-    message,
-    history: conversationHistory.slice(-8),
-  };
+  // Once the server holds the session only the new message is sent.
+  const payload = sessionId
+    ? { message, session_id: sessionId }
+    : { message, history: conversationHistory.slice(-9, -1) };
 
   try {
-    const response = await fetch("/api/chat/respond", {
+    const response = await fetch("/api/chat/stream", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify(payload),
     });
 
-    if (!response.ok) {
+    if (!response.ok || !response.body) {
       throw new Error("Failed to reach Astra");
     }
 
-    const data = await response.json();
-
-    removeTypingIndicator();
+    let botMessage = null;
+    let reply = "";
+
+    await readEventStream(response, (event, data) => {
+      if (event === "token") {
+        if (!botMessage) {
+          removeTypingIndicator();
+          botMessage = appendMessage("assistant", "", false);
+        }
+        reply += data;
+        botMessage.textContent = reply;
+        scrollToBottom();
+      } else if (event === "done") {
+        reply = data.reply;
+        sessionId = data.session_id || sessionId;
+      }
+    });
 
-    setTimeout(() => {
-      appendMessage("assistant", data.reply, true);
-      conversationHistory.push({ role: "assistant", content: data.reply });
-    }, 200);
+    if (!botMessage) {
+      throw new Error("Empty reply from Astra");
+    }
+    conversationHistory.push({ role: "assistant", content: reply });
   } catch (error) {
     removeTypingIndicator();
     setTimeout(() => {
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from app.batch import _read_requests
+from app.main import app
+from app.models.chat import MAX_BATCH_REQUESTS
+
+
+def test_batch_rejects_blank_messages(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with TestClient(app) as client:
+        response = client.post("/api/chat/batch", json={"requests": [{"message": "hi"}, {"message": "   "}]})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Message cannot be empty (request 1)"
+
+
+def test_batch_size_is_bounded_while_parsing(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    requests = [{"message": "hi"}] * (MAX_BATCH_REQUESTS + 1)
+    with TestClient(app) as client:
+        response = client.post("/api/chat/batch", json={"requests": requests})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+
+
+def test_cli_reports_blank_messages_by_line() -> None:
+    source = io.StringIO('{"message": "hi"}\n\n{"message": "   "}\n{"message": "I need a car loan"}\n')
+    out = io.StringIO()
+    line_numbers, requests = _read_requests(source, out)
+    assert line_numbers == [1, 4]
+    assert [request.message for request in requests] == ["hi", "I need a car loan"]
+    assert json.loads(out.getvalue()) == {"line": 3, "error": "Message cannot be empty"}
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+
+import pytest
+
+from app.data.catalog import DEFAULT_CATALOG, ProductCatalog
+
+
+def _catalog(count: int) -> ProductCatalog:
+    rng = random.Random(7)
+    return ProductCatalog(
+        replace(product, id=f"{product.id}_{copy}", interest_rate=round(rng.uniform(3, 12), 2))
+        for copy in range(count)
+        for product in DEFAULT_CATALOG
+    )
+
+
+@pytest.mark.parametrize(
+    "amount, term_months, max_rate, limit",
+    [
+        (45000, 60, None, 3),
+        (45000, 60, None, None),
+        (700000, None, None, 3),
+        (None, 144, 5.0, 3),
+        (None, None, 4.0, 10),
+        (20000, None, 6.0, None),
+        (1, 7, None, 3),
+    ],
+)
+def test_query_matches_a_full_scan(amount, term_months, max_rate, limit) -> None:
+    catalog = _catalog(400)
+    expected = [
+        product
+        for product in sorted(catalog, key=lambda p: p.interest_rate)
+        if (max_rate is None or product.interest_rate <= max_rate)
+        and (amount is None or product.min_amount <= amount <= product.max_amount)
+        and (term_months is None or term_months in product.term_months)
+    ][:limit]
+    assert catalog.query(amount=amount, term_months=term_months, max_rate=max_rate, limit=limit) == expected
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def test_binary_frames_are_rejected_without_dropping_the_connection(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with TestClient(app) as client, client.websocket_connect("/api/chat/ws") as socket:
+        assert socket.receive_json()["event"] == "session"
+        socket.send_bytes(b"\x00\x01")
+        assert socket.receive_json() == {"event": "error", "data": {"detail": "Only text frames are accepted"}}
+        socket.send_json({"message": "hi"})
+        events = [socket.receive_json()["event"]]
+        while events[-1] != "done":
+            events.append(socket.receive_json()["event"])
+        assert events[0] == "suggestions"
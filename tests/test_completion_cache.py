@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from app.services.cache import CompletionCache
+from app.services.context import ContextBuilder
+from app.services.conversation import ConversationEngine
+
+
+def _key(engine: ConversationEngine, cache: CompletionCache, message: str, history: list) -> object:
+    session = engine.new_session("s" * 32, history)
+    plan = engine.plan_turn(message, session.history, session)
+    return cache.key(plan.stage, engine._render_prompt(plan).messages)
+
+
+def test_sessions_sharing_a_recent_tail_do_not_share_a_reply() -> None:
+    engine = ConversationEngine(context_builder=ContextBuilder(max_messages=2))
+    cache = CompletionCache(16, 60.0, frozenset({"*"}))
+    tail = [
+        {"role": "user", "content": "Which one would you pick?"},
+        {"role": "assistant", "content": "It depends on your plans."},
+    ] * 5  # The ten most recent messages, all that the old key looked at.
+    renovating = [
+        {"role": "user", "content": "I want to renovate my kitchen"},
+        {"role": "assistant", "content": "Let's look at home options."},
+    ]
+    studying = [
+        {"role": "user", "content": "I need to pay tuition for my master's degree"},
+        {"role": "assistant", "content": "Let's look at education options."},
+    ]
+    message = "Tell me about the loan options"
+
+    assert _key(engine, cache, message, renovating + tail) != _key(engine, cache, message, studying + tail)
+    assert _key(engine, cache, message, renovating + tail) == _key(engine, cache, message + "!", renovating + tail)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from app.services.context import ContextBuilder, RollingSummary
+
+
+def _history(turns: int):
+    history = []
+    for turn in range(turns):
+        history.append({"role": "user", "content": f"Question {turn}: what about option number {turn}?"})
+        history.append({"role": "assistant", "content": f"Answer {turn} covers option number {turn} in detail."})
+    return history
+
+
+def test_summarized_messages_are_not_resent_when_the_budget_grows() -> None:
+    builder = ContextBuilder(max_messages=10, summary_tokens=60)
+    summary = RollingSummary()
+    history = _history(3)
+
+    first = builder.build(history, 90, summary)
+    assert summary.covered >= 2 and "Question 0" in first.summary
+
+    history.append({"role": "user", "content": "And the next step?"})
+    second = builder.build(history, 3000, summary)
+    assert second.messages == history[summary.covered:]
+    assert not any("Question 0" in msg["content"] for msg in second.messages)
+    assert "Question 0" in second.summary
+
+
+def test_floor_follows_the_offset_of_a_trimmed_history() -> None:
+    builder = ContextBuilder(max_messages=10, summary_tokens=60)
+    summary = RollingSummary(covered=4, lines=["- Customer: earlier"], text="- Customer: earlier")
+    history = _history(3)  # absolute indexes 2..7
+    window = builder.build(history, 3000, summary, offset=2)
+    assert window.messages == history[2:]
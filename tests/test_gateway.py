@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.gateway import LLMGateway
+from app.services.resilience import hedge
+
+
+def _gateway(max_in_flight: int = 2) -> LLMGateway:
+    return LLMGateway(max_in_flight=max_in_flight, max_queue=8, queue_timeout=5.0, max_per_session=4)
+
+
+async def _slow(started: list, cancelled: list, seconds: float = 3.0) -> str:
+    started.append(1)
+    try:
+        await asyncio.sleep(seconds)
+    except asyncio.CancelledError:
+        cancelled.append(1)
+        raise
+    return "late"
+
+
+def test_cancelled_caller_releases_its_slot() -> None:
+    async def scenario() -> None:
+        gateway = _gateway(max_in_flight=1)
+        started, cancelled = [], []
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(gateway.call(None, "a", lambda: _slow(started, cancelled)), 0.05)
+        assert cancelled == [1]
+        assert gateway.stats()["in_flight"] == 0
+        assert await asyncio.wait_for(gateway.call(None, "b", lambda: asyncio.sleep(0, "ok")), 0.05) == "ok"
+
+    asyncio.run(scenario())
+
+
+def test_coalesced_call_runs_until_its_last_caller_leaves() -> None:
+    async def scenario() -> None:
+        gateway = _gateway()
+        started, cancelled = [], []
+        first = asyncio.ensure_future(gateway.call("prompt", "a", lambda: _slow(started, cancelled, 0.1)))
+        second = asyncio.ensure_future(gateway.call("prompt", "b", lambda: _slow(started, cancelled, 0.1)))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == "late"
+        assert started == [1] and cancelled == []
+
+        third = asyncio.ensure_future(gateway.call("prompt", "a", lambda: _slow(started, cancelled)))
+        fourth = asyncio.ensure_future(gateway.call("prompt", "b", lambda: _slow(started, cancelled)))
+        await asyncio.sleep(0.01)
+        third.cancel()
+        fourth.cancel()
+        await asyncio.gather(third, fourth, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert cancelled == [1]
+        assert gateway.stats() == {"in_flight": 0, "waiting": 0, "rejected": 0, "coalesced": 2}
+
+    asyncio.run(scenario())
+
+
+def test_deadline_and_hedge_free_every_slot() -> None:
+    async def scenario() -> None:
+        gateway = _gateway(max_in_flight=2)
+        started, cancelled = [], []
+
+        async def turn(key: str) -> None:
+            attempt = hedge(
+                lambda: gateway.call(key, key, lambda: _slow(started, cancelled)),
+                lambda: gateway.call(None, key, lambda: _slow(started, cancelled)),
+                0.1,
+            )
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(attempt, 0.3)
+
+        await asyncio.gather(turn("one"), turn("two"))
+        await asyncio.sleep(0)
+        assert gateway.stats()["in_flight"] == 0
+        assert gateway.stats()["waiting"] == 0
+        assert len(cancelled) == len(started)
+        # The next turn gets a slot at once instead of queueing behind abandoned calls.
+        assert await asyncio.wait_for(gateway.call(None, "three", lambda: asyncio.sleep(0, "ok")), 0.05) == "ok"
+
+    asyncio.run(scenario())
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Set
+
+import pytest
+
+from app.services.matcher import KEYWORD_MATCHER
+
+
+@pytest.mark.parametrize(
+    "message, tags",
+    [
+        ("I need the money quickly", {"mood:urgent", "intent:speed"}),
+        ("I'm interested in a car", {"loan"}),
+        ("I keep worrying about my bills", {"mood:stressed"}),
+        ("this is so stressful", {"mood:stressed"}),
+        ("refinancing my house", {"loan", "product:home_plus"}),
+    ],
+)
+def test_inflected_keywords_keep_their_tags(message: str, tags: Set[str]) -> None:
+    assert tags <= KEYWORD_MATCHER.scan(message).tags
+
+
+@pytest.mark.parametrize("message", ["that sounds scary", "I cared for my parents", "the homework is done"])
+def test_keywords_inside_other_words_do_not_match(message: str) -> None:
+    assert not KEYWORD_MATCHER.scan(message).tags
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.mark.parametrize(
+    "amount, term_months",
+    [
+        (1, 120),  # below HomePlus's minimum
+        (800000, 120),  # above its maximum
+        (100000, 7),  # a term it does not offer
+    ],
+)
+def test_schedule_rejects_loans_the_product_does_not_offer(monkeypatch, amount: float, term_months: int) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    params = {"product_id": "home_plus", "amount": amount, "term_months": term_months}
+    with TestClient(app) as client:
+        response = client.get("/api/quotes/schedule", params=params)
+    assert response.status_code == 422
+
+
+def test_schedule_amortizes_an_offered_loan(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    params = {"product_id": "home_plus", "amount": 100000, "term_months": 120}
+    with TestClient(app) as client:
+        response = client.get("/api/quotes/schedule", params=params)
+    assert response.status_code == 200
+    schedule = response.json()
+    assert len(schedule["month"]) == 120 and schedule["balance"][-1] == 0.0
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.chat import MAX_HISTORY_MESSAGES
+from app.services.conversation import ConversationEngine
+from app.services.sessions import SQLiteSessionStore
+
+
+def test_seeded_history_is_persisted_on_first_save(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        engine = ConversationEngine()
+        history = [
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "Hello! How can I help?"},
+            {"role": "user", "content": "I need a car loan"},
+            {"role": "assistant", "content": "Happy to help with that."},
+        ]
+        store = SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=60, max_history=20)
+        session = engine.new_session("seeded-session", history)
+        await engine.respond("What rates do you have?", session.history, session)
+        await store.save(session)
+
+        loaded = await store.get("seeded-session")
+        assert loaded is not None
+        assert loaded.total_messages == 6
+        assert loaded.history == session.history
+
+        await engine.respond("And the terms?", loaded.history, loaded)
+        await store.save(loaded)
+        reloaded = await store.get("seeded-session")
+        assert reloaded is not None and len(reloaded.history) == reloaded.total_messages == 8
+        await store.close()
+
+    asyncio.run(scenario())
+
+
+def test_stated_facts_outlive_the_trimmed_history(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        engine = ConversationEngine(max_history=2)
+        store = SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=60, max_history=2)
+        session = engine.new_session("profile-session", [])
+        await engine.respond("hi, my credit score is 600", session.history, session)
+        await engine.respond("thanks", session.history, session)
+        await store.save(session)
+
+        loaded = await store.get("profile-session")
+        assert loaded is not None and loaded.profile.facts == {"credit_score": 600.0}
+        plan = engine.plan_turn("I want a car loan", loaded.history, loaded)
+        assert "auto_express" not in [loan.id for loan in plan.suggestions]
+        assert any("AutoExpress" in line for line in plan.eligibility)
+        await store.close()
+
+    asyncio.run(scenario())
+
+
+def test_unknown_session_ids_are_replaced(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with TestClient(app) as client:
+        response = client.post("/api/chat/respond", json={"message": "hi", "session_id": "chosen-by-client"})
+        assert response.status_code == 200
+        issued = response.json()["session_id"]
+        assert issued != "chosen-by-client"
+
+        response = client.post("/api/chat/respond", json={"message": "and now?", "session_id": issued})
+        assert response.json()["session_id"] == issued
+
+
+def test_posted_history_is_bounded(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    history = [{"role": "user", "content": "hello"}] * (MAX_HISTORY_MESSAGES + 1)
+    with TestClient(app) as client:
+        response = client.post("/api/chat/respond", json={"message": "hi", "history": history})
+    assert response.status_code == 422
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from app.data.catalog import DEFAULT_CATALOG
+from app.services.similarity import SimilarityIndex, _fold
+
+
+@pytest.mark.parametrize(
+    "word, folded",
+    [
+        ("debts", "debt"),
+        ("studies", "study"),
+        ("businesses", "business"),
+        ("classes", "class"),
+        ("branches", "branch"),
+        ("taxes", "tax"),
+        ("purchases", "purchase"),
+        ("business", "business"),
+        ("analysis", "analysis"),
+    ],
+)
+def test_fold(word: str, folded: str) -> None:
+    assert _fold(word) == folded
+
+
+@pytest.mark.parametrize(
+    "message, product_id",
+    [
+        ("I want to start a restaurant", "biz_growth"),
+        ("I want to open a shop", "biz_growth"),
+        ("renovate my kitchen", "home_plus"),
+        ("pay off my credit cards", "debt_relief"),
+        ("tuition for my master's degree", "edu_future"),
+        ("need a truck for work", "auto_express"),
+    ],
+)
+def test_search_places_messages_that_name_no_product(message: str, product_id: str) -> None:
+    hits = SimilarityIndex(DEFAULT_CATALOG).search(message)
+    assert hits and hits[0].product.id == product_id
+
+
+def test_terms_most_products_share_do_not_place_a_message() -> None:
+    # "year" and "loan" appear in most products; alone they used to pick AutoExpress.
+    assert SimilarityIndex(DEFAULT_CATALOG).search("I'm 25 years old and need a loan") == []
+
+
+def test_rare_terms_are_kept_at_catalog_scale() -> None:
+    filler = [replace(product, id=f"{product.id}_{copy}") for copy in range(600) for product in DEFAULT_CATALOG]
+    boat = replace(filler[0], id="boat", name="Harbor Marine", description="Sailboat financing.")
+    hits = SimilarityIndex([*filler, boat]).search("financing for a sailboat")
+    assert hits and hits[0].product.id == "boat"
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.services.conversation import ConversationEngine
+
+
+def _ids(plan) -> list:
+    return [loan.id for loan in plan.suggestions]
+
+
+def test_follow_up_is_screened_against_the_product_discussed() -> None:
+    engine = ConversationEngine()
+    session = engine.new_session("follow-up-session", [])
+    asyncio.run(engine.respond("I want a car loan, my credit score is 600", session.history, session))
+
+    plan = engine.plan_turn("what are the rates?", session.history, session)
+    assert plan.eligibility and "AutoExpress" in plan.eligibility[0]
+    assert "auto_express" not in _ids(plan) and "home_plus" not in _ids(plan)
+
+
+def test_ruled_out_products_fall_back_to_undecided_ones() -> None:
+    # Every product's facts are incomplete, so nothing is fully eligible.
+    plan = ConversationEngine().plan_turn(
+        "I need a car loan, my credit score is 600", [{"role": "user", "content": "hello"}]
+    )
+    assert plan.stage == "loan_discussion"
+    assert plan.eligibility
+    assert plan.suggestions and "auto_express" not in _ids(plan)
+
+
+def test_relevant_products_are_kept_when_the_facts_allow_them() -> None:
+    history = [{"role": "user", "content": "I need a car loan, my credit score is 700"}]
+    plan = ConversationEngine().plan_turn("what are the rates?", history)
+    assert _ids(plan) == ["auto_express"] and not plan.eligibility